@@ -0,0 +1,127 @@
+# Food/batch_estimator.py
+"""
+NumPy batch version of food_estimator.expected_monthly_food_cost_for_year.
+
+Takes arrays (or scalars) of years, eating-out codes, store codes and weekly
+budgets, broadcasts them together, and returns an array of monthly costs. A
+years x habits x stores x budgets sweep is one call:
+
+    cost = expected_monthly_food_cost_batch(
+        years=np.arange(2025, 2036)[:, None, None, None],
+        eating_out=np.array(EAT_OUT_CODES)[None, :, None, None],
+        store_type=np.array(STORE_CODES)[None, None, :, None],
+        weekly_grocery_budget=np.array([120., 180., 240.])[None, None, None, :],
+        cpi_index_by_year=cpi,
+    )
+
+Results are identical to the scalar function, element by element (same factors,
+same multiplication order, same round-half-even to cents).
+
+Codes may be given as the strings used by the UI or as integer positions in
+EAT_OUT_CODES / STORE_CODES; unknown strings get factor 1.0 like the scalar version.
+"""
+
+from __future__ import annotations
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .food_estimator import BASE_YEAR, EAT_OUT_FACTOR, STORE_TIER_FACTOR, WEEKS_PER_MONTH
+
+EAT_OUT_CODES: Tuple[str, ...] = tuple(EAT_OUT_FACTOR)
+STORE_CODES: Tuple[str, ...] = tuple(STORE_TIER_FACTOR)
+
+# enum-indexed factor arrays; the extra last slot (factor 1.0) is "unknown"
+EAT_OUT_FACTORS = np.array([EAT_OUT_FACTOR[c] for c in EAT_OUT_CODES] + [1.0])
+STORE_FACTORS = np.array([STORE_TIER_FACTOR[c] for c in STORE_CODES] + [1.0])
+
+
+def _encode(values, codes: Tuple[str, ...]) -> np.ndarray:
+    """Map strings (or integer codes) to positions in `codes`; unknown -> len(codes)."""
+    arr = np.asarray(values)
+    if np.issubdtype(arr.dtype, np.integer):
+        return np.where((arr >= 0) & (arr < len(codes)), arr, len(codes))
+    lookup = {c: i for i, c in enumerate(codes)}
+    uniq, inverse = np.unique(arr.astype(object).ravel(), return_inverse=True)
+    mapped = np.array([lookup.get(u, len(codes)) for u in uniq], dtype=np.int64)
+    return mapped[inverse].reshape(arr.shape)
+
+
+def encode_eat_out(values) -> np.ndarray:
+    return _encode(values, EAT_OUT_CODES)
+
+
+def encode_store(values) -> np.ndarray:
+    return _encode(values, STORE_CODES)
+
+
+def compile_cpi(cpi_index_by_year: Optional[Dict[int, float]]) -> Optional[Tuple[int, np.ndarray]]:
+    """
+    Precompile a CPI dict into (first_year, multipliers) where multipliers[y - first_year]
+    is the same CPI[y] / 100 the scalar version uses (1.0 for gaps / non-positive values).
+    Returns None when there is no CPI or no base year (multiplier 1.0 everywhere).
+    """
+    if not cpi_index_by_year or BASE_YEAR not in cpi_index_by_year:
+        return None
+    first, last = min(cpi_index_by_year), max(cpi_index_by_year)
+    mult = np.ones(last - first + 1)
+    for y, v in cpi_index_by_year.items():
+        v = float(v)
+        if v > 0:
+            mult[int(y) - first] = v / 100.0
+    return first, mult
+
+
+def _weekly_array(weekly_grocery_budget) -> np.ndarray:
+    try:
+        weekly = np.asarray(weekly_grocery_budget, dtype=float)
+    except (TypeError, ValueError):
+        # mixed junk: same per-value fallback as the scalar version
+        def conv(v):
+            try:
+                return float(v)
+            except Exception:
+                return 0.0
+        weekly = np.vectorize(conv, otypes=[float])(np.asarray(weekly_grocery_budget, dtype=object))
+    return np.where(weekly < 0, 0.0, weekly)
+
+
+def round_cents(x: np.ndarray) -> np.ndarray:
+    """round(x, 2) element-wise with Python's exact semantics."""
+    scaled = x * 100.0
+    out = np.rint(scaled) / 100.0
+    # x * 100 can land on the wrong side of a .5 tie; redo those with Python's round
+    frac = np.abs(scaled - np.floor(scaled) - 0.5)
+    near_tie = np.isfinite(scaled) & (frac < 1e-6)
+    if near_tie.any():
+        flat_x, flat_out = x.reshape(-1), out.reshape(-1)
+        for i in np.flatnonzero(near_tie.reshape(-1)):
+            flat_out[i] = round(float(flat_x[i]), 2)
+    return out
+
+
+def expected_monthly_food_cost_batch(
+    *,
+    years,
+    eating_out,
+    store_type,
+    weekly_grocery_budget,
+    cpi_index_by_year: Optional[Dict[int, float]] = None,
+    compiled_cpi: Optional[Tuple[int, np.ndarray]] = None,
+) -> np.ndarray:
+    """
+    Array version of expected_monthly_food_cost_for_year; inputs broadcast together.
+    Pass `compiled_cpi` (from compile_cpi) to skip recompiling the dict on repeated calls.
+    """
+    base_monthly = _weekly_array(weekly_grocery_budget) * WEEKS_PER_MONTH
+    behavior_mult = EAT_OUT_FACTORS[encode_eat_out(eating_out)] * STORE_FACTORS[encode_store(store_type)]
+
+    cpi = compiled_cpi if compiled_cpi is not None else compile_cpi(cpi_index_by_year)
+    year_arr = np.asarray(years).astype(np.int64)
+    if cpi is None:
+        cpi_mult = np.ones(year_arr.shape)
+    else:
+        first, mult = cpi
+        cpi_mult = mult[np.clip(year_arr, first, first + len(mult) - 1) - first]
+
+    return round_cents(np.asarray(base_monthly * behavior_mult * cpi_mult, dtype=float))
@@ -0,0 +1,215 @@
+# Food/cpi_store.py
+"""
+Columnar, memory-mappable store for StatCan CPI table 18-10-0004-01.
+
+`ingest_cpi_table` converts a CPI CSV into a directory with
+    values.npy   float64 [n_series, n_months], NaN where a month is missing
+    months.npy   int32   [n_months], encoded year * 12 + (month - 1)
+    index.json   series keys [(geography, product), ...] + source file hash
+Opening the store memory-maps values.npy, so picking a series such as
+("Montréal, Quebec", "Food purchased from restaurants") is a dict lookup plus
+one row read, with no CSV parsing.
+
+Accepted inputs (streamed, two passes, never loaded whole):
+  - the full-table "long" download: REF_DATE, GEO, ..., Products and product groups, ..., VALUE
+  - the wide layout Food/model.py reads: a month-year header row, then one row per
+    series whose first cell is the product label (geography is `wide_geography`)
+
+    store = CPIStore.from_csv("Food/1810000401-eng.csv")
+    store.yearly_averages("CPI")
+    build_food_cpi_model_from_store(store, "CPI")  # in Food.model
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import csv
+import hashlib
+import json
+
+import numpy as np
+
+from fileutil import atomic_write, file_sha256
+
+from .model import SNIFF_BYTES, _parse_month, _sniff_delimiter
+
+STORE_ROOT = Path(__file__).resolve().parent.parent / ".cache" / "cpi_store"
+_STORE_VERSION = 1
+
+def _key(s: str) -> str:
+    return " ".join((s or "").split()).casefold()
+
+
+def _ref_month(ref_date: str) -> Optional[int]:
+    """'2024-03' -> 2024 * 12 + 2."""
+    try:
+        y, m = ref_date.strip()[:7].split("-")
+        return int(y) * 12 + int(m) - 1
+    except ValueError:
+        return None
+
+
+def _header_month(header: str) -> Optional[int]:
+    """'March 2024' -> 2024 * 12 + 2."""
+    year, month = _parse_month(header)
+    return year * 12 + month - 1 if year else None
+
+
+def _store_dir(sha: str, wide_geography: str) -> Path:
+    """Default store directory: one per (file content, wide_geography)."""
+    geo = hashlib.sha256(wide_geography.encode("utf-8")).hexdigest()[:8]
+    return STORE_ROOT / f"{sha[:16]}-{geo}"
+
+def _reader(f, delim: str):
+    return (row for row in csv.reader(f, delimiter=delim) if any(c.strip() for c in row))
+
+
+def ingest_cpi_table(csv_path: str | Path, out_dir: str | Path | None = None, *,
+                     wide_geography: str = "") -> Path:
+    """
+    Convert a CPI CSV into a store directory
+    (default: .cache/cpi_store/<file hash>-<wide_geography hash>).
+    """
+    csv_path = Path(csv_path)
+    sha = file_sha256(csv_path)
+    out_dir = Path(out_dir) if out_dir is not None else _store_dir(sha, wide_geography)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    with csv_path.open(newline="", encoding="utf-8-sig", errors="replace") as f:
+        delim = _sniff_delimiter(f.read(SNIFF_BYTES))
+        f.seek(0)
+        header = next(_reader(f, delim), None)
+    if header is None:
+        raise ValueError(f"Empty CPI file: {csv_path}")
+    cols = [_key(h) for h in header]
+
+    series: Dict[Tuple[str, str], int] = {}
+    if "ref_date" in cols:
+        i_date, i_geo, i_val = cols.index("ref_date"), cols.index("geo"), cols.index("value")
+        i_prod = next((i for i, c in enumerate(cols) if c.startswith("products")), None)
+        if i_prod is None:
+            raise ValueError("Long CPI table needs a 'Products and product groups' column.")
+
+        # pass 1: series keys and month range
+        lo, hi = None, None
+        with csv_path.open(newline="", encoding="utf-8-sig", errors="replace") as f:
+            rows = _reader(f, delim)
+            next(rows)
+            for row in rows:
+                m = _ref_month(row[i_date])
+                if m is None:
+                    continue
+                series.setdefault((row[i_geo].strip(), row[i_prod].strip()), len(series))
+                lo = m if lo is None or m < lo else lo
+                hi = m if hi is None or m > hi else hi
+        if lo is None:
+            raise ValueError("No REF_DATE rows recognized.")
+        months = np.arange(lo, hi + 1, dtype=np.int32)
+        values = np.lib.format.open_memmap(out_dir / "values.npy", mode="w+", dtype=np.float64,
+                                           shape=(len(series), len(months)))
+        values[:] = np.nan
+
+        # pass 2: fill
+        with csv_path.open(newline="", encoding="utf-8-sig", errors="replace") as f:
+            rows = _reader(f, delim)
+            next(rows)
+            for row in rows:
+                m = _ref_month(row[i_date])
+                if m is None:
+                    continue
+                try:
+                    v = float(row[i_val])
+                except ValueError:
+                    continue
+                values[series[(row[i_geo].strip(), row[i_prod].strip())], m - lo] = v
+    else:
+        col_month = [_header_month(h) for h in header]
+        cols_used = [i for i, m in enumerate(col_month) if m is not None and i > 0]
+        if not cols_used:
+            raise ValueError("No month-year headers recognized.")
+        lo = min(col_month[i] for i in cols_used)
+        hi = max(col_month[i] for i in cols_used)
+        months = np.arange(lo, hi + 1, dtype=np.int32)
+
+        # pass 1: series labels
+        with csv_path.open(newline="", encoding="utf-8-sig", errors="replace") as f:
+            rows = _reader(f, delim)
+            next(rows)
+            for row in rows:
+                series.setdefault((wide_geography, row[0].strip()), len(series))
+        values = np.lib.format.open_memmap(out_dir / "values.npy", mode="w+", dtype=np.float64,
+                                           shape=(len(series), len(months)))
+        values[:] = np.nan
+
+        # pass 2: fill, one row at a time
+        with csv_path.open(newline="", encoding="utf-8-sig", errors="replace") as f:
+            rows = _reader(f, delim)
+            next(rows)
+            for row in rows:
+                r = series[(wide_geography, row[0].strip())]
+                for i in cols_used:
+                    if i < len(row):
+                        try:
+                            values[r, col_month[i] - lo] = float(row[i])
+                        except ValueError:
+                            pass
+    values.flush()
+    del values
+
+    np.save(out_dir / "months.npy", months)
+    with atomic_write(out_dir / "index.json") as f:  # written last: marks the store complete
+        json.dump({
+            "version": _STORE_VERSION,
+            "sha256": sha,
+            "source": str(csv_path.resolve()),
+            "wide_geography": wide_geography,
+            "series": [list(k) for k in series],
+        }, f, ensure_ascii=False)
+    return out_dir
+
+
+class CPIStore:
+    def __init__(self, store_dir: str | Path):
+        self.store_dir = Path(store_dir)
+        with (self.store_dir / "index.json").open(encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != _STORE_VERSION:
+            raise ValueError(f"Unsupported CPI store version in {self.store_dir}")
+        self.sha256: str = meta["sha256"]
+        self.keys: List[Tuple[str, str]] = [tuple(k) for k in meta["series"]]
+        self._row = {(_key(g), _key(p)): i for i, (g, p) in enumerate(self.keys)}
+        self.months = np.load(self.store_dir / "months.npy")
+        self.values = np.load(self.store_dir / "values.npy", mmap_mode="r")
+
+    @classmethod
+    def from_csv(cls, csv_path: str | Path, *, wide_geography: str = "") -> "CPIStore":
+        """Open the store for this CSV, ingesting it first if the content changed."""
+        sha = file_sha256(csv_path)
+        store_dir = _store_dir(sha, wide_geography)
+        if not (store_dir / "index.json").exists():
+            ingest_cpi_table(csv_path, store_dir, wide_geography=wide_geography)
+        return cls(store_dir)
+
+    def row(self, product: str, geography: str = "") -> int:
+        r = self._row.get((_key(geography), _key(product)))
+        if r is None:
+            raise KeyError(f"No CPI series for ({geography!r}, {product!r})")
+        return r
+
+    def series(self, product: str, geography: str = "") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(years, months 1-12, values) of the non-missing points, chronological."""
+        vals = np.asarray(self.values[self.row(product, geography)])
+        keep = ~np.isnan(vals)
+        m = self.months[keep]
+        return m // 12, m % 12 + 1, vals[keep]
+
+    def yearly_averages(self, product: str, geography: str = "") -> Dict[int, float]:
+        """Same {year: average raw CPI} as Food.model._yearly_averages gives for a CSV row."""
+        years, _months, vals = self.series(product, geography)
+        if not len(years):
+            raise ValueError(f"No numeric CPI values for ({geography!r}, {product!r})")
+        uniq, slot = np.unique(years, return_inverse=True)
+        # bincount adds the weights in input order, so sums match a sequential loop exactly
+        sums = np.bincount(slot, weights=vals)
+        counts = np.bincount(slot)
+        return {int(y): float(s / c) for y, s, c in zip(uniq, sums, counts)}
@@ -15,6 +15,7 @@ CPI convention (required by design):
 
 Notes:
   - This module has ZERO external dependencies.
+  - For many scenarios at once, see Food/batch_estimator.py (NumPy).
   - The CPI dict is an input (cpi_index_by_year) so we can wire the model later with no changes here.
 """
 
@@ -73,8 +74,7 @@ def _cpi_multiplier_for_year(year: int, cpi_index_by_year: Dict[int, float]) ->
         return 1.0
 
     # clamp to known range to avoid KeyError
-    years_sorted = sorted(cpi_index_by_year.keys())
-    clamped_year = max(years_sorted[0], min(years_sorted[-1], int(year)))
+    clamped_year = max(min(cpi_index_by_year), min(max(cpi_index_by_year), int(year)))
     cpi_val = float(cpi_index_by_year.get(clamped_year, 100.0))
     if cpi_val <= 0:
         return 1.0
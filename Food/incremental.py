@@ -0,0 +1,166 @@
+# Food/incremental.py
+"""
+Incremental food CPI model: append new months instead of rebuilding.
+
+Keeps running per-year sums and counts of the raw monthly CPI (the only state the
+yearly averages, BASE_YEAR rebase and CAGR window need), so appending k months
+costs O(k), and the rebase + forecast reads only the base year and the last
+`window` years. The state persists as a small JSON file between runs.
+
+    model = IncrementalCPIModel.from_csv("Food/1810000401-eng.csv")
+    model.append([(2025, "October", 188.9)])      # or month numbers: (2025, 10, 188.9)
+    model.save(".cache/food_cpi_state.json")
+    cpi = model.to_dict(end_year=2035)            # == build_food_cpi_model(...) on the full data
+
+`index_for_year(y)` answers a single year without materializing the whole dict.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+import json
+
+from fileutil import atomic_write
+
+from .model import BASE_YEAR, _MONTH_NUM, _estimate_cagr, _index_from_yearly, _open_sniff, _parse_month
+
+_STATE_VERSION = 1
+
+MonthPoint = Tuple[int, Union[int, str], float]  # (year, month number or name, raw CPI)
+
+
+class IncrementalCPIModel:
+    def __init__(self, *, window: int = 5, fallback_cagr: float = 0.025):
+        self.window = int(window)
+        self.fallback_cagr = float(fallback_cagr)
+        self.sums: Dict[int, float] = {}
+        self.counts: Dict[int, int] = {}
+        self.last_month = 0  # year * 12 + (month - 1) of the newest point; 0 = empty
+        self.skipped = 0     # points at or before last_month, ignored by append()
+
+    # ---------- building ----------
+
+    @classmethod
+    def from_csv(cls, csv_path: str, **kwargs) -> "IncrementalCPIModel":
+        """Seed from the wide CSV that build_food_cpi_model reads."""
+        headers, values = _open_sniff(csv_path)
+
+        def points():
+            for h, v in zip(headers[1:], values[1:]):
+                year, month = _parse_month(h)
+                if year and _is_number(v):
+                    yield year, month, float(v)
+
+        model = cls(**kwargs)
+        model.append(points())
+        return model
+
+    def append(self, points: Iterable[MonthPoint]) -> int:
+        """
+        Add monthly points in chronological order. Points not newer than the last one
+        already included are skipped (re-sent data). Returns how many were added.
+        """
+        added = 0
+        for year, month, value in points:
+            m = _MONTH_NUM[month.lower()] if isinstance(month, str) else int(month)
+            key = int(year) * 12 + (m - 1)
+            value = float(value)
+            if key <= self.last_month or value != value:
+                self.skipped += 1
+                continue
+            y = int(year)
+            self.sums[y] = self.sums.get(y, 0.0) + value
+            self.counts[y] = self.counts.get(y, 0) + 1
+            self.last_month = key
+            added += 1
+        return added
+
+    # ---------- queries ----------
+
+    def yearly_averages(self) -> Dict[int, float]:
+        return {y: self.sums[y] / self.counts[y] for y in sorted(self.sums)}
+
+    def _avg(self, year: int) -> float:
+        return self.sums[year] / self.counts[year]
+
+    def _state(self) -> Tuple[float, float, int, float]:
+        """(raw base, cagr, last historical year, last normalized index)."""
+        if not self.sums:
+            raise ValueError("No CPI data in the model.")
+        last_year = self.last_month // 12
+        if BASE_YEAR in self.sums and self._avg(BASE_YEAR) != 0:
+            base = self._avg(BASE_YEAR)
+        else:
+            base = self._avg(last_year) or 1.0
+        recent = sorted(self.sums)[-self.window:] if self.window > 0 else sorted(self.sums)
+        cagr = _estimate_cagr({y: (self._avg(y) / base) * 100.0 for y in recent}, window=self.window)
+        if cagr == 0.0:
+            cagr = self.fallback_cagr
+        return base, cagr, last_year, (self._avg(last_year) / base) * 100.0
+
+    @staticmethod
+    def _forecast(last_val: float, cagr: float, steps: int) -> float:
+        # same repeated multiplication as build_food_cpi_model, for identical floats
+        for _ in range(steps):
+            last_val *= (1.0 + cagr)
+        return last_val
+
+    def _unrounded(self, year: int, end_year: int, state) -> Optional[float]:
+        base, cagr, last_year, last_val = state
+        if year in self.sums:
+            return (self._avg(year) / base) * 100.0
+        if last_year < year <= end_year:
+            return self._forecast(last_val, cagr, year - last_year)
+        return None
+
+    def index_for_year(self, year: int, end_year: int = 2035) -> Optional[float]:
+        """One year of to_dict(end_year) (None if absent), without building the rest."""
+        state = self._state()
+        val = self._unrounded(year, end_year, state)
+        if val is None:
+            return None
+        base_idx = self._unrounded(BASE_YEAR, end_year, state)
+        if base_idx:
+            return round(val / base_idx * 100.0, 2)
+        return val
+
+    def to_dict(self, end_year: int = 2035) -> Dict[int, float]:
+        """Same output as build_food_cpi_model(csv, end_year=..., window=..., fallback_cagr=...)."""
+        if not self.sums:
+            raise ValueError("No CPI data in the model.")
+        return _index_from_yearly(self.yearly_averages(), end_year, self.fallback_cagr, self.window)
+
+    # ---------- persistence ----------
+
+    def save(self, path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_write(path) as f:
+            json.dump({
+                "version": _STATE_VERSION,
+                "window": self.window,
+                "fallback_cagr": self.fallback_cagr,
+                "last_month": self.last_month,
+                "years": [[y, self.sums[y], self.counts[y]] for y in sorted(self.sums)],
+            }, f)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "IncrementalCPIModel":
+        with Path(path).open(encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != _STATE_VERSION:
+            raise ValueError(f"Unsupported CPI state version in {path}")
+        model = cls(window=data["window"], fallback_cagr=data["fallback_cagr"])
+        model.last_month = int(data["last_month"])
+        for y, s, c in data["years"]:
+            model.sums[int(y)] = float(s)
+            model.counts[int(y)] = int(c)
+        return model
+
+
+def _is_number(v: str) -> bool:
+    try:
+        x = float(v)
+    except ValueError:
+        return False
+    return x == x
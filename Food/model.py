@@ -10,89 +10,131 @@ Steps:
   3) Forecast to `end_year` with a CAGR estimated from recent history.
 
 Output dict is {year: index}, e.g. {2025: 100.0, 2026: 102.7, ...}
+
+Built models are cached: in-process by (path, mtime, size, params), and on disk
+under .cache/food_cpi/ by (file SHA-256, params), so a new process skips the
+parse too. See food_cpi_cache_info() / clear_food_cpi_cache().
 """
 
 from __future__ import annotations
+from array import array
+from pathlib import Path
 from typing import Dict, List, Tuple
 import csv
-import io
+import hashlib
+import json
+import os
 import re
+import threading
+
+from fileutil import atomic_write, file_sha256
 
 BASE_YEAR = 2025
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "food_cpi"
+_ARTIFACT_VERSION = 1
 MONTHS = (
     "january","february","march","april","may","june",
     "july","august","september","october","november","december"
 )
 
+SNIFF_BYTES = 64 * 1024
+_MONTH_YEAR_RE = re.compile(r"([A-Za-z]+)\s+((?:19|20)\d{2})")
+_MONTH_SET = frozenset(MONTHS)
+_MONTH_NUM = {m: i + 1 for i, m in enumerate(MONTHS)}  # "july" -> 7
+
+
+def _sniff_delimiter(prefix: str) -> str:
+    sample = prefix.split("\n", 1)[0]
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=",;\t|").delimiter
+    except Exception:
+        return ","  # default
+
+
 def _open_sniff(csv_path: str) -> Tuple[List[str], List[str]]:
     """
-    Return (headers, values) for the first two CSV rows with delimiter sniffing + BOM handling.
+    Return (headers, values) for the first two non-empty CSV rows with delimiter
+    sniffing + BOM handling.
     Assumes row 1 = header of month-year, row 2 starts with "CPI".
+
+    Streams the file: the delimiter is sniffed from a small prefix and reading stops
+    after the second row, so extra series below it are never read.
     """
-    with open(csv_path, "rb") as f:
-        raw = f.read()
-    # handle UTF-8 BOM
-    text = raw.decode("utf-8-sig", errors="replace")
-    sample = text.splitlines()[0] if text else ""
-    try:
-        dialect = csv.Sniffer().sniff(sample)
-        delim = dialect.delimiter
-    except Exception:
-        delim = ","  # default
-    reader = csv.reader(io.StringIO(text), delimiter=delim)
-    rows = [row for row in reader if any(cell.strip() for cell in row)]
+    with open(csv_path, newline="", encoding="utf-8-sig", errors="replace") as f:
+        delim = _sniff_delimiter(f.read(SNIFF_BYTES))
+        f.seek(0)
+        rows: List[List[str]] = []
+        for row in csv.reader(f, delimiter=delim):
+            if any(cell.strip() for cell in row):
+                rows.append(row)
+                if len(rows) == 2:
+                    break
     if len(rows) < 2:
         raise ValueError("CSV must have at least two rows (header + CPI row).")
-    headers = [h.strip() for h in rows[0]]
-    values  = [v.strip() for v in rows[1]]
-    return headers, values
+    return rows[0], rows[1]
+
+
+def _parse_month_year(header: str) -> int:
+    """ "July 1980" -> 1980; 0 if the header isn't a month-year. """
+    m = _MONTH_YEAR_RE.search(header)
+    if not m or m.group(1).lower() not in _MONTH_SET:
+        return 0
+    return int(m.group(2))
+
 
-def _parse_month_year_headers(headers: List[str]) -> List[Tuple[int, str]]:
+def _parse_month(header: str) -> Tuple[int, int]:
+    """ "July 1980" -> (1980, 7); (0, 0) if the header isn't a month-year. """
+    m = _MONTH_YEAR_RE.search(header)
+    month = _MONTH_NUM.get(m.group(1).lower(), 0) if m else 0
+    return (int(m.group(2)), month) if month else (0, 0)
+
+
+def _parse_series(headers: List[str], values: List[str]) -> Tuple[array, array]:
     """
-    From headers like ["Month and Year","July 1980","August 1980",...]
-    produce [(1980,'July'),(1980,'August'),...]
-    Non-matching headers are ignored.
+    One pass over header/value cells -> (years, values) arrays, preallocated to the
+    row width and trimmed to the parsed cells. Cell i pairs with header i;
+    non month-year headers and non-numeric cells are skipped. Column 0 is the label.
     """
-    out: List[Tuple[int, str]] = []
-    pat = re.compile(r"([A-Za-z]+)\s+((?:19|20)\d{2})")
-    for h in headers[1:]:  # skip first ("Month and Year")
-        m = pat.search(h)
-        if not m: 
+    n = max(0, min(len(headers), len(values)) - 1)
+    years = array("i", bytes(4 * n))
+    vals = array("d", bytes(8 * n))
+    k = 0
+    for h, v in zip(headers[1:], values[1:]):
+        year = _parse_month_year(h)
+        if not year:
+            continue
+        try:
+            x = float(v)
+        except ValueError:
             continue
-        month, year = m.group(1), int(m.group(2))
-        if month.lower() not in MONTHS:
+        if x != x:  # NaN
             continue
-        out.append((year, month))
-    return out
+        years[k] = year
+        vals[k] = x
+        k += 1
+    del years[k:], vals[k:]
+    return years, vals
+
 
 def _yearly_averages(headers: List[str], values: List[str]) -> Dict[int, float]:
     """
     Build {year: average_raw_cpi} using the second row values.
     values[0] should be "CPI"; values[1:] align with headers[1:].
     """
-    ym = _parse_month_year_headers(headers)
-    if not ym:
-        raise ValueError("No month-year headers recognized.")
     if len(values) < 2:
         raise ValueError("Second row lacks CPI values.")
-    nums: List[float] = []
-    for v in values[1:]:
-        try:
-            nums.append(float(v))
-        except Exception:
-            nums.append(float("nan"))
-
-    # group by year
-    year_to_vals: Dict[int, List[float]] = {}
-    for (year, _month), val in zip(ym, nums):
-        if val == val:  # not NaN
-            year_to_vals.setdefault(year, []).append(val)
-
-    # average
-    year_to_avg = {y: sum(vs)/len(vs) for y, vs in year_to_vals.items() if vs}
-    if not year_to_avg:
-        raise ValueError("No numeric CPI values parsed.")
-    return dict(sorted(year_to_avg.items()))
+    years, vals = _parse_series(headers, values)
+    if not years:
+        raise ValueError("No month-year columns with numeric CPI values recognized.")
+
+    # running per-year sums / counts
+    sums: Dict[int, float] = {}
+    counts: Dict[int, int] = {}
+    for year, val in zip(years, vals):
+        sums[year] = sums.get(year, 0.0) + val
+        counts[year] = counts.get(year, 0) + 1
+
+    return dict(sorted((y, sums[y] / counts[y]) for y in sums))
 
 def _normalize_to_base(year_to_avg: Dict[int, float], base_year: int = BASE_YEAR) -> Dict[int, float]:
     if base_year in year_to_avg and year_to_avg[base_year] != 0:
@@ -118,17 +160,18 @@ def _estimate_cagr(year_to_idx: Dict[int, float], window: int = 5) -> float:
         return 0.0
     return (v1 / v0) ** (1.0 / (last - first)) - 1.0
 
-def build_food_cpi_model(csv_path: str, *, end_year: int = 2035, fallback_cagr: float = 0.025) -> Dict[int, float]:
-    """
-    Build CPI index {year: index} from the wide CSV and forecast to `end_year`.
-    - Normalized so BASE_YEAR = 100.
-    """
+def _build_food_cpi_model(csv_path: str, end_year: int, fallback_cagr: float, window: int) -> Dict[int, float]:
+    """Uncached build; see build_food_cpi_model."""
     headers, values = _open_sniff(csv_path)
-    year_to_avg = _yearly_averages(headers, values)
+    return _index_from_yearly(_yearly_averages(headers, values), end_year, fallback_cagr, window)
+
+
+def _index_from_yearly(year_to_avg: Dict[int, float], end_year: int, fallback_cagr: float, window: int) -> Dict[int, float]:
+    """Normalize yearly averages to BASE_YEAR = 100 and forecast to `end_year`."""
     year_to_idx = _normalize_to_base(year_to_avg, BASE_YEAR)
 
     # forecast
-    cagr = _estimate_cagr(year_to_idx, window=5)
+    cagr = _estimate_cagr(year_to_idx, window=window)
     if cagr == 0.0:
         cagr = float(fallback_cagr)
 
@@ -145,3 +188,120 @@ def build_food_cpi_model(csv_path: str, *, end_year: int = 2035, fallback_cagr:
             year_to_idx[y] = round(year_to_idx[y] / base * 100.0, 2)
 
     return dict(sorted(year_to_idx.items()))
+
+
+# ---------- cache ----------
+
+_memo: Dict[tuple, Dict[int, float]] = {}
+_memo_lock = threading.Lock()
+_stats = {"memo_hits": 0, "disk_hits": 0, "builds": 0}
+
+
+def _artifact_path(sha: str, end_year: int, fallback_cagr: float, window: int) -> Path:
+    params = f"{end_year}-{float(fallback_cagr)!r}-{window}"
+    return CACHE_DIR / f"{sha[:16]}-{hashlib.sha1(params.encode()).hexdigest()[:10]}.json"
+
+
+def build_food_cpi_model(
+    csv_path: str,
+    *,
+    end_year: int = 2035,
+    fallback_cagr: float = 0.025,
+    window: int = 5,
+    use_cache: bool = True,
+) -> Dict[int, float]:
+    """
+    Build CPI index {year: index} from the wide CSV and forecast to `end_year`.
+    - Normalized so BASE_YEAR = 100.
+    - CAGR estimated over the last `window` years.
+    - Cached (memory + disk) unless use_cache=False; edits to the CSV invalidate it.
+    """
+    if not use_cache:
+        return _build_food_cpi_model(csv_path, end_year, fallback_cagr, window)
+
+    st = os.stat(csv_path)
+    memo_key = (os.path.abspath(csv_path), st.st_mtime_ns, st.st_size, end_year, float(fallback_cagr), window)
+    with _memo_lock:
+        hit = _memo.get(memo_key)
+        if hit is not None:
+            _stats["memo_hits"] += 1
+            return dict(hit)
+
+    sha = file_sha256(csv_path)
+    artifact = _artifact_path(sha, end_year, fallback_cagr, window)
+    model = None
+    try:
+        with artifact.open(encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") == _ARTIFACT_VERSION and data.get("sha256") == sha:
+            model = {int(y): v for y, v in data["index"]}
+    except (OSError, ValueError, KeyError, TypeError):
+        model = None
+
+    with _memo_lock:
+        if model is not None:
+            _stats["disk_hits"] += 1
+        else:
+            _stats["builds"] += 1
+
+    if model is None:
+        model = _build_food_cpi_model(csv_path, end_year, fallback_cagr, window)
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with atomic_write(artifact) as f:
+                json.dump({
+                    "version": _ARTIFACT_VERSION,
+                    "sha256": sha,
+                    "csv_path": os.path.abspath(csv_path),
+                    "params": {"end_year": end_year, "fallback_cagr": fallback_cagr, "window": window},
+                    "index": list(model.items()),
+                }, f)
+        except OSError:
+            pass  # read-only checkout: in-process memo only
+
+    with _memo_lock:
+        _memo[memo_key] = model
+    return dict(model)
+
+
+def build_food_cpi_model_from_store(
+    store,
+    product: str,
+    geography: str = "",
+    *,
+    end_year: int = 2035,
+    fallback_cagr: float = 0.025,
+    window: int = 5,
+) -> Dict[int, float]:
+    """
+    Same as build_food_cpi_model, for any series of a Food.cpi_store.CPIStore, e.g.
+    build_food_cpi_model_from_store(store, "Food purchased from restaurants", "Montréal, Quebec").
+    """
+    return _index_from_yearly(store.yearly_averages(product, geography), end_year, fallback_cagr, window)
+
+
+def food_cpi_cache_info() -> Dict[str, object]:
+    """Counters for this process plus what is currently stored on disk."""
+    artifacts = sorted(CACHE_DIR.glob("*.json")) if CACHE_DIR.exists() else []
+    with _memo_lock:
+        return {
+            **_stats,
+            "memo_entries": len(_memo),
+            "cache_dir": str(CACHE_DIR),
+            "disk_entries": len(artifacts),
+            "disk_bytes": sum(p.stat().st_size for p in artifacts),
+        }
+
+
+def clear_food_cpi_cache(*, disk: bool = True) -> None:
+    """Drop the in-process memo, and (by default) the on-disk artifacts."""
+    with _memo_lock:
+        _memo.clear()
+        for k in _stats:
+            _stats[k] = 0
+    if disk and CACHE_DIR.exists():
+        for p in CACHE_DIR.glob("*.json"):
+            try:
+                p.unlink()
+            except OSError:
+                pass
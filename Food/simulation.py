@@ -0,0 +1,141 @@
+# Food/simulation.py
+"""
+Monte Carlo food-cost uncertainty.
+
+The point model (Food.model) extends the CPI with one CAGR. Here each simulated
+path draws its future annual growth rates by bootstrapping the historical
+year-over-year growth of the food CPI (full calendar years only), so the spread of
+the paths reflects how much food inflation has actually varied.
+
+Everything is NumPy matrix work: a [n_paths, n_years] growth draw, a cumprod, a
+broadcast multiply by the profile's monthly base cost, then percentiles per year.
+Paths are drawn in fixed-size chunks with spawned seeds, so a given seed gives the
+same answer whether the chunks run in this process or in a process pool.
+
+    bands = food_cost_percentiles(
+        "Food/1810000401-eng.csv", eating_out="3-5x", store_type="Walmart",
+        weekly_grocery_budget=180.0, years=range(2025, 2036), seed=42,
+    )
+    bands[2030]  # {"p10": ..., "p50": ..., "p90": ...}
+"""
+
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .batch_estimator import EAT_OUT_FACTORS, STORE_FACTORS, encode_eat_out, encode_store
+from .food_estimator import BASE_YEAR, WEEKS_PER_MONTH
+from .incremental import IncrementalCPIModel
+
+PATHS_PER_CHUNK = 20_000
+
+
+def historical_growth_rates(model: IncrementalCPIModel, history_years: Optional[int] = None) -> np.ndarray:
+    """Year-over-year growth of the yearly average CPI, using complete (12-month) years only."""
+    full = [y for y in sorted(model.counts) if model.counts[y] == 12]
+    avg = {y: model.sums[y] / 12 for y in full}
+    rates = [avg[y] / avg[y - 1] - 1.0 for y in full if y - 1 in avg]
+    if history_years:
+        rates = rates[-history_years:]
+    if not rates:
+        raise ValueError("Need at least two consecutive complete years of CPI to bootstrap growth.")
+    return np.asarray(rates, dtype=float)
+
+
+def _simulate_chunk(args) -> np.ndarray:
+    rates, last_val, steps, n, seed_seq = args
+    rng = np.random.default_rng(seed_seq)
+    growth = rng.choice(rates, size=(n, steps), replace=True)
+    return last_val * np.cumprod(1.0 + growth, axis=1)
+
+
+def simulate_cpi_paths(
+    model: IncrementalCPIModel | str,
+    *,
+    end_year: int = 2035,
+    n_paths: int = 10_000,
+    seed: Optional[int] = None,
+    history_years: Optional[int] = None,
+    workers: int = 1,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Simulate CPI index paths (BASE_YEAR = 100, same convention as build_food_cpi_model).
+
+    model: an IncrementalCPIModel or the path of the wide CPI CSV.
+    workers > 1 spreads the chunks over a process pool (worth it for ~1M+ paths).
+    Returns (years, paths) with paths shaped [n_paths, len(years)]; historical years
+    are the observed index, identical on every path.
+    """
+    if isinstance(model, str):
+        model = IncrementalCPIModel.from_csv(model)
+    point = model.to_dict(end_year=max(end_year, model.last_month // 12))
+    last_year = model.last_month // 12
+    hist_years = [y for y in sorted(point) if y <= last_year]
+    future_years = list(range(last_year + 1, end_year + 1))
+    years = np.array(hist_years + future_years)
+
+    paths = np.empty((n_paths, len(years)))
+    paths[:, :len(hist_years)] = [point[y] for y in hist_years]
+
+    steps = len(future_years)
+    if steps and n_paths:
+        rates = historical_growth_rates(model, history_years)
+        sizes = [min(PATHS_PER_CHUNK, n_paths - i) for i in range(0, n_paths, PATHS_PER_CHUNK)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        jobs = [(rates, point[last_year], steps, n, s) for n, s in zip(sizes, seeds)]
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunks = list(pool.map(_simulate_chunk, jobs))
+        else:
+            chunks = [_simulate_chunk(job) for job in jobs]
+        paths[:, len(hist_years):] = np.concatenate(chunks, axis=0)
+
+    # base year only in the forecast: rebase each path on its own BASE_YEAR value
+    if BASE_YEAR > last_year and BASE_YEAR in years:
+        b = int(np.flatnonzero(years == BASE_YEAR)[0])
+        paths = paths / paths[:, b:b + 1] * 100.0
+    return years, paths
+
+
+def food_cost_percentiles(
+    model: IncrementalCPIModel | str,
+    *,
+    eating_out: str,
+    store_type: str,
+    weekly_grocery_budget: float,
+    years: Iterable[int],
+    percentiles: Sequence[float] = (10, 50, 90),
+    n_paths: int = 10_000,
+    seed: Optional[int] = None,
+    history_years: Optional[int] = None,
+    workers: int = 1,
+) -> Dict[int, Dict[str, float]]:
+    """
+    Percentile bands of the monthly food cost for one profile:
+        {year: {"p10": ..., "p50": ..., "p90": ...}}   (CAD/month, rounded to cents)
+    Same cost formula as expected_monthly_food_cost_for_year, with CPI drawn per path.
+    Years before the data are clamped to the first year, like the point estimator.
+
+    The bands need not contain the point estimate: the point model extends the CPI
+    with the CAGR of the last `window` (5) years, while history_years=None bootstraps
+    from every complete year on record, whose growth has mostly been lower. With the
+    bundled CSV the 2030 point estimate for the example profile is 1096.29 and its
+    P90 about 1022. Pass history_years=5 to draw from the point model's period.
+    """
+    years = [int(y) for y in years]
+    sim_years, paths = simulate_cpi_paths(
+        model, end_year=max(years + [BASE_YEAR]), n_paths=n_paths, seed=seed,
+        history_years=history_years, workers=workers,
+    )
+    cols = np.searchsorted(sim_years, np.clip(np.asarray(years), sim_years[0], sim_years[-1]))
+
+    weekly = max(float(weekly_grocery_budget), 0.0)
+    behavior = EAT_OUT_FACTORS[encode_eat_out(eating_out)] * STORE_FACTORS[encode_store(store_type)]
+    costs = (weekly * WEEKS_PER_MONTH) * behavior * (paths[:, cols] / 100.0)
+    bands = np.percentile(costs, percentiles, axis=0)  # [n_percentiles, n_years]
+    return {
+        y: {f"p{p:g}": round(float(bands[i, j]), 2) for i, p in enumerate(percentiles)}
+        for j, y in enumerate(years)
+    }
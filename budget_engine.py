@@ -0,0 +1,258 @@
+"""
+One entry point for a student's monthly cost of living.
+
+BudgetEngine loads every dataset / model once -- tuition index, food CPI, housing
+rents + housing CPI forecast, fare zones -- and turns a StudentProfile into a
+per-year itemized monthly budget:
+
+    engine = BudgetEngine()
+    profile = StudentProfile(
+        school="McGill", program="Bachelor of Engineering (BEng)",
+        borough="Plateau-Mont-Royal", home_address="4500 Rue Saint-Denis, Montréal, QC H2J 2L3",
+        school_address="845 Sherbrooke St W, Montreal, Quebec H3A 0G4",
+        eating_out="1-2x", store_type="Maxi", weekly_grocery_budget=120.0,
+        start_year=2025, years=4,
+    )
+    engine.budget(profile)
+    # {2025: {"tuition": ..., "rent": ..., "food": ..., "transport": ..., "total": ...}, 2026: ...}
+
+    engine.budget_many(profiles, workers=8)   # cohort: chunks over a process pool
+
+CPI conventions, unified here (every amount is CAD per month, rounded to cents):
+  - tuition: CSV amount (TUITION_BASE_YEAR dollars) / 12, grown by tuition_inflation_rate
+    (0 by default, as in tuition_backend)
+  - food:    Food.batch_estimator with the food CPI (2025 = 100), as expected_monthly_food_cost_for_year
+  - rent:    borough rent * housing CPI[y] / CPI[latest year], rounded to dollars like map.py
+  - transport: STM fare for the trip's outermost zone, the Bixi pass, or gas for the
+    commute (commute="stm" | "bixi" | "car"); fares are not inflated
+Years past end_year use end_year's indexes (the food estimator's clamping rule).
+"""
+
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import math
+import os
+
+import numpy as np
+
+HERE = Path(__file__).resolve().parent
+FOOD_CPI_CSV = HERE / "Food" / "1810000401-eng.csv"
+COMMUTES = ("stm", "bixi", "car")
+ITEMS = ("tuition", "rent", "food", "transport")
+
+Budget = Dict[int, Dict[str, float]]
+
+
+@dataclass(frozen=True)
+class StudentProfile:
+    school: str
+    program: str
+    borough: str                       # housing_prices.csv name (GeoJSON NOM also accepted)
+    home_address: str
+    school_address: Optional[str] = None
+    eating_out: str = "3-5x"
+    store_type: str = "Walmart"
+    weekly_grocery_budget: float = 150.0
+    start_year: int = 2025
+    years: int = 4
+    commute: str = "stm"
+    km_per_litre: float = 15.0         # commute="car" only
+    fuel_price: float = 1.60           # $/litre, commute="car" only
+
+
+class BudgetEngine:
+    def __init__(
+        self,
+        *,
+        end_year: int = 2035,
+        food_cpi_csv: str | Path = FOOD_CPI_CSV,
+        housing_cpi_csv: Optional[str | Path] = None,
+        prices_csv: Optional[str | Path] = None,
+        rent_statistic: str = "average",
+        tuition_inflation_rate: float = 0.0,
+    ):
+        """
+        rent_statistic: "average" (the value map.py shows) or "median" of the listing
+        samples (housing_stats).
+        """
+        from Food.batch_estimator import compile_cpi
+        from Food.model import build_food_cpi_model
+        from housing_model import CSV_PATH, housing_cpi_coefficients, forecast_housing_cpi, project_price_matrix
+        from housing_prices import NAME_MAPPING, PRICES_CSV
+        from places import normalize_place
+        from tuition_backend import get_index
+
+        self.end_year = int(end_year)
+        self.tuition_inflation_rate = float(tuition_inflation_rate)
+        self.tuition = get_index()
+
+        self.food_cpi = build_food_cpi_model(str(food_cpi_csv), end_year=self.end_year)
+        self._food_cpi = compile_cpi(self.food_cpi)
+
+        housing_cpi_csv = housing_cpi_csv or CSV_PATH
+        latest = housing_cpi_coefficients(housing_cpi_csv)[2]
+        self.housing_cpi = forecast_housing_cpi(max(self.end_year - latest, 0), housing_cpi_csv)
+        self.rent_first_year = latest
+
+        base = _borough_rents(prices_csv or PRICES_CSV, rent_statistic)
+        self.boroughs = list(base)
+        _years, self.rent_table = project_price_matrix(
+            [base[b] for b in self.boroughs], len(self.housing_cpi) - 1, self.housing_cpi)
+        self._borough_row = {normalize_place(b): i for i, b in enumerate(self.boroughs)}
+        for nom, csv_name in NAME_MAPPING.items():
+            row = self._borough_row.get(normalize_place(csv_name))
+            if row is not None:
+                self._borough_row.setdefault(normalize_place(nom), row)
+
+    # ---------- single profile ----------
+
+    def budget(self, profile: StudentProfile, *, strict: bool = True) -> Budget:
+        return self._budget_chunk([profile], strict)[0]
+
+    # ---------- batch ----------
+
+    def budget_many(self, profiles: Sequence[StudentProfile], *, workers: Optional[int] = None,
+                    chunk_size: int = 500, strict: bool = True) -> List[Budget]:
+        """
+        Budgets for many profiles, in order. Each chunk is evaluated with array ops;
+        with workers > 1 the chunks go to a process pool whose workers receive this
+        engine once (initializer), so nothing is reloaded per chunk. Workers start
+        from the env-configured distance backend and cache (DISTANCE_BACKEND,
+        DISTANCE_CACHE_*), not one swapped in with distance.set_backend().
+        """
+        profiles = list(profiles)
+        chunks = [profiles[i:i + chunk_size] for i in range(0, len(profiles), chunk_size)]
+        workers = min(workers or os.cpu_count() or 1, len(chunks))
+        if workers <= 1:
+            return [b for chunk in chunks for b in self._budget_chunk(chunk, strict)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,)) as pool:
+            results = pool.map(_run_chunk, chunks, [strict] * len(chunks))
+            return [b for part in results for b in part]
+
+    def _budget_chunk(self, profiles: Sequence[StudentProfile], strict: bool) -> List[Budget]:
+        from Food.batch_estimator import expected_monthly_food_cost_batch, round_cents
+
+        n = len(profiles)
+        if not n:
+            return []
+        for p in profiles:
+            if p.commute not in COMMUTES:
+                raise ValueError(f"Unknown commute {p.commute!r}; expected one of {COMMUTES}")
+        lengths = np.array([max(int(p.years), 1) for p in profiles])
+        starts = np.array([int(p.start_year) for p in profiles])
+
+        quote = self.tuition.quote_batch(
+            [(p.school, p.program) for p in profiles], years=lengths, start_year=starts,
+            inflation_rate=self.tuition_inflation_rate, strict=strict)
+        cal_years = quote["years"]                                   # (n, max_len)
+        in_program = np.arange(cal_years.shape[1])[None, :] < lengths[:, None]
+
+        tuition = quote["per_year"] / 12.0
+        food = expected_monthly_food_cost_batch(
+            years=np.minimum(cal_years, self.end_year),
+            eating_out=np.array([p.eating_out for p in profiles], dtype=object)[:, None],
+            store_type=np.array([p.store_type for p in profiles], dtype=object)[:, None],
+            weekly_grocery_budget=np.array([p.weekly_grocery_budget for p in profiles], dtype=float)[:, None],
+            compiled_cpi=self._food_cpi,
+        )
+        rent = self._rents(profiles, cal_years, strict)
+        transport = self._transport(profiles, strict)[:, None] * np.ones_like(tuition)
+
+        items = {"tuition": round_cents(tuition), "rent": rent, "food": food,
+                 "transport": round_cents(transport)}
+        total = round_cents(sum(items[k] for k in ITEMS))
+
+        out = []
+        for i in range(n):
+            budget = {}
+            for j in np.flatnonzero(in_program[i]):
+                row = {k: _clean(items[k][i, j]) for k in ITEMS}
+                row["total"] = _clean(total[i, j])
+                budget[int(cal_years[i, j])] = row
+            out.append(budget)
+        return out
+
+    def _rents(self, profiles: Sequence[StudentProfile], cal_years: np.ndarray, strict: bool) -> np.ndarray:
+        from places import normalize_place
+
+        rows = np.array([self._borough_row.get(normalize_place(p.borough), -1) for p in profiles])
+        if strict and (rows < 0).any():
+            bad = sorted({profiles[i].borough for i in np.flatnonzero(rows < 0)})[:5]
+            raise ValueError(f"Unknown borough(s): {bad}")
+        cols = np.clip(cal_years - self.rent_first_year, 0, self.rent_table.shape[1] - 1)
+        rent = self.rent_table[np.clip(rows, 0, None)[:, None], cols].astype(float)
+        missing = (rows < 0)[:, None] | (rent <= 0)   # 0 = no listings for that borough
+        if strict and missing.any():
+            bad = sorted({profiles[i].borough for i in np.flatnonzero(missing.any(axis=1))})[:5]
+            raise ValueError(f"No rent data for borough(s): {bad}")
+        return np.where(missing, np.nan, rent)
+
+    def _transport(self, profiles: Sequence[StudentProfile], strict: bool) -> np.ndarray:
+        from transportation_price import FARE_BY_ZONE_PAIR, get_bixi_price, get_commute_costs, get_zones
+
+        cost = np.full(len(profiles), np.nan)
+        for i, p in enumerate(profiles):
+            if p.commute == "bixi":
+                cost[i] = float(get_bixi_price())
+            elif p.school_address is None and strict:
+                raise ValueError(f"commute={p.commute!r} needs a school_address (profile {i})")
+
+        stm = [i for i, p in enumerate(profiles) if p.commute == "stm" and p.school_address is not None]
+        if stm:
+            homes = get_zones([profiles[i].home_address for i in stm], strict=strict)
+            schools = get_zones([profiles[i].school_address for i in stm], strict=strict)
+            for i, h, s in zip(stm, homes, schools):
+                if h and s:
+                    cost[i] = FARE_BY_ZONE_PAIR[(h, s)]
+
+        car = [i for i, p in enumerate(profiles) if p.commute == "car" and p.school_address is not None]
+        if car:
+            gas = get_commute_costs({
+                "home_address": [profiles[i].home_address for i in car],
+                "school_address": [profiles[i].school_address for i in car],
+                "km_per_litre": [profiles[i].km_per_litre for i in car],
+                "fuel_price": [profiles[i].fuel_price for i in car],
+            })["gas"].to_numpy()
+            if strict and np.isnan(gas).any():
+                raise ValueError("No route for some car commutes")
+            cost[car] = gas
+        return cost
+
+
+def _borough_rents(prices_csv: str | Path, statistic: str) -> Dict[str, float]:
+    if statistic == "average":
+        from housing_prices import load_prices
+        df = load_prices(prices_csv)
+        return dict(zip(df["Address"], df["Price"].astype(float)))
+    if statistic == "median":
+        from housing_stats import ingest_file
+        return {name: round(s.median()) for name, s in ingest_file(prices_csv).items()}
+    raise ValueError(f"Unknown rent_statistic {statistic!r}; expected 'average' or 'median'")
+
+
+def _clean(x) -> Optional[float]:
+    x = float(x)
+    return None if math.isnan(x) else x
+
+
+# ---------- process pool plumbing ----------
+
+_worker_engine: Optional[BudgetEngine] = None
+
+
+def _init_worker(engine: BudgetEngine) -> None:
+    import distance
+
+    global _worker_engine
+    _worker_engine = engine
+    # a forked worker inherits the parent's distance client (whose thread pool does
+    # not survive the fork) and SQLite connection; build fresh ones on first use
+    distance.set_backend(None)
+    distance.set_cache(None)
+
+
+def _run_chunk(profiles: Sequence[StudentProfile], strict: bool) -> List[Budget]:
+    return _worker_engine._budget_chunk(profiles, strict)
@@ -1,27 +1,150 @@
-import googlemaps
 from dotenv import load_dotenv
+from typing import List, NamedTuple, Optional
 import os
 
+from distance_backends import backend_from_env
+from distance_cache import DistanceCache, normalize_address
+
 load_dotenv()
-api_key = os.getenv("GOOGLE_API_KEY")
-# Initialize client with your API key
-gmaps = googlemaps.Client(key=api_key)
 
-def get_distance(origin, destination):
-    # Request distance matrix
-    result = gmaps.distance_matrix(origins=[origin],
-                                destinations=[destination],
-                                mode="driving")
+# Distance backend (Google Maps by default, see distance_backends.backend_from_env),
+# created on first use so importing this module needs no API key.
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = backend_from_env()
+    return _backend
+
+
+def set_backend(backend):
+    '''Swap the distance backend, e.g. FakeDistanceBackend() for offline tests.'''
+    global _backend
+    _backend = backend
+
+
+# Persistent (origin, destination, mode) -> element cache, created on first use.
+# Set DISTANCE_CACHE_TTL=0 to always hit the API.
+_cache = None
+
+
+def get_cache():
+    global _cache
+    if _cache is None and float(os.getenv("DISTANCE_CACHE_TTL", "1")) > 0:
+        _cache = DistanceCache.from_env()
+    return _cache
+
+
+def set_cache(cache):
+    '''Swap the distance cache (pass None to go back to the env-configured default).'''
+    global _cache
+    _cache = cache
+
+
+def get_distance(origin, destination, mode="driving"):
+    '''
+    returns (distance text, duration text) like ("12.3 km", "21 mins"),
+    or (None, None) when the backend found no route (e.g. status NOT_FOUND)
+    '''
+    cache = get_cache()
+    element = cache.get(origin, destination, mode) if cache is not None else None
+
+    if element is None:
+        # Request distance matrix
+        element = get_backend().matrix([origin], [destination], mode)[0][0]
+        if cache is not None and element.get('status', 'OK') == 'OK':
+            cache.put(origin, destination, mode, element)
+
+    if element.get('status', 'OK') != 'OK':
+        return None, None
 
     # Extract distance and duration
-    distance = result['rows'][0]['elements'][0]['distance']['text']
-    duration = result['rows'][0]['elements'][0]['duration']['text']
+    distance = element['distance']['text']
+    duration = element['duration']['text']
     return distance, duration
 
+
+# Distance Matrix per-request limits (standard plan)
+MAX_ORIGINS_PER_REQUEST = 25
+MAX_DESTINATIONS_PER_REQUEST = 25
+MAX_ELEMENTS_PER_REQUEST = 100
+
+
+class DistanceMatrix(NamedTuple):
+    '''Dense origins x destinations result; cells are None when no route was found.'''
+    origins: List[str]
+    destinations: List[str]
+    distance_m: List[List[Optional[int]]]
+    duration_s: List[List[Optional[int]]]
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def get_distances(origins, destinations, mode="driving"):
+    '''
+    Many-to-many version of get_distance.
+
+    Duplicate addresses are sent once, cached pairs are skipped, and the rest is split
+    into blocks within the per-request origin/destination/element limits which the
+    backend requests in parallel.
+
+    returns DistanceMatrix with distance in metres and duration in seconds
+    '''
+    origins, destinations = list(origins), list(destinations)
+
+    # unique addresses (by cache key) -> first spelling seen
+    uniq_o = list({normalize_address(o): o for o in reversed(origins)}.items())[::-1]
+    uniq_d = list({normalize_address(d): d for d in reversed(destinations)}.items())[::-1]
+
+    cache = get_cache()
+    elements = {}  # (origin key, destination key) -> element
+    if cache is not None:
+        hits = cache.get_many([(o, d) for _, o in uniq_o for _, d in uniq_d], mode)
+        for ok, o in uniq_o:
+            for dk, d in uniq_d:
+                element = hits.get((o, d))
+                if element is not None:
+                    elements[(ok, dk)] = element
+
+    # only request the rectangle of origins x destinations that still has misses
+    todo_o = [(ok, o) for ok, o in uniq_o if any((ok, dk) not in elements for dk, _ in uniq_d)]
+    todo_d = [(dk, d) for dk, d in uniq_d if any((ok, dk) not in elements for ok, _ in todo_o)]
+
+    if todo_o and todo_d:
+        d_size = min(len(todo_d), MAX_DESTINATIONS_PER_REQUEST)
+        o_size = max(1, min(MAX_ORIGINS_PER_REQUEST, MAX_ELEMENTS_PER_REQUEST // d_size))
+        blocks = [(ob, db) for ob in _chunks(todo_o, o_size) for db in _chunks(todo_d, d_size)]
+
+        results = get_backend().matrix_blocks(
+            [([o for _, o in ob], [d for _, d in db], mode) for ob, db in blocks]
+        )
+        for (ob, db), rows in zip(blocks, results):
+            for (ok, o), row in zip(ob, rows):
+                for (dk, d), element in zip(db, row):
+                    elements[(ok, dk)] = element
+                    if cache is not None and element.get('status') == 'OK':
+                        cache.put(o, d, mode, element)
+
+    distance_m, duration_s = [], []
+    for o in origins:
+        ok = normalize_address(o)
+        dist_row, dur_row = [], []
+        for d in destinations:
+            element = elements.get((ok, normalize_address(d)))
+            ok_element = element is not None and element.get('status', 'OK') == 'OK'
+            dist_row.append(element['distance']['value'] if ok_element else None)
+            dur_row.append(element['duration']['value'] if ok_element else None)
+        distance_m.append(dist_row)
+        duration_s.append(dur_row)
+    return DistanceMatrix(origins, destinations, distance_m, duration_s)
+
 if __name__ == "__main__":
     origin = "845 Sherbrooke St W, Montreal, Quebec H3A 0G4"
     destination = "University of Toronto, ON"
     distance, duration = get_distance(origin, destination)
     print(f"Distance: {distance}, Duration: {duration}")
     print(type(distance))
-
@@ -0,0 +1,297 @@
+"""
+Pluggable backends for distance lookups.
+
+Every backend answers `matrix(origins, destinations, mode)` with the Distance Matrix
+shape: one list of elements per origin, each element like
+    {"status": "OK", "distance": {"text": "12.3 km", "value": 12345},
+     "duration": {"text": "21 mins", "value": 1260}}
+
+Backends:
+  - GoogleMapsBackend: the live API; the client (and GOOGLE_API_KEY) is only needed
+    on the first request, not at import time. Over-query-limit and 5xx responses
+    are retried by the googlemaps client itself (retry_over_query_limit,
+    retry_timeout); only failures it doesn't retry become TransientDistanceError.
+  - FakeDistanceBackend: deterministic, in-process, no network. For tests, load tests
+    and benchmarks of the transport code.
+  - OfflineDistanceBackend (offline_distance.py): centroid + haversine estimate.
+  - FallbackDistanceBackend: tries a primary backend, answers from a fallback when
+    the primary fails or can't route a pair.
+  - ConcurrentDistanceClient: wraps any backend with a token-bucket rate limiter,
+    bounded thread-pool concurrency and retries with exponential backoff + jitter.
+    backend_from_env() puts it around the google backend only; the local backends
+    have no quota to respect.
+"""
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+import hashlib
+import os
+import random
+import threading
+import time
+
+Element = Dict
+Rows = List[List[Element]]
+Block = Tuple[Sequence[str], Sequence[str], str]  # (origins, destinations, mode)
+
+
+class TransientDistanceError(RuntimeError):
+    """A failure worth retrying (transport error, over query limit)."""
+
+
+class DistanceBackend(ABC):
+    @abstractmethod
+    def matrix(self, origins: Sequence[str], destinations: Sequence[str], mode: str = "driving") -> Rows:
+        ...
+
+    def matrix_blocks(self, blocks: Sequence[Block]) -> List[Rows]:
+        """Answer several independent requests; the base version runs them one by one."""
+        return [self.matrix(o, d, mode) for o, d, mode in blocks]
+
+
+def make_element(distance_m: float, duration_s: float) -> Element:
+    """Build an element with the same text formatting the API uses ("12.3 km", "21 mins")."""
+    km = distance_m / 1000.0
+    dist_text = f"{km:.1f} km" if km < 100 else f"{km:.0f} km"
+    minutes = max(1, int(round(duration_s / 60.0)))
+    if minutes < 60:
+        dur_text = f"{minutes} min" if minutes == 1 else f"{minutes} mins"
+    else:
+        hours, rest = divmod(minutes, 60)
+        dur_text = f"{hours} hour{'s' if hours > 1 else ''} {rest} min{'s' if rest != 1 else ''}"
+    return {
+        "status": "OK",
+        "distance": {"text": dist_text, "value": int(round(distance_m))},
+        "duration": {"text": dur_text, "value": int(round(duration_s))},
+    }
+
+
+class GoogleMapsBackend(DistanceBackend):
+    def __init__(self, api_key: Optional[str] = None, *, retry_timeout: float = 60.0,
+                 retry_over_query_limit: bool = True, **client_kwargs):
+        self.api_key = api_key
+        self.client_kwargs = dict(client_kwargs, retry_timeout=retry_timeout,
+                                  retry_over_query_limit=retry_over_query_limit)
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import googlemaps
+                    key = self.api_key or os.getenv("GOOGLE_API_KEY")
+                    self._client = googlemaps.Client(key=key, **self.client_kwargs)
+        return self._client
+
+    def matrix(self, origins, destinations, mode="driving") -> Rows:
+        from googlemaps import exceptions as gexc
+        try:
+            result = self.client.distance_matrix(origins=list(origins), destinations=list(destinations), mode=mode)
+        except gexc.HTTPError:
+            raise  # 5xx were already retried by the client; the rest won't succeed on retry
+        except gexc.TransportError as e:
+            raise TransientDistanceError(str(e)) from e
+        except gexc.ApiError as e:
+            # OVER_QUERY_LIMIT only gets here with retry_over_query_limit=False
+            if e.status in ("OVER_QUERY_LIMIT", "UNKNOWN_ERROR"):
+                raise TransientDistanceError(str(e)) from e
+            raise
+        return [row["elements"] for row in result["rows"]]
+
+
+class FakeDistanceBackend(DistanceBackend):
+    """
+    Deterministic stand-in: the same (origin, destination, mode) always gives the same
+    distance, between `min_km` and `max_km`. `latency` (seconds) simulates a slow API.
+    """
+
+    SPEED_KMH = {"driving": 40.0, "transit": 25.0, "bicycling": 15.0, "walking": 5.0}
+
+    def __init__(self, *, min_km: float = 1.0, max_km: float = 40.0, latency: float = 0.0):
+        self.min_km = min_km
+        self.max_km = max_km
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _element(self, origin: str, destination: str, mode: str) -> Element:
+        a, b = sorted(((origin or "").strip().casefold(), (destination or "").strip().casefold()))
+        if a == b:
+            return make_element(0.0, 0.0)
+        h = hashlib.blake2b(f"{a}\x1f{b}".encode("utf-8"), digest_size=8).digest()
+        frac = int.from_bytes(h, "big") / float(1 << 64)
+        km = self.min_km + frac * (self.max_km - self.min_km)
+        speed = self.SPEED_KMH.get(mode, self.SPEED_KMH["driving"])
+        return make_element(km * 1000.0, km / speed * 3600.0)
+
+    def matrix(self, origins, destinations, mode="driving") -> Rows:
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return [[self._element(o, d, mode) for d in destinations] for o in origins]
+
+
+class FallbackDistanceBackend(DistanceBackend):
+    """
+    Ask `primary` first; on an exception (over quota, outage, missing key...) answer the
+    whole request from `fallback`. With `fill_missing`, individual non-OK elements
+    from the primary are also filled in from the fallback.
+    """
+
+    def __init__(self, primary: DistanceBackend, fallback: DistanceBackend, *, fill_missing: bool = False):
+        self.primary = primary
+        self.fallback = fallback
+        self.fill_missing = fill_missing
+        self.fallbacks = 0
+
+    def matrix_blocks(self, blocks: Sequence[Block]) -> List[Rows]:
+        # keep a concurrent primary's parallelism; each block still falls back on its own
+        if isinstance(self.primary, ConcurrentDistanceClient) and len(blocks) > 1:
+            futures = [self.primary.pool.submit(self.matrix, o, d, mode) for o, d, mode in blocks]
+            return [f.result() for f in futures]
+        return super().matrix_blocks(blocks)
+
+    def matrix(self, origins, destinations, mode="driving") -> Rows:
+        try:
+            rows = self.primary.matrix(origins, destinations, mode)
+        except Exception:
+            self.fallbacks += 1
+            return self.fallback.matrix(origins, destinations, mode)
+        if self.fill_missing:
+            for i, row in enumerate(rows):
+                for j, element in enumerate(row):
+                    if element.get("status", "OK") != "OK":
+                        row[j] = self.fallback.matrix([origins[i]], [destinations[j]], mode)[0][0]
+        return rows
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens/second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of capacity {self.capacity}")
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class ConcurrentDistanceClient(DistanceBackend):
+    """
+    Rate-limited, retrying, thread-pooled wrapper around another backend.
+
+    - requests_per_second / burst: token bucket shared by all worker threads
+    - max_concurrency: at most this many requests in flight
+    - max_retries, base_delay, max_delay: exponential backoff with full jitter,
+      only for TransientDistanceError
+    """
+
+    def __init__(
+        self,
+        backend: DistanceBackend,
+        *,
+        requests_per_second: float = 50.0,
+        burst: Optional[float] = None,
+        max_concurrency: int = 8,
+        max_retries: int = 4,
+        base_delay: float = 0.25,
+        max_delay: float = 8.0,
+        seed: Optional[int] = None,
+    ):
+        self.backend = backend
+        self.bucket = TokenBucket(requests_per_second, burst)
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _backoff(self, attempt: int) -> float:
+        cap = min(self.max_delay, self.base_delay * (2 ** attempt))
+        with self._lock:
+            return self._rng.uniform(0.0, cap)
+
+    def matrix(self, origins, destinations, mode="driving") -> Rows:
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            try:
+                return self.backend.matrix(origins, destinations, mode)
+            except TransientDistanceError:
+                if attempt >= self.max_retries:
+                    raise
+                with self._lock:
+                    self.retries += 1
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                    thread_name_prefix="distance")
+        return self._pool
+
+    def matrix_blocks(self, blocks: Sequence[Block]) -> List[Rows]:
+        if len(blocks) <= 1:
+            return [self.matrix(o, d, mode) for o, d, mode in blocks]
+        futures = [self.pool.submit(self.matrix, o, d, mode) for o, d, mode in blocks]
+        return [f.result() for f in futures]
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+
+def _named_backend(name: str) -> DistanceBackend:
+    if name == "fake":
+        return FakeDistanceBackend()
+    if name == "google":
+        return ConcurrentDistanceClient(
+            GoogleMapsBackend(),
+            requests_per_second=float(os.getenv("DISTANCE_RPS", 50)),
+            max_concurrency=int(os.getenv("DISTANCE_MAX_CONCURRENCY", 8)),
+        )
+    if name == "offline":
+        from offline_distance import OfflineDistanceBackend
+        return OfflineDistanceBackend()
+    raise ValueError(f"Unknown DISTANCE_BACKEND: {name}")
+
+
+def backend_from_env() -> DistanceBackend:
+    """
+    DISTANCE_BACKEND=google (default) | fake | offline, or a comma-separated fallback
+    chain such as "google,offline".
+    DISTANCE_RPS, DISTANCE_MAX_CONCURRENCY tune the rate-limited client around the
+    google backend; fake and offline answers are local and run unthrottled.
+    """
+    names = [n.strip().lower() for n in os.getenv("DISTANCE_BACKEND", "google").split(",") if n.strip()]
+    backend = _named_backend(names[-1])
+    for name in reversed(names[:-1]):
+        backend = FallbackDistanceBackend(_named_backend(name), backend, fill_missing=True)
+    return backend
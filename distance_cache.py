@@ -0,0 +1,202 @@
+"""
+Persistent cache for Google Distance Matrix lookups.
+
+Entries live in a small SQLite file so they survive restarts. Each entry is the
+raw distance-matrix element ({"distance": {...}, "duration": {...}, "status": ...})
+keyed by the normalized (origin, destination, mode) triple.
+
+- TTL: entries older than `ttl_seconds` are treated as misses and dropped.
+- Size cap: once more than `max_entries` are stored, the least recently used
+  entries are evicted.
+- Counters: `stats()` reports hits / misses / evictions for this process.
+
+Configuration (env, optional):
+  DISTANCE_CACHE_PATH         sqlite file (default: .cache/distance_cache.sqlite3)
+  DISTANCE_CACHE_TTL          seconds (default: 30 days, 0 disables the cache)
+  DISTANCE_CACHE_MAX_ENTRIES  default: 50000
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+HERE = Path(__file__).resolve().parent
+CACHE_DIR = HERE / ".cache"
+CACHE_PATH = CACHE_DIR / "distance_cache.sqlite3"
+
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 50_000
+
+_KEY_SEP = "\x1f"
+_SQL_BATCH = 500  # keys per "IN (...)", under SQLite's host-parameter limit
+_COMMA_RE = re.compile(r"\s*,\s*")
+
+
+def normalize_address(address: str) -> str:
+    """Casefold and collapse whitespace so trivially different spellings share a key."""
+    s = " ".join((address or "").split())
+    s = _COMMA_RE.sub(", ", s)
+    return s.casefold()
+
+
+def make_key(origin: str, destination: str, mode: str) -> str:
+    return _KEY_SEP.join((normalize_address(origin), normalize_address(destination), (mode or "").lower()))
+
+
+class DistanceCache:
+    def __init__(
+        self,
+        path: str | Path = CACHE_PATH,
+        *,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_entries = int(max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS distances ("
+            " key TEXT PRIMARY KEY,"
+            " element TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS distances_lru ON distances (last_access)")
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM distances").fetchone()[0]
+
+    @classmethod
+    def from_env(cls) -> "DistanceCache":
+        return cls(
+            os.getenv("DISTANCE_CACHE_PATH") or CACHE_PATH,
+            ttl_seconds=float(os.getenv("DISTANCE_CACHE_TTL", DEFAULT_TTL_SECONDS)),
+            max_entries=int(os.getenv("DISTANCE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+        )
+
+    def get(self, origin: str, destination: str, mode: str = "driving") -> Optional[Dict]:
+        """Return the cached element for this trip, or None on a miss / expired entry."""
+        key = make_key(origin, destination, mode)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT element, created FROM distances WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            element, created = row
+            if self.ttl_seconds > 0 and now - created > self.ttl_seconds:
+                self._conn.execute("DELETE FROM distances WHERE key = ?", (key,))
+                self._conn.commit()
+                self._size -= 1
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE distances SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(element)
+
+    def get_many(self, pairs: Iterable[Tuple[str, str]], mode: str = "driving") -> Dict[Tuple[str, str], Dict]:
+        """
+        Bulk get(): {(origin, destination): element} for the pairs that hit. Lookups,
+        expiry and the last_access update share a single transaction.
+        """
+        by_key: Dict[str, list] = {}
+        for origin, destination in pairs:
+            by_key.setdefault(make_key(origin, destination, mode), []).append((origin, destination))
+        keys = list(by_key)
+        now = time.time()
+        found, expired = {}, []
+        with self._lock:
+            for i in range(0, len(keys), _SQL_BATCH):
+                batch = keys[i:i + _SQL_BATCH]
+                rows = self._conn.execute(
+                    f"SELECT key, element, created FROM distances WHERE key IN ({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                for key, element, created in rows:
+                    if self.ttl_seconds > 0 and now - created > self.ttl_seconds:
+                        expired.append((key,))
+                    else:
+                        found[key] = element
+            if expired:
+                self._conn.executemany("DELETE FROM distances WHERE key = ?", expired)
+                self._size -= len(expired)
+            if found:
+                self._conn.executemany("UPDATE distances SET last_access = ? WHERE key = ?",
+                                       [(now, key) for key in found])
+            if expired or found:
+                self._conn.commit()
+            n_hits = sum(len(by_key[key]) for key in found)
+            self.hits += n_hits
+            self.misses += sum(len(v) for v in by_key.values()) - n_hits
+        out = {}
+        for key, element in found.items():
+            element = json.loads(element)
+            for pair in by_key[key]:
+                out[pair] = element
+        return out
+
+    def put(self, origin: str, destination: str, mode: str, element: Dict) -> None:
+        key = make_key(origin, destination, mode)
+        now = time.time()
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO distances (key, element, created, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(element), now, now),
+            )
+            if cur.rowcount == 0:
+                self._conn.execute(
+                    "UPDATE distances SET element = ?, created = ?, last_access = ? WHERE key = ?",
+                    (json.dumps(element), now, now, key),
+                )
+            else:
+                self._size += 1
+            if self._size > self.max_entries:
+                self._evict(self._size - self.max_entries)
+            self._conn.commit()
+
+    def _evict(self, n: int) -> None:
+        """Drop the `n` least recently used entries (caller holds the lock)."""
+        cur = self._conn.execute(
+            "DELETE FROM distances WHERE key IN ("
+            " SELECT key FROM distances ORDER BY last_access ASC LIMIT ?)",
+            (n,),
+        )
+        self._size -= cur.rowcount
+        self.evictions += cur.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM distances")
+            self._conn.commit()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": self._size,
+            "hit_rate": (self.hits / total) if total else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
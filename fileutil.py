@@ -0,0 +1,52 @@
+"""
+File helpers shared by the on-disk caches and build artifacts.
+
+file_sha256() is the content hash the caches are keyed on. atomic_write() writes
+through a temp file next to the target and os.replace()s it into place on success,
+so readers (other processes included) never see a half-written file and a crash
+leaves the previous version intact.
+
+    with atomic_write(out_dir / "meta.json") as f:
+        json.dump(meta, f)
+"""
+
+from __future__ import annotations
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator
+import hashlib
+import os
+import threading
+
+
+def file_sha256(path: str | Path) -> str:
+    """Hex SHA-256 of a file's content, read in 1 MiB chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@contextmanager
+def atomic_write(path: str | Path, mode: str = "w", *, encoding: str = "utf-8") -> Iterator[IO]:
+    """Like open(path, mode) for writing, but `path` only changes once the block succeeds."""
+    if mode not in ("w", "wb"):
+        raise ValueError(f"atomic_write mode must be 'w' or 'wb', not {mode!r}")
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, mode, encoding=None if mode == "wb" else encoding) as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_bytes(path: str | Path, data: bytes) -> None:
+    with atomic_write(path, "wb") as f:
+        f.write(data)
@@ -0,0 +1,191 @@
+"""
+Preprocessed geometry cache for boundary GeoJSON files.
+
+The agglomeration GeoJSON is in EPSG:32188 (metres). Reading it with geopandas
+and reprojecting it on every map build is most of the "load" time once the
+polygons number in the thousands. build_geometry_cache() does that work once:
+
+  - reprojects to EPSG:4326,
+  - simplifies at several tolerances (in metres, as one coverage, so neighbours
+    keep sharing their borders),
+  - adds the join key column (`csv_name`, through a name mapping such as
+    housing_prices.NAME_MAPPING),
+
+and writes .cache/geometry/<source sha256[:16]>-<options hash>/ with
+    geometry.npz       per level: WKB bytes in one uint8 buffer + int64 offsets
+    attributes.pickle  the non-geometry columns (dtypes preserved)
+    meta.json          version, source hash, CRS, levels; written last
+
+    gdf = load_geometry("limites-administratives-agglomeration-nad83.geojson",
+                        tolerance_m=10, name_mapping=NAME_MAPPING)
+
+Loading is one np.load and a vectorized shapely.from_wkb. The source hash is
+reused while its mtime/size match the stamp in .cache/geometry/sources.json (same
+rule as the tuition snapshot and pipeline.py), so a warm load never re-reads it.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+import hashlib
+import json
+import pickle
+
+import numpy as np
+
+from fileutil import atomic_write, file_sha256
+
+HERE = Path(__file__).resolve().parent
+CACHE_ROOT = HERE / ".cache" / "geometry"
+DEFAULT_TOLERANCES = (0.0, 5.0, 10.0, 25.0, 50.0)
+_CACHE_VERSION = 1
+
+_memo: Dict[tuple, object] = {}
+_stamps: Optional[Dict[str, dict]] = None  # resolved source path -> {mtime_ns, size, sha256}
+
+
+def _source_sha(src: str | Path) -> str:
+    """file_sha256(src), reused while mtime/size match the recorded stamp."""
+    global _stamps
+    path = Path(src).resolve()
+    st = path.stat()
+    if _stamps is None:
+        try:
+            with (CACHE_ROOT / "sources.json").open(encoding="utf-8") as f:
+                _stamps = json.load(f)
+        except (OSError, ValueError):
+            _stamps = {}
+    rec = _stamps.get(str(path))
+    if rec and (rec["mtime_ns"], rec["size"]) == (st.st_mtime_ns, st.st_size):
+        return rec["sha256"]
+    sha = file_sha256(path)
+    _stamps[str(path)] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": sha}
+    try:
+        CACHE_ROOT.mkdir(parents=True, exist_ok=True)
+        with atomic_write(CACHE_ROOT / "sources.json") as f:
+            json.dump(_stamps, f, ensure_ascii=False)
+    except OSError:
+        pass  # read-only checkout: stamps for this process only
+    return sha
+
+
+def _options_hash(tolerances: Sequence[float], name_field: str, name_mapping: Optional[Dict[str, str]]) -> str:
+    levels = sorted({float(t) for t in tolerances} | {0.0})
+    blob = json.dumps([_CACHE_VERSION, levels, name_field, name_mapping or {}],
+                      sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:8]
+
+
+def cache_dir_for(src: str | Path, *, tolerances: Sequence[float] = DEFAULT_TOLERANCES,
+                  name_field: str = "NOM", name_mapping: Optional[Dict[str, str]] = None,
+                  sha: Optional[str] = None) -> Path:
+    sha = sha or _source_sha(src)
+    return CACHE_ROOT / f"{sha[:16]}-{_options_hash(tolerances, name_field, name_mapping)}"
+
+
+def build_geometry_cache(src: str | Path, out_dir: str | Path | None = None, *,
+                         tolerances: Sequence[float] = DEFAULT_TOLERANCES,
+                         name_field: str = "NOM",
+                         name_mapping: Optional[Dict[str, str]] = None) -> Path:
+    """Preprocess `src` into a cache directory and return it."""
+    import geopandas as gpd
+    import shapely
+
+    src = Path(src)
+    sha = _source_sha(src)
+    tolerances = sorted({float(t) for t in tolerances} | {0.0})
+    out_dir = Path(out_dir) if out_dir is not None else cache_dir_for(
+        src, tolerances=tolerances, name_field=name_field, name_mapping=name_mapping, sha=sha)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    gdf = gpd.read_file(src)
+    source_crs = gdf.crs.to_string() if gdf.crs is not None else None
+    metric = gdf if gdf.crs is None or not gdf.crs.is_geographic else gdf.to_crs(gdf.estimate_utm_crs())
+    geoms = metric.geometry.values
+
+    arrays = {}
+    for i, tol in enumerate(tolerances):
+        if tol > 0:
+            level = gpd.GeoSeries(shapely.coverage_simplify(geoms, tol), crs=metric.crs).to_crs(4326).values
+        else:
+            level = gdf.geometry.to_crs(4326).values  # exactly what folium's own reprojection gives
+        wkb = shapely.to_wkb(np.asarray(level, dtype=object))
+        arrays[f"offsets_{i}"] = np.cumsum([0] + [len(b) for b in wkb], dtype=np.int64)
+        arrays[f"wkb_{i}"] = np.frombuffer(b"".join(wkb), dtype=np.uint8)
+    np.savez(out_dir / "geometry.npz", **arrays)
+
+    attrs = gdf.drop(columns=gdf.geometry.name)
+    attrs["csv_name"] = attrs[name_field].map(name_mapping or {}).fillna(attrs[name_field])
+    with open(out_dir / "attributes.pickle", "wb") as f:
+        pickle.dump(attrs, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    with atomic_write(out_dir / "meta.json") as f:  # written last: marks the cache complete
+        json.dump({
+            "version": _CACHE_VERSION,
+            "sha256": sha,
+            "source": str(src.resolve()),
+            "source_crs": source_crs,
+            "crs": "EPSG:4326",
+            "geometry_column": gdf.geometry.name,
+            "tolerances": tolerances,
+            "count": len(gdf),
+        }, f, ensure_ascii=False)
+    return out_dir
+
+
+def load_geometry(src: str | Path, tolerance_m: float = 0.0, *,
+                  tolerances: Sequence[float] = DEFAULT_TOLERANCES,
+                  name_field: str = "NOM",
+                  name_mapping: Optional[Dict[str, str]] = None):
+    """
+    GeoDataFrame (EPSG:4326) of `src` simplified at `tolerance_m`, with a `csv_name`
+    join-key column. Builds the cache on first use or when the file content changes.
+    """
+    import geopandas as gpd
+    import shapely
+
+    sha = _source_sha(src)
+    out_dir = cache_dir_for(src, tolerances=tolerances, name_field=name_field,
+                            name_mapping=name_mapping, sha=sha)
+    key = (str(out_dir), float(tolerance_m))
+    if key in _memo:
+        return _memo[key].copy()
+
+    meta = None
+    try:
+        with (out_dir / "meta.json").open(encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        pass
+    if not meta or meta.get("version") != _CACHE_VERSION or meta.get("sha256") != sha:
+        build_geometry_cache(src, out_dir, tolerances=tolerances, name_field=name_field,
+                             name_mapping=name_mapping)
+        with (out_dir / "meta.json").open(encoding="utf-8") as f:
+            meta = json.load(f)
+
+    levels = [float(t) for t in meta["tolerances"]]
+    if float(tolerance_m) not in levels:
+        raise ValueError(f"No cached level for tolerance {tolerance_m} m; cached levels are {levels}")
+    i = levels.index(float(tolerance_m))
+
+    with np.load(out_dir / "geometry.npz") as npz:
+        buf, offsets = npz[f"wkb_{i}"].tobytes(), npz[f"offsets_{i}"]
+    wkb = np.array([buf[a:b] for a, b in zip(offsets[:-1], offsets[1:])], dtype=object)
+    with open(out_dir / "attributes.pickle", "rb") as f:
+        attrs = pickle.load(f)
+
+    gdf = gpd.GeoDataFrame(attrs.drop(columns=["csv_name"]), geometry=shapely.from_wkb(wkb), crs=meta["crs"])
+    gdf = gdf.rename_geometry(meta["geometry_column"]) if meta["geometry_column"] != "geometry" else gdf
+    gdf["csv_name"] = attrs["csv_name"].values
+    _memo[key] = gdf
+    return gdf.copy()
+
+
+def clear_geometry_cache(disk: bool = True) -> None:
+    import shutil
+    global _stamps
+
+    _memo.clear()
+    _stamps = None
+    if disk and CACHE_ROOT.exists():
+        shutil.rmtree(CACHE_ROOT, ignore_errors=True)
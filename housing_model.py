@@ -1,9 +1,39 @@
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import r2_score
+"""
+Housing CPI trend model.
+
+- forecast_housing_cpi(): fast path. Reads CPI_housing.csv with the csv module, fits
+  the annual-mean trend line in closed form and caches the coefficients in
+  .cache/housing_cpi.json (keyed by the CSV's SHA-256), so later calls -- in this
+  process or a new one -- are a lookup. No pandas / sklearn import.
+- project_price_matrix(): area x year rent projections from that forecast, as one
+  NumPy broadcast (any horizon).
+- train_evaluate_and_predict(): original pandas + sklearn version (returns a DataFrame).
+
+Both give the same predicted_cpi values.
+"""
+
+from __future__ import annotations
+from datetime import date
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import csv
+import json
+
+from fileutil import atomic_write, file_sha256
+
+HERE = Path(__file__).resolve().parent
+CSV_PATH = HERE / "CPI_housing.csv"
+CACHE_PATH = HERE / ".cache" / "housing_cpi.json"
+
+_MONTHS = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+_memo: Dict[tuple, Tuple[float, float, int]] = {}
+
 
 def train_evaluate_and_predict():
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+    from sklearn.linear_model import LinearRegression
+    from sklearn.metrics import r2_score
 
     df = pd.read_csv("CPI_housing.csv")
 
@@ -60,3 +90,117 @@ def train_evaluate_and_predict():
     return future_df
 
 
+def _annual_means(csv_path: Path, current_year: int) -> Dict[int, float]:
+    """{year: mean Index} from rows like "Sep-78,39.1" (two-digit years as pandas reads them)."""
+    sums: Dict[int, float] = {}
+    counts: Dict[int, int] = {}
+    with csv_path.open(newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        next(reader, None)  # header
+        for row in reader:
+            if len(row) < 2 or not row[0].strip():
+                continue
+            mon, yy = row[0].strip().split("-")
+            if mon[:3].lower() not in _MONTHS:
+                continue
+            yy = int(yy)
+            year = (1900 + yy) if yy >= 69 else (2000 + yy)  # strptime %y pivot
+            if year > current_year:
+                year -= 100
+            try:
+                value = float(row[1])
+            except ValueError:
+                continue
+            sums[year] = sums.get(year, 0.0) + value
+            counts[year] = counts.get(year, 0) + 1
+    if not sums:
+        raise ValueError(f"No CPI rows parsed from {csv_path}")
+    return {y: sums[y] / counts[y] for y in sorted(sums)}
+
+
+def _fit_line(points: Dict[int, float]) -> Tuple[float, float]:
+    """Ordinary least squares y = slope * x + intercept, closed form."""
+    n = len(points)
+    mx = sum(points) / n
+    my = sum(points.values()) / n
+    sxx = sum((x - mx) ** 2 for x in points)
+    sxy = sum((x - mx) * (y - my) for x, y in points.items())
+    slope = sxy / sxx if sxx else 0.0
+    return slope, my - slope * mx
+
+
+def housing_cpi_coefficients(csv_path: str | Path = CSV_PATH,
+                             cache_path: Optional[str | Path] = CACHE_PATH) -> Tuple[float, float, int]:
+    """(slope, intercept, latest_year) of the annual CPI trend, cached by file content."""
+    csv_path = Path(csv_path)
+    current_year = date.today().year
+    st = csv_path.stat()
+    memo_key = (str(csv_path.resolve()), st.st_mtime_ns, st.st_size, current_year)
+    if memo_key in _memo:
+        return _memo[memo_key]
+
+    sha = file_sha256(csv_path)
+    coeffs = None
+    if cache_path is not None:
+        try:
+            with Path(cache_path).open(encoding="utf-8") as f:
+                data = json.load(f)
+            entry = data.get(f"{sha}:{current_year}")
+            if entry:
+                coeffs = (float(entry["slope"]), float(entry["intercept"]), int(entry["latest_year"]))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            data = {}
+    if coeffs is None:
+        annual = _annual_means(csv_path, current_year)
+        slope, intercept = _fit_line(annual)
+        coeffs = (slope, intercept, max(annual))
+        if cache_path is not None:
+            cache_path = Path(cache_path)
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                with atomic_write(cache_path) as f:
+                    # one entry per data version; older ones are dropped
+                    json.dump({f"{sha}:{current_year}": {
+                        "slope": slope, "intercept": intercept, "latest_year": coeffs[2],
+                        "csv_path": str(csv_path.resolve()),
+                    }}, f)
+            except OSError:
+                pass
+    _memo[memo_key] = coeffs
+    return coeffs
+
+
+def forecast_housing_cpi(horizon: int = 5, csv_path: str | Path = CSV_PATH) -> Dict[int, float]:
+    """
+    {year: predicted_cpi} for the latest year in the file and the `horizon` years after,
+    rounded to 1 decimal -- the same table train_evaluate_and_predict returns.
+    """
+    slope, intercept, latest_year = housing_cpi_coefficients(csv_path)
+    return {y: round(slope * y + intercept, 1) for y in range(latest_year, latest_year + horizon + 1)}
+
+
+def project_price_matrix(base_prices, horizon: int = 5,
+                         cpi_forecast: Optional[Dict[int, float]] = None,
+                         csv_path: str | Path = CSV_PATH):
+    """
+    Price projections for every area and year in one broadcast:
+        years   int array [horizon + 1]            latest CPI year, +1, ..., +horizon
+        prices  int64 array [n_areas, horizon + 1]  column 0 is base_prices
+
+    Column k is round(price * cpi[year_k] / cpi[latest]) (half-to-even, like
+    DataFrame.round), and 0 wherever the base price is not positive.
+    """
+    import numpy as np
+
+    if cpi_forecast is None:
+        cpi_forecast = forecast_housing_cpi(horizon, csv_path)
+    years = np.array(sorted(cpi_forecast)[:horizon + 1])
+    if len(years) < horizon + 1:
+        raise ValueError(f"CPI forecast covers {len(years) - 1} years, horizon is {horizon}")
+    cpi = np.array([cpi_forecast[int(y)] for y in years], dtype=float)
+    ratios = cpi / cpi[0] if cpi[0] > 0 else np.ones_like(cpi)
+    ratios[0] = 1.0
+
+    base = np.asarray(base_prices, dtype=float).reshape(-1, 1)
+    prices = np.where(base > 0, np.rint(base * ratios), 0.0).astype(np.int64)
+    return years, prices
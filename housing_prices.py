@@ -0,0 +1,56 @@
+"""
+Borough rent table (housing_prices.csv) and the join to the boundary GeoJSON.
+
+housing_prices.csv rows are ragged: Borough,average,listing,listing,...
+load_prices() keeps the average; housing_stats.py streams the listings.
+NAME_MAPPING maps the GeoJSON NOM spellings to the CSV's borough names.
+
+Used by map.py and budget_engine.py; importing it pulls in no pandas.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+import csv
+
+HERE = Path(__file__).resolve().parent
+PRICES_CSV = HERE / "housing_prices.csv"
+
+# GeoJSON NOM -> name used in housing_prices.csv
+NAME_MAPPING = {
+    "Côte-des-Neiges–Notre-Dame-de-Grâce": "Côte-des-Neiges-Notre-Dame-de-Grâce",
+    "Côte-des-Neiges-Notre-Dame-de-Grâce": "Côte-des-Neiges-Notre-Dame-de-Grâce",
+    "L'Île-Bizard–Sainte-Geneviève": "L'Ile-Bizard",
+    "L'Île-Bizard-Sainte-Geneviève": "L'Ile-Bizard",
+    "L'Île-Dorval": "L'Ile-Dorval",
+    "Mercier–Hochelaga-Maisonneuve": "Mercier-Hochelaga-Maisonneuve",
+    "Mercier-Hochelaga-Maisonneuve": "Mercier-Hochelaga-Maisonneuve",
+    "Le Plateau-Mont-Royal": "Plateau-Mont-Royal",
+    "Le Sud-Ouest": "Sud-Ouest",
+    "Rivière-des-Prairies–Pointe-aux-Trembles": "Rivière-des-Prairies–Pointe-aux-Trembles",
+    "Rosemont–La Petite-Patrie": "Rosemont–La Petite-Patrie",
+    "Villeray–Saint-Michel–Parc-Extension": "Villeray–Saint-Michel–Parc-Extension"
+}
+
+
+def load_prices(input_csv: str | Path = PRICES_CSV):
+    """DataFrame[Address, Price] with the average price of each borough row (0 if none)."""
+    import pandas as pd
+
+    processed_data = []
+    with open(input_csv, mode='r', newline='', encoding='utf-8') as infile:
+        reader = csv.reader(infile)
+        next(reader) # Skip the header
+
+        for row in reader:
+            if row:
+                non_empty_values = [value for value in row if value.strip()]
+                if len(non_empty_values) > 1:
+                    address = non_empty_values[0]
+                    price = non_empty_values[1] # The second value is the average price
+                    processed_data.append({'Address': address, 'Price': price})
+                elif len(non_empty_values) == 1:
+                    processed_data.append({'Address': non_empty_values[0], 'Price': '0'})
+
+    price_df = pd.DataFrame(processed_data)
+    price_df['Price'] = pd.to_numeric(price_df['Price'], errors='coerce').fillna(0).round(0).astype(int)
+    return price_df
@@ -0,0 +1,269 @@
+"""
+Streaming per-borough rent statistics from listing feeds.
+
+housing_prices.csv rows are ragged:
+    Borough,average,listing,listing,...
+map.py keeps only the average. This module streams the rows and keeps, per
+borough, the count / mean / min / max and a mergeable quantile sketch
+(KLL-style compactors) for the median and P25/P75. Memory is O(k log(n / k))
+per borough whatever the feed size, and the results are exact until a borough
+has more than about k listings.
+
+    stats = ingest_file("housing_prices.csv")
+    stats["Anjou"].median()
+    summarize(ingest_parallel("listings.csv", workers=8))   # byte-range shards
+    merge_stats([ingest_file(p) for p in shard_paths])       # or one file per shard
+
+A row that has only the average (no listings) counts it as one observation.
+The same borough may appear on many rows; they are combined.
+"""
+
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import csv
+import math
+import os
+import random
+import sys
+
+HERE = Path(__file__).resolve().parent
+PRICES_CSV = HERE / "housing_prices.csv"
+
+DEFAULT_K = 200
+MIN_SHARD_BYTES = 1 << 20
+
+
+class QuantileSketch:
+    """
+    Mergeable KLL-style quantile sketch. Level h holds items of weight 2**h; a
+    full level is sorted and every other item (random offset) moves up a level.
+    """
+
+    def __init__(self, k: int = DEFAULT_K, *, seed: Optional[int] = None):
+        self.k = int(k)
+        self.n = 0
+        self.levels: List[List[float]] = [[]]
+        self._rng = random.Random(seed)
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self.levels) - h - 1
+        return max(2, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def add(self, x: float) -> None:
+        self.levels[0].append(float(x))
+        self.n += 1
+        if len(self.levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def update(self, xs: Iterable[float]) -> None:
+        for x in xs:
+            self.add(x)
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if len(level) >= self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append([])
+                level.sort()
+                # keep one item back when the level is odd so total weight is preserved
+                keep = [level.pop()] if len(level) % 2 else []
+                self.levels[h + 1].extend(level[self._rng.getrandbits(1)::2])
+                self.levels[h] = keep
+            h += 1
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Fold `other` into this sketch (in place) and return self."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for h, items in enumerate(other.levels):
+            self.levels[h].extend(items)
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _weighted(self) -> Tuple[List[float], List[int]]:
+        pairs = sorted((x, 1 << h) for h, level in enumerate(self.levels) for x in level)
+        return [x for x, _ in pairs], [w for _, w in pairs]
+
+    def quantiles(self, qs: Sequence[float]) -> List[Optional[float]]:
+        """
+        Values at fractions `qs` (0..1). Linear interpolation over the sketch's
+        weighted sample, which equals numpy.quantile while nothing was compacted.
+        """
+        values, weights = self._weighted()
+        if not values:
+            return [None for _ in qs]
+        cum, total = [], 0
+        for w in weights:
+            total += w
+            cum.append(total)  # items at expanded positions [cum - w, cum)
+
+        def at(pos: int) -> float:
+            lo, hi = 0, len(cum) - 1
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if cum[mid] > pos:
+                    hi = mid
+                else:
+                    lo = mid + 1
+            return values[lo]
+
+        out = []
+        for q in qs:
+            pos = min(max(float(q), 0.0), 1.0) * (total - 1)
+            lo = int(math.floor(pos))
+            a, b = at(lo), at(min(lo + 1, total - 1))
+            out.append(a + (b - a) * (pos - lo))
+        return out
+
+    def quantile(self, q: float) -> Optional[float]:
+        return self.quantiles([q])[0]
+
+
+class BoroughStats:
+    """Online count / mean / min / max plus a quantile sketch for one borough."""
+
+    def __init__(self, k: int = DEFAULT_K):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch(k)
+
+    def add(self, price: float) -> None:
+        self.count += 1
+        self.total += price
+        self.min = min(self.min, price)
+        self.max = max(self.max, price)
+        self.sketch.add(price)
+
+    def merge(self, other: "BoroughStats") -> "BoroughStats":
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def median(self) -> Optional[float]:
+        return self.sketch.quantile(0.5)
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        p25, p50, p75 = self.sketch.quantiles((0.25, 0.5, 0.75))
+        return {
+            "count": self.count,
+            "mean": self.mean(),
+            "median": p50,
+            "p25": p25,
+            "p75": p75,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+
+def _prices(cells: Sequence[str]) -> List[float]:
+    out = []
+    for c in cells:
+        try:
+            v = float(c)
+        except ValueError:
+            continue
+        if v == v:
+            out.append(v)
+    return out
+
+
+def ingest_rows(rows: Iterable[Sequence[str]], stats: Optional[Dict[str, BoroughStats]] = None,
+                *, k: int = DEFAULT_K) -> Dict[str, BoroughStats]:
+    """Add parsed CSV rows (name, average, listings...) to `stats` and return it."""
+    stats = {} if stats is None else stats
+    for row in rows:
+        cells = [c.strip() for c in row if c.strip()]
+        if not cells or cells[0].lstrip("\ufeff") == "Address":
+            continue
+        values = _prices(cells[1:])
+        samples = values[1:] or values[:1]
+        if not samples:
+            continue
+        b = stats.get(cells[0])
+        if b is None:
+            b = stats[cells[0]] = BoroughStats(k)
+        for p in samples:
+            b.add(p)
+    return stats
+
+
+def _lines_in_range(f, start: int, end: Optional[int]):
+    """Lines that *start* in [start, end) of a binary file (the usual shard rule)."""
+    if start > 0:
+        f.seek(start - 1)
+        f.readline()  # finish the line that straddles `start`
+    else:
+        f.seek(0)
+    while end is None or f.tell() < end:
+        line = f.readline()
+        if not line:
+            break
+        yield line.decode("utf-8-sig" if f.tell() == len(line) else "utf-8", errors="replace")
+
+
+def ingest_file(path: str | Path = PRICES_CSV, start: int = 0, end: Optional[int] = None,
+                *, k: int = DEFAULT_K) -> Dict[str, BoroughStats]:
+    """Stream one file, or the byte range [start, end) of it, into per-borough stats."""
+    with open(path, "rb") as f:
+        return ingest_rows(csv.reader(_lines_in_range(f, start, end)), k=k)
+
+
+def _ingest_shard(args) -> Dict[str, BoroughStats]:
+    path, start, end, k = args
+    return ingest_file(path, start, end, k=k)
+
+
+def merge_stats(parts: Iterable[Dict[str, BoroughStats]]) -> Dict[str, BoroughStats]:
+    out: Dict[str, BoroughStats] = {}
+    for part in parts:
+        for name, b in part.items():
+            if name in out:
+                out[name].merge(b)
+            else:
+                out[name] = b
+    return out
+
+
+def ingest_parallel(paths: str | Path | Sequence[str | Path] = PRICES_CSV, *,
+                    workers: Optional[int] = None, k: int = DEFAULT_K,
+                    shard_bytes: Optional[int] = None) -> Dict[str, BoroughStats]:
+    """
+    Split each file into byte ranges, ingest them in a process pool and merge.
+    Small inputs (a single shard) run in this process.
+    """
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+    workers = workers or os.cpu_count() or 1
+    jobs = []
+    for p in paths:
+        size = os.path.getsize(p)
+        step = shard_bytes or max(MIN_SHARD_BYTES, -(-size // workers))
+        jobs += [(str(p), s, min(s + step, size), k) for s in range(0, max(size, 1), step)]
+    if workers == 1 or len(jobs) == 1:
+        return merge_stats(_ingest_shard(j) for j in jobs)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return merge_stats(pool.map(_ingest_shard, jobs))
+
+
+def summarize(stats: Dict[str, BoroughStats]) -> Dict[str, Dict[str, Optional[float]]]:
+    return {name: stats[name].summary() for name in sorted(stats)}
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:] or [PRICES_CSV]:
+        for name, s in summarize(ingest_parallel(path)).items():
+            print(f"{name:<45} n={s['count']:<5} mean={s['mean']:8.1f} "
+                  f"p25={s['p25']:8.1f} median={s['median']:8.1f} p75={s['p75']:8.1f}")
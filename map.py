@@ -1,119 +1,167 @@
-import pandas as pd
-import geopandas as gpd
-import folium
-import csv
-from branca.element import Element # Required for injecting custom JS
-
-from housing_model import train_evaluate_and_predict
-
-
-# --- 1. LOAD AND PRE-PROCESS YOUR PRICE DATA ---
-input_csv = 'housing_prices.csv'
-processed_data = []
-
-with open(input_csv, mode='r', newline='', encoding='utf-8') as infile:
-    reader = csv.reader(infile)
-    next(reader) # Skip the header
-
-    for row in reader:
-        if row:
-            non_empty_values = [value for value in row if value.strip()]
-            if len(non_empty_values) > 1:
-                address = non_empty_values[0]
-                price = non_empty_values[1] # The second value is the average price
-                processed_data.append({'Address': address, 'Price': price})
-            elif len(non_empty_values) == 1:
-                processed_data.append({'Address': non_empty_values[0], 'Price': '0'})
-
-price_df = pd.DataFrame(processed_data)
-price_df['Price'] = pd.to_numeric(price_df['Price'], errors='coerce').fillna(0).round(0).astype(int)
-
-
-# --- 2. LOAD THE GEOJSON MAP DATA ---
-local_geojson_file = 'limites-administratives-agglomeration-nad83.geojson'
-gdf = gpd.read_file(local_geojson_file)
-
-
-# --- 3. MERGE DATA AND CALCULATE PROJECTIONS (USING CPI) ---
-name_mapping = {
-    "Côte-des-Neiges–Notre-Dame-de-Grâce": "Côte-des-Neiges-Notre-Dame-de-Grâce",
-    "Côte-des-Neiges-Notre-Dame-de-Grâce": "Côte-des-Neiges-Notre-Dame-de-Grâce",
-    "L'Île-Bizard–Sainte-Geneviève": "L'Ile-Bizard",
-    "L'Île-Bizard-Sainte-Geneviève": "L'Ile-Bizard",
-    "L'Île-Dorval": "L'Ile-Dorval",
-    "Mercier–Hochelaga-Maisonneuve": "Mercier-Hochelaga-Maisonneuve",
-    "Mercier-Hochelaga-Maisonneuve": "Mercier-Hochelaga-Maisonneuve",
-    "Le Plateau-Mont-Royal": "Plateau-Mont-Royal",
-    "Le Sud-Ouest": "Sud-Ouest",
-    "Rivière-des-Prairies–Pointe-aux-Trembles": "Rivière-des-Prairies–Pointe-aux-Trembles",
-    "Rosemont–La Petite-Patrie": "Rosemont–La Petite-Patrie",
-    "Villeray–Saint-Michel–Parc-Extension": "Villeray–Saint-Michel–Parc-Extension"
-}
-
-gdf['csv_name'] = gdf['NOM'].map(name_mapping).fillna(gdf['NOM'])
-merged_gdf = gdf.merge(price_df, left_on='csv_name', right_on='Address', how='left')
-merged_gdf['Price'] = merged_gdf['Price'].fillna(0).astype(int)
-
-# CPI LOGIC
-future_df = train_evaluate_and_predict()
-current_yr_cpi = future_df.loc[0, "predicted_cpi"]
-cpi_rates = [future_df.loc[i, "predicted_cpi"] for i in range(1, 6)]
-
-merged_gdf.rename(columns={'Price': 'Price_0yr'}, inplace=True)
-
-for i in range(5):
-    year = i + 1
-    future_cpi = cpi_rates[i]
-    col_name = f'Price_{year}yr'
-
-    if current_yr_cpi > 0:
-        cpi_ratio = future_cpi / current_yr_cpi
-    else:
-        cpi_ratio = 1.0
+"""
+Montréal rent map with CPI-based price projections.
+
+Command line:
+    python map.py [--prices housing_prices.csv] [--geojson limites-...geojson]
+                  [--output montreal_map_with_prices.html] [--horizon 5] [--profile]
+                  [--mode layers|single] [--simplify 10] [--precision 5] [--export-dir DIR]
 
-    merged_gdf[col_name] = merged_gdf['Price_0yr'].apply(
-        lambda price: (price * cpi_ratio) if price > 0 else 0
-    ).round(0).astype(int)
+From other tools (importing this module does no work and no heavy imports):
+    from map import build_map
+    build_map(output="out.html", horizon=10)
 
+Stages: import -> load -> merge -> project -> [simplify] -> render -> save.
+--profile prints the time spent in each one.
 
-# --- 4. CREATE THE MAP AND MULTIPLE LAYERS ---
-columns_to_keep = [
-    'geometry', 'csv_name', 'NOM',
-    'Price_0yr', 'Price_1yr', 'Price_2yr', 'Price_3yr', 'Price_4yr', 'Price_5yr'
-]
-merged_gdf = merged_gdf[columns_to_keep]
+--mode single writes the borough geometry once (simplified as a coverage, so
+neighbours still share borders, and rounded to --precision decimals) and switches
+the projection year in the browser instead of stacking one layer per year.
+
+--export-dir DIR writes static assets instead (see export_static): a content-hashed
+geometry file, one small content-hashed price file per year, manifest.json and a
+thin index.html, so a static server / CDN can cache everything but the manifest.
+"""
 
-m = folium.Map(location=[45.5017, -73.5673], zoom_start=10, tiles='CartoDB positron')
+from __future__ import annotations
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+import argparse
+import sys
+import time
+
+from fileutil import atomic_write_bytes
+from housing_prices import NAME_MAPPING, PRICES_CSV, load_prices
+
+HERE = Path(__file__).resolve().parent
+GEOJSON_PATH = HERE / "limites-administratives-agglomeration-nad83.geojson"
+OUTPUT_HTML = "montreal_map_with_prices.html"
+DEFAULT_HORIZON = 5
+MODES = ("layers", "single")
+DEFAULT_SIMPLIFY_M = 10.0
+DEFAULT_PRECISION = 5
+
+class StageTimer:
+    """Wall-clock time per pipeline stage (stages may repeat; times add up)."""
+
+    def __init__(self):
+        self.times: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] = self.times.get(name, 0.0) + time.perf_counter() - t0
+
+    def report(self, file=sys.stderr) -> None:
+        total = sum(self.times.values())
+        for name, secs in self.times.items():
+            share = (100.0 * secs / total) if total else 0.0
+            print(f"  {name:<8} {secs * 1000:9.1f} ms  {share:5.1f}%", file=file)
+        print(f"  {'total':<8} {total * 1000:9.1f} ms", file=file)
+
+
+def import_dependencies() -> None:
+    """Import the heavy libraries up front (only so --profile can time them separately)."""
+    import pandas  # noqa: F401
+    import geopandas  # noqa: F401
+    import shapely  # noqa: F401
+    import folium  # noqa: F401
+
+
+# --- 1. LOAD THE GEOJSON MAP DATA ---
+def load_geometry(geojson_path: str | Path = GEOJSON_PATH, tolerance_m: float = 0.0):
+    """
+    Borough polygons in EPSG:4326 with the csv_name join key, through the
+    preprocessed geometry cache (geometry_cache.py); tolerance_m picks a
+    pre-simplified level.
+    """
+    from geometry_cache import load_geometry as load_cached
+    return load_cached(geojson_path, tolerance_m, name_mapping=NAME_MAPPING)
+
+
+# --- 2. MERGE DATA AND CALCULATE PROJECTIONS (USING CPI) ---
+def merge_prices(gdf, price_df):
+    """Join prices onto the borough polygons; the current price becomes Price_0yr."""
+    gdf = gdf.copy()
+    if 'csv_name' not in gdf:
+        gdf['csv_name'] = gdf['NOM'].map(NAME_MAPPING).fillna(gdf['NOM'])
+    merged_gdf = gdf.merge(price_df, left_on='csv_name', right_on='Address', how='left')
+    merged_gdf['Price'] = merged_gdf['Price'].fillna(0).astype(int)
+    return merged_gdf.rename(columns={'Price': 'Price_0yr'})
+
+
+def project_prices(merged_gdf, horizon: int = DEFAULT_HORIZON, cpi_forecast: Optional[Dict[int, float]] = None):
+    """
+    Add Price_1yr .. Price_{horizon}yr scaled by the housing CPI forecast. The whole
+    area x year matrix is computed at once (housing_model.project_price_matrix).
+    """
+    from housing_model import project_price_matrix
+
+    years, prices = project_price_matrix(merged_gdf['Price_0yr'].to_numpy(), horizon, cpi_forecast)
+    price_cols = [f'Price_{y}yr' for y in range(horizon + 1)]
+    merged_gdf = merged_gdf[['geometry', 'csv_name', 'NOM']].copy()
+    for k, col in enumerate(price_cols):
+        merged_gdf[col] = prices[:, k]
+    merged_gdf.attrs['projection_years'] = [int(y) for y in years]  # calendar year of each Price_Nyr
+    return merged_gdf
+
+
+# --- 3. CREATE THE MAP AND MULTIPLE LAYERS ---
+# (lower bound exclusive, colour), checked in order; also sent to the browser in "single" mode
+PRICE_BREAKS = [(2500, '#f03b20'), (2000, '#fd8d3c'), (1600, '#feb24c'), (1200, '#fed976'), (0, '#ffeda0')]
+NO_PRICE_COLOR = '#ffffcc'
 
 def get_color(price):
-    if price > 2500: return '#f03b20'
-    if price > 2000: return '#fd8d3c'
-    if price > 1600: return '#feb24c'
-    if price > 1200: return '#fed976'
-    if price > 0:    return '#ffeda0'
-    return '#ffffcc'
-
-for year in range(6):
-    price_col = f'Price_{year}yr'
-    layer_name = 'Current (0 Yr)' if year == 0 else f'{year} Year Projection'
-
-    folium.GeoJson(
-        merged_gdf,
-        name=layer_name,
-        show=(year == 0),
-        style_function=lambda feature, col=price_col: {
-            'fillColor': get_color(feature['properties'][col]),
-            'fillOpacity': 0.7,
-            'weight': 0.3,
-            'color': '#444'
-        },
-        tooltip=folium.GeoJsonTooltip(
-            fields=['NOM', price_col],
-            # ** CHANGE 1: Added $ sign to the Price alias **
-            aliases=['Municipality:', 'Projected Price: $'],
-            localize=True,
-            sticky=False,
-            style="""
+    for lower, color in PRICE_BREAKS:
+        if price > lower: return color
+    return NO_PRICE_COLOR
+
+def layer_label(year: int) -> str:
+    return 'Current (0 Yr)' if year == 0 else f'{year} Year Projection'
+
+def render_map(merged_gdf, horizon: int = DEFAULT_HORIZON):
+    """"layers" mode: one folium.GeoJson layer per year, radio-button layer control."""
+    import folium
+    from branca.element import Element # Required for injecting custom JS
+
+    m = folium.Map(location=[45.5017, -73.5673], zoom_start=10, tiles='CartoDB positron')
+
+    for year in range(horizon + 1):
+        price_col = f'Price_{year}yr'
+        layer_name = layer_label(year)
+
+        folium.GeoJson(
+            merged_gdf,
+            name=layer_name,
+            show=(year == 0),
+            style_function=lambda feature, col=price_col: {
+                'fillColor': get_color(feature['properties'][col]),
+                'fillOpacity': 0.7,
+                'weight': 0.3,
+                'color': '#444'
+            },
+            tooltip=folium.GeoJsonTooltip(
+                fields=['NOM', price_col],
+                # ** CHANGE 1: Added $ sign to the Price alias **
+                aliases=['Municipality:', 'Projected Price: $'],
+                localize=True,
+                sticky=False,
+                style=_TOOLTIP_STYLE
+            ),
+            highlight_function=lambda x: {'weight': 3, 'color': '#FFF', 'fillOpacity': 0.5}
+        ).add_to(m)
+
+    # --- 4. ADD LAYER CONTROL (THE "BUTTONS") AND CUSTOM JS ---
+    folium.LayerControl().add_to(m)
+    # Add the script to the map's HTML head
+    m.get_root().html.add_child(Element(_RADIO_SCRIPT))
+    return m
+
+
+_TOOLTIP_STYLE = """
                 background-color: #F0EFEFEF;
                 border: 2px solid black;
                 border-radius: 3px;
@@ -122,17 +170,10 @@ for year in range(6):
                 font-family: sans-serif;
                 font-size: 14px;
             """
-        ),
-        highlight_function=lambda x: {'weight': 3, 'color': '#FFF', 'fillOpacity': 0.5}
-    ).add_to(m)
-
-
-# --- 5. ADD LAYER CONTROL (THE "BUTTONS") AND CUSTOM JS ---
-folium.LayerControl().add_to(m)
 
 # ** FIX: Custom JavaScript to enforce radio-button behavior (no stacking) **
-# This script is now added to the map's root, which is a better injection point.
-script = """
+# This script is added to the map's root, which is a better injection point.
+_RADIO_SCRIPT = """
 <script type="text/javascript">
     function setupProjectionControl() {
         var overlays = document.querySelector('.leaflet-control-layers-overlays');
@@ -186,12 +227,368 @@ script = """
     document.addEventListener('DOMContentLoaded', setupProjectionControl);
 </script>
 """
-# Add the script to the map's HTML head
-m.get_root().html.add_child(Element(script))
 
 
-# --- 6. SAVE THE MAP ---
-output_map_filename = 'montreal_map_with_prices.html'
-m.save(output_map_filename)
+def simplify_geometry(gdf, tolerance_m: float = DEFAULT_SIMPLIFY_M, precision: int = DEFAULT_PRECISION):
+    """
+    Simplify the borough polygons as one coverage (shared borders stay shared, so
+    no gaps or overlaps appear), in metres, then reproject to WGS84 and round the
+    coordinates to `precision` decimals (5 ~ 1 m).
+    """
+    import numpy as np
+    import shapely
+
+    gdf = gdf.copy()
+    if tolerance_m > 0:
+        if gdf.crs is not None and gdf.crs.is_geographic:
+            gdf = gdf.to_crs(gdf.estimate_utm_crs())
+        gdf['geometry'] = shapely.coverage_simplify(gdf.geometry.values, tolerance_m)
+    if gdf.crs is not None and gdf.crs != "EPSG:4326":
+        gdf = gdf.to_crs(4326)
+    gdf['geometry'] = shapely.transform(gdf.geometry.values, lambda xy: np.round(xy, precision))
+    return gdf
+
+
+def render_map_single(merged_gdf, horizon: int = DEFAULT_HORIZON):
+    """
+    "single" mode: the geometry is embedded once with every Price_Nyr as a property;
+    a small control restyles that one layer in the browser when the year changes.
+    """
+    import folium
+    from branca.element import MacroElement
+    from jinja2 import Template
+
+    price_cols = [f'Price_{y}yr' for y in range(horizon + 1)]
+    m = folium.Map(location=[45.5017, -73.5673], zoom_start=10, tiles='CartoDB positron')
+    layer = folium.GeoJson(
+        merged_gdf[['geometry', 'NOM'] + price_cols],
+        name='Rent prices',
+        style_function=lambda feature: {
+            'fillColor': get_color(feature['properties']['Price_0yr']),
+            'fillOpacity': 0.7,
+            'weight': 0.3,
+            'color': '#444'
+        },
+        highlight_function=lambda x: {'weight': 3, 'color': '#FFF', 'fillOpacity': 0.5}
+    ).add_to(m)
+
+    switch = MacroElement()
+    switch._template = Template(_YEAR_SWITCH_TEMPLATE)
+    switch.layer_name = layer.get_name()
+    switch.labels = [layer_label(y) for y in range(horizon + 1)]
+    switch.breaks = PRICE_BREAKS
+    switch.no_price_color = NO_PRICE_COLOR
+    switch.tooltip_style = ' '.join(_TOOLTIP_STYLE.split())
+    switch.add_to(m)
+    return m
+
+
+_YEAR_SWITCH_TEMPLATE = """
+{% macro header(this, kwargs) %}
+<style>
+    .price-tooltip { {{ this.tooltip_style }} }
+    .year-switch { background: #fff; padding: 6px 10px; border-radius: 5px; box-shadow: 0 1px 5px rgba(0,0,0,0.4); font: 13px sans-serif; }
+    .year-switch label { display: block; margin-bottom: 5px; cursor: pointer; }
+    .year-switch input { margin-right: 8px; }
+</style>
+{% endmacro %}
+
+{% macro script(this, kwargs) %}
+(function() {
+    var layer = {{ this.layer_name }};
+    var breaks = {{ this.breaks|tojson }};
+    var labels = {{ this.labels|tojson }};
+    var year = 0;
+
+    function color(price) {
+        for (var i = 0; i < breaks.length; i++) {
+            if (price > breaks[i][0]) return breaks[i][1];
+        }
+        return {{ this.no_price_color|tojson }};
+    }
+    function style(feature) {
+        return {fillColor: color(feature.properties['Price_' + year + 'yr']), fillOpacity: 0.7, weight: 0.3, color: '#444'};
+    }
+    // resetStyle (used after the highlight) reads options.style, so keep it on the current year
+    layer.options.style = style;
+
+    layer.bindTooltip(function(l) {
+        var p = l.feature.properties;
+        return '<b>Municipality:</b> ' + p.NOM + '<br><b>Projected Price: $</b>'
+            + p['Price_' + year + 'yr'].toLocaleString();
+    }, {className: 'price-tooltip', sticky: false});
+
+    var control = L.control({position: 'topright'});
+    control.onAdd = function() {
+        var div = L.DomUtil.create('div', 'year-switch');
+        div.innerHTML = '<strong>Price Projections:</strong>' + labels.map(function(text, y) {
+            return '<label><input type="radio" name="projection-year" value="' + y + '"'
+                + (y === 0 ? ' checked' : '') + '>' + text + '</label>';
+        }).join('');
+        L.DomEvent.disableClickPropagation(div);
+        div.addEventListener('change', function(e) {
+            year = +e.target.value;
+            layer.setStyle(style);
+        });
+        return div;
+    };
+    control.addTo({{ this._parent.get_name() }});
+})();
+{% endmacro %}
+"""
+
+
+# --- 5. SAVE THE MAP ---
+def save_map(m, output: str | Path = OUTPUT_HTML) -> Path:
+    m.save(str(output))
+    return Path(output)
+
+
+def build_map(
+    prices_path: str | Path = PRICES_CSV,
+    geojson_path: str | Path = GEOJSON_PATH,
+    output: str | Path = OUTPUT_HTML,
+    *,
+    horizon: int = DEFAULT_HORIZON,
+    mode: str = "layers",
+    simplify_m: float = DEFAULT_SIMPLIFY_M,
+    precision: int = DEFAULT_PRECISION,
+    cpi_forecast: Optional[Dict[int, float]] = None,
+    timer: Optional[StageTimer] = None,
+) -> Path:
+    """
+    Run the whole pipeline and return the path of the written HTML map.
+    cpi_forecast ({year: cpi}) overrides housing_model.forecast_housing_cpi().
+    mode="layers" is the original one-layer-per-year map; mode="single" embeds one
+    simplified geometry and switches years in the browser (much smaller HTML).
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown map mode {mode!r}; expected one of {MODES}")
+    timer = timer or StageTimer()
+    merged_gdf = _prepare(prices_path, geojson_path, horizon, timer,
+                          simplify_m=simplify_m if mode == "single" else None, precision=precision,
+                          cpi_forecast=cpi_forecast)
+    with timer.stage("render"):
+        m = render_map_single(merged_gdf, horizon) if mode == "single" else render_map(merged_gdf, horizon)
+    with timer.stage("save"):
+        return save_map(m, output)
+
+
+def _prepare(prices_path, geojson_path, horizon: int, timer: StageTimer, *,
+             simplify_m: Optional[float], precision: int = DEFAULT_PRECISION,
+             cpi_forecast: Optional[Dict[int, float]] = None):
+    """load -> merge -> project [-> simplify]; simplify_m=None keeps full geometry."""
+    with timer.stage("import"):
+        import_dependencies()
+        from geometry_cache import DEFAULT_TOLERANCES
+    # use a pre-simplified cached level when the tolerance is one of them
+    presimplified = simplify_m is not None and float(simplify_m) in DEFAULT_TOLERANCES
+    with timer.stage("load"):
+        price_df = load_prices(prices_path)
+        gdf = load_geometry(geojson_path, simplify_m if presimplified else 0.0)
+    with timer.stage("merge"):
+        merged_gdf = merge_prices(gdf, price_df)
+    with timer.stage("project"):
+        merged_gdf = project_prices(merged_gdf, horizon, cpi_forecast)
+    if simplify_m is not None:
+        with timer.stage("simplify"):
+            years = merged_gdf.attrs.get('projection_years')
+            merged_gdf = simplify_geometry(merged_gdf, 0.0 if presimplified else simplify_m, precision)
+            merged_gdf.attrs['projection_years'] = years
+    return merged_gdf
+
+
+# --- 6. STATIC ASSETS (--export-dir) ---
+def _write_hashed(directory: Path, stem: str, suffix: str, data: bytes) -> str:
+    """Write data as <stem>.<content hash><suffix> (immutable, cache forever); return the name."""
+    import hashlib
+
+    name = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{suffix}"
+    path = directory / name
+    if not path.exists():
+        atomic_write_bytes(path, data)
+    return name
+
+
+def _compact_json(obj) -> bytes:
+    import json
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def export_static(
+    prices_path: str | Path = PRICES_CSV,
+    geojson_path: str | Path = GEOJSON_PATH,
+    export_dir: str | Path = "map_static",
+    *,
+    horizon: int = DEFAULT_HORIZON,
+    simplify_m: float = DEFAULT_SIMPLIFY_M,
+    precision: int = DEFAULT_PRECISION,
+    cpi_forecast: Optional[Dict[int, float]] = None,
+    timer: Optional[StageTimer] = None,
+) -> Path:
+    """
+    Write the map as static files a CDN / plain file server can cache:
+        geometry.<hash>.geojson          shared borough shapes (simplified, rounded)
+        prices/price_<year>.<hash>.json  one small file per projection year
+        manifest.json                    which files are current (the only mutable JSON)
+        index.html                       thin Leaflet page that fetches the above lazily
+    Hashed files never change, so a price update only adds new per-year files and a
+    new manifest; old hashed files are left for clients still holding the old manifest.
+    """
+    import json
+
+    timer = timer or StageTimer()
+    merged_gdf = _prepare(prices_path, geojson_path, horizon, timer,
+                          simplify_m=simplify_m, precision=precision, cpi_forecast=cpi_forecast)
+    with timer.stage("export"):
+        out = Path(export_dir)
+        (out / "prices").mkdir(parents=True, exist_ok=True)
+
+        shapes = json.loads(merged_gdf[['geometry', 'NOM', 'csv_name']].to_json(drop_id=True))
+        for i, feature in enumerate(shapes['features']):
+            feature['id'] = i  # price files are arrays in this order
+        geometry_file = _write_hashed(out, 'geometry', '.geojson', _compact_json(shapes))
+
+        calendar_years = merged_gdf.attrs['projection_years']
+        years = []
+        for k in range(horizon + 1):
+            prices = [int(p) for p in merged_gdf[f'Price_{k}yr']]
+            data = _compact_json({'year': calendar_years[k], 'geometry': geometry_file, 'prices': prices})
+            name = _write_hashed(out / 'prices', f'price_{calendar_years[k]}', '.json', data)
+            years.append({'offset': k, 'year': calendar_years[k], 'label': layer_label(k),
+                          'file': f'prices/{name}'})
+
+        manifest = {
+            'geometry': geometry_file,
+            'years': years,
+            'breaks': PRICE_BREAKS,
+            'no_price_color': NO_PRICE_COLOR,
+            'center': [45.5017, -73.5673],
+            'zoom': 10,
+        }
+        atomic_write_bytes(out / "manifest.json", _compact_json(manifest))
+        (out / "index.html").write_text(_STATIC_INDEX_HTML.replace('__TOOLTIP_STYLE__', ' '.join(_TOOLTIP_STYLE.split())),
+                                        encoding='utf-8')
+    return out
+
+
+_STATIC_INDEX_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>Montréal rent prices</title>
+<link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.css">
+<script src="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.js"></script>
+<style>
+    html, body, #map { width: 100%; height: 100%; margin: 0; }
+    .price-tooltip { __TOOLTIP_STYLE__ }
+    .year-switch { background: #fff; padding: 6px 10px; border-radius: 5px; box-shadow: 0 1px 5px rgba(0,0,0,0.4); font: 13px sans-serif; }
+    .year-switch label { display: block; margin-bottom: 5px; cursor: pointer; }
+    .year-switch input { margin-right: 8px; }
+</style>
+</head>
+<body>
+<div id="map"></div>
+<script>
+(async function() {
+    var getJSON = function(url, opts) {
+        return fetch(url, opts).then(function(r) {
+            if (!r.ok) throw new Error(url + ': ' + r.status);
+            return r.json();
+        });
+    };
+    var manifest = await getJSON('manifest.json', {cache: 'no-cache'});
+    var map = L.map('map').setView(manifest.center, manifest.zoom);
+    L.tileLayer('https://{s}.basemaps.cartocdn.com/light_all/{z}/{x}/{y}{r}.png', {
+        attribution: '&copy; OpenStreetMap contributors &copy; CARTO', subdomains: 'abcd', maxZoom: 20
+    }).addTo(map);
+
+    var loaded = {};  // year offset -> price array, fetched on first use
+    function pricesFor(k) {
+        if (!loaded[k]) loaded[k] = getJSON(manifest.years[k].file).then(function(d) { return d.prices; });
+        return loaded[k];
+    }
+    function color(price) {
+        for (var i = 0; i < manifest.breaks.length; i++) {
+            if (price > manifest.breaks[i][0]) return manifest.breaks[i][1];
+        }
+        return manifest.no_price_color;
+    }
+
+    var prices = [];
+    function style(feature) {
+        return {fillColor: color(prices[feature.id] || 0), fillOpacity: 0.7, weight: 0.3, color: '#444'};
+    }
+    var shapes = await getJSON(manifest.geometry);
+    prices = await pricesFor(0);
+    var layer = L.geoJSON(shapes, {
+        style: style,
+        onEachFeature: function(feature, l) {
+            l.on('mouseover', function() { l.setStyle({weight: 3, color: '#FFF', fillOpacity: 0.5}); });
+            l.on('mouseout', function() { layer.resetStyle(l); });
+        }
+    }).addTo(map);
+    layer.bindTooltip(function(l) {
+        return '<b>Municipality:</b> ' + l.feature.properties.NOM + '<br><b>Projected Price: $</b>'
+            + (prices[l.feature.id] || 0).toLocaleString();
+    }, {className: 'price-tooltip', sticky: false});
+
+    var control = L.control({position: 'topright'});
+    control.onAdd = function() {
+        var div = L.DomUtil.create('div', 'year-switch');
+        div.innerHTML = '<strong>Price Projections:</strong>' + manifest.years.map(function(y, k) {
+            return '<label><input type="radio" name="projection-year" value="' + k + '"'
+                + (k === 0 ? ' checked' : '') + '>' + y.label + ' (' + y.year + ')</label>';
+        }).join('');
+        L.DomEvent.disableClickPropagation(div);
+        div.addEventListener('change', async function(e) {
+            prices = await pricesFor(+e.target.value);
+            layer.setStyle(style);
+        });
+        return div;
+    };
+    control.addTo(map);
+})();
+</script>
+</body>
+</html>
+"""
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build the Montréal rent map with CPI projections.")
+    parser.add_argument("--prices", default=str(PRICES_CSV), help="housing_prices.csv path")
+    parser.add_argument("--geojson", default=str(GEOJSON_PATH), help="borough boundaries GeoJSON")
+    parser.add_argument("--output", default=OUTPUT_HTML, help="HTML file to write")
+    parser.add_argument("--horizon", type=int, default=DEFAULT_HORIZON, help="years of projection (default 5)")
+    parser.add_argument("--mode", choices=MODES, default="layers",
+                        help="layers: one layer per year (original); single: one geometry, client-side year switch")
+    parser.add_argument("--simplify", type=float, default=DEFAULT_SIMPLIFY_M,
+                        help=f"single mode: simplification tolerance in metres (default {DEFAULT_SIMPLIFY_M:g}, 0 = off)")
+    parser.add_argument("--precision", type=int, default=DEFAULT_PRECISION,
+                        help=f"single mode: coordinate decimals (default {DEFAULT_PRECISION})")
+    parser.add_argument("--export-dir", default=None,
+                        help="write static, cacheable assets (geometry + per-year prices + index.html) "
+                             "to this directory instead of one HTML file")
+    parser.add_argument("--profile", action="store_true", help="print time spent per stage")
+    args = parser.parse_args(argv)
+    if args.horizon < 0:
+        parser.error("--horizon must be >= 0")
+
+    timer = StageTimer()
+    if args.export_dir:
+        out = export_static(args.prices, args.geojson, args.export_dir, horizon=args.horizon,
+                            simplify_m=args.simplify, precision=args.precision, timer=timer)
+        print(f"Success! Static map assets written to {out}")
+    else:
+        out = build_map(args.prices, args.geojson, args.output, horizon=args.horizon,
+                        mode=args.mode, simplify_m=args.simplify, precision=args.precision, timer=timer)
+        print(f"Success! Map with projections saved to {out}")
+    if args.profile:
+        timer.report()
+    return 0
+
 
-print(f"Success! Map with projections saved to {output_map_filename}")
+if __name__ == "__main__":
+    sys.exit(main())
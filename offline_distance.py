@@ -0,0 +1,181 @@
+"""
+Offline commute-distance estimator (no network).
+
+Addresses are geocoded to municipality / borough centroids from the bundled
+municipality_centroids.csv (built from limites-administratives-agglomeration-nad83.geojson
+by `build_centroid_table`), then distances are great-circle (haversine) km scaled by
+a road-detour factor. Good enough for bulk what-if runs; use the live API for the
+final quote.
+
+    from offline_distance import OfflineDistanceBackend
+    distance.set_backend(OfflineDistanceBackend())
+
+Addresses that can't be placed come back with status "NOT_FOUND", like the API.
+So do trips whose two ends only resolve to the same city-wide centroid (COARSE_PLACES,
+e.g. two addresses that name "Montréal" but no borough): a 0 km answer would be wrong,
+so the pair is left to the fallback backend.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import csv
+import re
+
+import numpy as np
+
+from distance_backends import DistanceBackend, make_element
+from places import normalize_place
+
+HERE = Path(__file__).resolve().parent
+CENTROIDS_PATH = HERE / "municipality_centroids.csv"
+GEOJSON_PATH = HERE / "limites-administratives-agglomeration-nad83.geojson"
+
+EARTH_RADIUS_KM = 6371.0088
+
+# road km / straight-line km; typical for an urban grid, see calibrate_detour_factor()
+DEFAULT_DETOUR_FACTOR = 1.3
+
+# average door-to-door speeds used for the duration estimate
+SPEED_KMH = {"driving": 35.0, "transit": 20.0, "bicycling": 15.0, "walking": 5.0}
+
+# centroids that stand for a whole city rather than one borough / town
+COARSE_PLACES = ("Montréal",)
+
+_POSTAL_RE = re.compile(r"\b[A-Za-z]\d[A-Za-z]\s?\d[A-Za-z]\d\b")
+_ARTICLES = ("le ", "la ", "les ", "l ")
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great-circle distance in km; inputs broadcast like any NumPy expression."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(a, dtype=float)) for a in (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2.0) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2.0) ** 2)
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def calibrate_detour_factor(straight_km: Iterable[float], road_km: Iterable[float]) -> float:
+    """
+    Median road/straight ratio over sample trips (e.g. a few live API answers
+    paired with haversine distances). Pairs shorter than 0.5 km are ignored.
+    """
+    s = np.asarray(list(straight_km), dtype=float)
+    r = np.asarray(list(road_km), dtype=float)
+    keep = (s > 0.5) & (r > 0)
+    if not keep.any():
+        return DEFAULT_DETOUR_FACTOR
+    return float(np.median(r[keep] / s[keep]))
+
+
+def build_centroid_table(geojson_path: str | Path = GEOJSON_PATH,
+                         out_path: str | Path = CENTROIDS_PATH) -> Path:
+    """
+    Regenerate municipality_centroids.csv from the agglomeration GeoJSON.
+    Needs geopandas; centroids are taken in the source (metric) CRS, then stored as WGS84.
+    A "Montréal" row covers the union of the city's boroughs.
+    """
+    import geopandas as gpd
+
+    gdf = gpd.read_file(geojson_path)
+    rows = [(name, geom) for name, geom in zip(gdf["NOM"], gdf.geometry)]
+    boroughs = gdf[gdf["TYPE"] == "Arrondissement"]
+    if len(boroughs):
+        rows.append(("Montréal", boroughs.geometry.union_all()))
+    cents = gpd.GeoSeries([g.centroid for _, g in rows], crs=gdf.crs).to_crs(4326)
+
+    out_path = Path(out_path)
+    with out_path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["name", "lat", "lon"])
+        for (name, _), pt in sorted(zip(rows, cents), key=lambda r: r[0][0]):
+            w.writerow([name, f"{pt.y:.6f}", f"{pt.x:.6f}"])
+    return out_path
+
+
+class CentroidGeocoder:
+    """Address -> (lat, lon) of the first comma-separated part naming a known place."""
+
+    def __init__(self, csv_path: str | Path = CENTROIDS_PATH, *, coarse: Iterable[str] = COARSE_PLACES):
+        self.csv_path = Path(csv_path)
+        self._points: Dict[str, Tuple[float, float]] = {}
+        self._by_name: Dict[str, str] = {}  # name or article-less alias -> place
+        self._coarse = {normalize_place(name) for name in coarse}
+        with self.csv_path.open(newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                self.add(row["name"], float(row["lat"]), float(row["lon"]))
+
+    def add(self, name: str, lat: float, lon: float) -> None:
+        key = normalize_place(name)
+        self._points[key] = (lat, lon)
+        self._by_name[key] = key
+        for art in _ARTICLES:
+            if key.startswith(art):
+                self._by_name.setdefault(key[len(art):], key)
+
+    def locate(self, address: str) -> Optional[str]:
+        """Normalized name of the place `address` resolves to, or None."""
+        parts = [normalize_place(_POSTAL_RE.sub("", p)) for p in (address or "").split(",")]
+        # the most specific part (borough / town) usually comes first after the street
+        for part in parts:
+            if part in self._by_name:
+                return self._by_name[part]
+        return None
+
+    def is_coarse(self, place: Optional[str]) -> bool:
+        return place in self._coarse
+
+    def geocode(self, address: str) -> Optional[Tuple[float, float]]:
+        place = self.locate(address)
+        return self._points[place] if place is not None else None
+
+    def geocode_many(self, addresses: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (lat, lon, found) arrays; missing addresses get NaN coordinates."""
+        lat, lon = self.coordinates([self.locate(a) for a in addresses])
+        return lat, lon, ~np.isnan(lat)
+
+    def coordinates(self, places: Sequence[Optional[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        """(lat, lon) arrays for places returned by locate(); None gives NaN."""
+        lat = np.full(len(places), np.nan)
+        lon = np.full(len(places), np.nan)
+        for i, place in enumerate(places):
+            if place is not None:
+                lat[i], lon[i] = self._points[place]
+        return lat, lon
+
+
+class OfflineDistanceBackend(DistanceBackend):
+    def __init__(self, geocoder: Optional[CentroidGeocoder] = None, *,
+                 detour_factor: float = DEFAULT_DETOUR_FACTOR):
+        self.geocoder = geocoder or CentroidGeocoder()
+        self.detour_factor = float(detour_factor)
+
+    def road_km(self, origins: Sequence[str], destinations: Sequence[str]) -> np.ndarray:
+        """
+        Dense origins x destinations matrix of estimated road km; NaN where an end
+        isn't geocoded or both ends only resolve to the same coarse centroid.
+        """
+        o_places = [self.geocoder.locate(a) for a in origins]
+        d_places = [self.geocoder.locate(a) for a in destinations]
+        olat, olon = self.geocoder.coordinates(o_places)
+        dlat, dlon = self.geocoder.coordinates(d_places)
+        km = haversine_km(olat[:, None], olon[:, None], dlat[None, :], dlon[None, :]) * self.detour_factor
+
+        coarse = np.array([self.geocoder.is_coarse(p) for p in o_places], dtype=bool)
+        same = np.array(o_places, dtype=object)[:, None] == np.array(d_places, dtype=object)[None, :]
+        km[same & coarse[:, None]] = np.nan
+        return km
+
+    def matrix(self, origins, destinations, mode="driving") -> List[List[Dict]]:
+        km = self.road_km(origins, destinations)
+        speed = SPEED_KMH.get(mode, SPEED_KMH["driving"])
+        seconds = km / speed * 3600.0
+        rows = []
+        for i in range(km.shape[0]):
+            row = []
+            for j in range(km.shape[1]):
+                if np.isnan(km[i, j]):
+                    row.append({"status": "NOT_FOUND"})
+                else:
+                    row.append(make_element(km[i, j] * 1000.0, seconds[i, j]))
+            rows.append(row)
+        return rows
@@ -0,0 +1,310 @@
+"""
+Incremental build of the cost-of-living artifacts.
+
+Each Stage declares its input files, the project modules it imports, parameters,
+upstream stages and output files. A stage's fingerprint is the SHA-256 of its
+parameters, the content hashes of its inputs and of its code (the declared modules
+plus every project module they import, found by reading their import statements),
+and the fingerprints of its upstream stages; it reruns only when that fingerprint
+differs from the one recorded in .cache/pipeline-state.json (or an output is
+missing). Stages whose upstream is done run in parallel in a process
+pool, so the food and housing branches build side by side.
+
+    python pipeline.py                  # rebuild what changed
+    python pipeline.py --dry-run        # show what would run
+    python pipeline.py --force housing_map --workers 1
+
+Input hashes are reused while a file's mtime/size are unchanged (same rule as the
+tuition snapshot), so an up-to-date run costs a few stat calls.
+"""
+
+from __future__ import annotations
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import argparse
+import ast
+import hashlib
+import json
+import os
+import sys
+import time
+
+from fileutil import atomic_write, file_sha256
+
+HERE = Path(__file__).resolve().parent
+STATE_PATH = HERE / ".cache" / "pipeline-state.json"
+ARTIFACTS = HERE / ".cache" / "pipeline"
+_STATE_VERSION = 1
+
+FOOD_CPI_CSV = HERE / "Food" / "1810000401-eng.csv"
+HOUSING_CPI_CSV = HERE / "CPI_housing.csv"
+HOUSING_PRICES_CSV = HERE / "housing_prices.csv"
+GEOJSON_PATH = HERE / "limites-administratives-agglomeration-nad83.geojson"
+
+
+@dataclass
+class Stage:
+    name: str
+    run: Callable[..., None]     # module-level function (picklable): run(inputs, outputs, **params)
+    inputs: Sequence[Path] = ()
+    outputs: Sequence[Path] = ()
+    params: Dict[str, object] = field(default_factory=dict)
+    deps: Sequence[str] = ()
+    modules: Sequence[str] = ()  # project modules `run` imports, e.g. "Food.model"
+
+
+def _module_file(name: str, root: Path) -> Optional[Path]:
+    if not name:
+        return None
+    base = root.joinpath(*name.split("."))
+    for path in (base.with_suffix(".py"), base / "__init__.py"):
+        if path.is_file():
+            return path
+    return None
+
+
+def local_sources(modules: Sequence[str], root: Path = HERE) -> List[Path]:
+    """
+    Source files of `modules` and of every module under `root` they import,
+    transitively (imports inside functions included). Other modules are skipped.
+    """
+    found: Dict[str, Path] = {}
+    todo = list(modules)
+    while todo:
+        name = todo.pop()
+        if name in found:
+            continue
+        path = _module_file(name, root)
+        if path is None:
+            continue
+        found[name] = path
+        package = name if path.name == "__init__.py" else name.rpartition(".")[0]
+        todo.append(name.rpartition(".")[0])  # importing a.b runs a/__init__.py
+        for node in ast.walk(ast.parse(path.read_bytes(), str(path))):
+            if isinstance(node, ast.Import):
+                todo.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                if node.level:
+                    parts = package.split(".") if package else []
+                    parts = parts[:len(parts) - node.level + 1]
+                    base = ".".join(parts + ([node.module] if node.module else []))
+                else:
+                    base = node.module or ""
+                todo.append(base)
+                todo.extend(f"{base}.{alias.name}" if base else alias.name for alias in node.names)
+    return sorted(found.values())
+
+
+# ---------- stage functions ----------
+
+def _write_json(path: Path, obj) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_write(path) as f:
+        json.dump(obj, f, indent=1)
+
+
+def _read_cpi(path: Path) -> Dict[int, float]:
+    return {int(y): v for y, v in json.loads(path.read_text(encoding="utf-8")).items()}
+
+
+def run_food_cpi(inputs, outputs, *, end_year: int) -> None:
+    from Food.model import build_food_cpi_model
+    _write_json(outputs[0], build_food_cpi_model(str(inputs[0]), end_year=end_year))
+
+
+def run_food_plots(inputs, outputs, *, store: str, weekly_budget: float, scenarios, first_year: int,
+                   last_year: int, dpi: int) -> None:
+    from visualize_food import plot_cpi_index, plot_food_cost_comparison
+
+    cpi_index = _read_cpi(inputs[0])
+    plot_cpi_index(cpi_index).savefig(outputs[0], dpi=dpi)
+    plot_food_cost_comparison(cpi_index, store, weekly_budget, scenarios,
+                              range(first_year, last_year + 1)).savefig(outputs[1], dpi=dpi)
+
+
+def run_housing_cpi(inputs, outputs, *, horizon: int) -> None:
+    from housing_model import forecast_housing_cpi
+    _write_json(outputs[0], forecast_housing_cpi(horizon, inputs[0]))
+
+
+def run_housing_map(inputs, outputs, *, horizon: int, mode: str) -> None:
+    from map import build_map
+    # use the housing_cpi stage's forecast rather than refitting
+    build_map(inputs[1], inputs[2], outputs[0], horizon=horizon, mode=mode, cpi_forecast=_read_cpi(inputs[0]))
+
+
+def default_stages() -> List[Stage]:
+    horizon = 5
+    return [
+        Stage("food_cpi", run_food_cpi, modules=["Food.model"],
+              inputs=[FOOD_CPI_CSV], outputs=[ARTIFACTS / "food_cpi.json"],
+              params={"end_year": 2035}),
+        Stage("food_plots", run_food_plots, deps=["food_cpi"], modules=["visualize_food"],
+              inputs=[ARTIFACTS / "food_cpi.json"],
+              outputs=[HERE / "cpi_index_by_year.png", HERE / "food_cost_comparison.png"],
+              params={"store": "Walmart", "weekly_budget": 180.0, "scenarios": ["never", "3-5x", "daily"],
+                      "first_year": 2025, "last_year": 2035, "dpi": 150}),
+        Stage("housing_cpi", run_housing_cpi, modules=["housing_model"],
+              inputs=[HOUSING_CPI_CSV], outputs=[ARTIFACTS / "housing_cpi.json"],
+              params={"horizon": horizon}),
+        Stage("housing_map", run_housing_map, deps=["housing_cpi"], modules=["map"],
+              inputs=[ARTIFACTS / "housing_cpi.json", HOUSING_PRICES_CSV, GEOJSON_PATH],
+              outputs=[HERE / "montreal_map_with_prices.html"],
+              params={"horizon": horizon, "mode": "layers"}),
+    ]
+
+
+# ---------- runner ----------
+
+class Pipeline:
+    def __init__(self, stages: Sequence[Stage], state_path: str | Path = STATE_PATH,
+                 source_root: str | Path = HERE):
+        self.stages = {s.name: s for s in stages}
+        for s in stages:
+            missing = [d for d in s.deps if d not in self.stages]
+            if missing:
+                raise ValueError(f"Stage {s.name!r} depends on unknown stage(s) {missing}")
+        self.state_path = Path(state_path)
+        self.source_root = Path(source_root)
+        self.state = self._load_state()
+        self._order = self._topological()
+
+    def _load_state(self) -> dict:
+        try:
+            with self.state_path.open(encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("version") == _STATE_VERSION:
+                return state
+        except (OSError, ValueError):
+            pass
+        return {"version": _STATE_VERSION, "files": {}, "stages": {}}
+
+    def _save_state(self) -> None:
+        _write_json(self.state_path, self.state)
+
+    def _topological(self) -> List[str]:
+        order, seen = [], {}
+
+        def visit(name: str) -> None:
+            if seen.get(name) == 1:
+                raise ValueError(f"Dependency cycle through stage {name!r}")
+            if seen.get(name) == 2:
+                return
+            seen[name] = 1
+            for d in self.stages[name].deps:
+                visit(d)
+            seen[name] = 2
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def _file_hash(self, path: Path) -> str:
+        """Content hash, reused while mtime/size match the recorded ones."""
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return "missing"
+        rec = self.state["files"].get(str(path))
+        if rec and (rec["mtime_ns"], rec["size"]) == (st.st_mtime_ns, st.st_size):
+            return rec["sha256"]
+        sha = file_sha256(path)
+        self.state["files"][str(path)] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": sha}
+        return sha
+
+    def plan(self, force: Sequence[str] = ()) -> Tuple[Dict[str, str], List[str]]:
+        """(fingerprint per stage, stages that must run, in dependency order)."""
+        fingerprints: Dict[str, str] = {}
+        to_run: List[str] = []
+        for name in self._order:
+            stage = self.stages[name]
+            # outputs of upstream stages are covered by the upstream fingerprint
+            produced = {str(p) for d in stage.deps for p in self.stages[d].outputs}
+            blob = json.dumps({
+                "params": stage.params,
+                "inputs": {str(p): self._file_hash(Path(p)) for p in stage.inputs if str(p) not in produced},
+                "code": {str(p): self._file_hash(p) for p in local_sources(stage.modules, self.source_root)},
+                "deps": {d: fingerprints[d] for d in stage.deps},
+            }, sort_keys=True, default=str)
+            fingerprints[name] = hashlib.sha256(blob.encode("utf-8")).hexdigest()
+            recorded = self.state["stages"].get(name, {}).get("fingerprint")
+            if (name in force or recorded != fingerprints[name]
+                    or any(d in to_run for d in stage.deps)
+                    or not all(Path(p).exists() for p in stage.outputs)):
+                to_run.append(name)
+        return fingerprints, to_run
+
+    def run(self, *, force: Sequence[str] = (), workers: Optional[int] = None,
+            dry_run: bool = False, log=sys.stderr) -> List[str]:
+        """Run the stages that changed; returns their names in completion order."""
+        fingerprints, to_run = self.plan(force)
+        if not dry_run:
+            self._save_state()  # keep the refreshed file hashes even if nothing runs
+        if dry_run or not to_run:
+            for name in self._order:
+                print(f"  {name:<12} {'would run' if name in to_run else 'up to date'}", file=log)
+            return to_run if dry_run else []
+
+        pending = set(to_run)
+        done: List[str] = []
+        workers = workers or min(len(to_run), os.cpu_count() or 1)
+
+        def ready() -> List[str]:
+            return [n for n in to_run if n in pending and not any(d in pending for d in self.stages[n].deps)]
+
+        def finish(name: str, seconds: float) -> None:
+            self.state["stages"][name] = {"fingerprint": fingerprints[name], "seconds": round(seconds, 3)}
+            self._save_state()
+            done.append(name)
+            print(f"  {name:<12} ran in {seconds:7.2f} s", file=log)
+
+        if workers == 1:
+            for name in to_run:
+                pending.discard(name)
+                finish(name, _run_stage(self.stages[name]))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                running = {}
+                while pending or running:
+                    for name in ready():
+                        pending.discard(name)
+                        running[pool.submit(_run_stage, self.stages[name])] = name
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        finish(running.pop(fut), fut.result())
+        for name in self._order:
+            if name not in to_run:
+                print(f"  {name:<12} up to date", file=log)
+        return done
+
+
+def _run_stage(stage: Stage) -> float:
+    t0 = time.perf_counter()
+    for p in stage.outputs:
+        Path(p).parent.mkdir(parents=True, exist_ok=True)
+    stage.run([Path(p) for p in stage.inputs], [Path(p) for p in stage.outputs], **stage.params)
+    return time.perf_counter() - t0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild the cost-of-living artifacts whose inputs changed.")
+    parser.add_argument("--force", nargs="*", default=None, metavar="STAGE",
+                        help="rerun these stages (and everything downstream); no names = all")
+    parser.add_argument("--workers", type=int, default=None, help="parallel stages (default: as many as can run)")
+    parser.add_argument("--dry-run", action="store_true", help="only print which stages would run")
+    args = parser.parse_args(argv)
+
+    pipeline = Pipeline(default_stages())
+    force = [] if args.force is None else (args.force or list(pipeline.stages))
+    unknown = [f for f in force if f not in pipeline.stages]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+    pipeline.run(force=force, workers=args.workers, dry_run=args.dry_run)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+"""
+Place-name normalization shared by the geocoding / zone lookups.
+
+"Montréal", "MONTREAL" and "montreal" all map to the same key; so do
+"Côte-des-Neiges–Notre-Dame-de-Grâce" and "Cote des Neiges Notre Dame de Grace".
+"""
+
+from __future__ import annotations
+import re
+import unicodedata
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_place(name: str) -> str:
+    """Casefold, strip accents, and collapse punctuation/dashes/apostrophes to single spaces."""
+    s = unicodedata.normalize("NFKD", name or "")
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(" ", s.casefold()).strip()
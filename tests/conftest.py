@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# the project is a flat set of modules run from the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
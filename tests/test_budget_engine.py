@@ -0,0 +1,108 @@
+import math
+import threading
+from dataclasses import replace
+
+import pytest
+
+import distance
+from budget_engine import ITEMS, BudgetEngine, StudentProfile
+from distance_backends import FakeDistanceBackend
+from Food.food_estimator import expected_monthly_food_cost_for_year
+from transportation_price import get_bixi_price, tarif
+
+MCGILL = "845 Sherbrooke St W, Montreal, Quebec H3A 0G4"
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return BudgetEngine()
+
+
+def profiles():
+    boroughs = ["Plateau-Mont-Royal", "Le Plateau-Mont-Royal", "Anjou", "Verdun", "Côte-Saint-Luc"]
+    homes = ["4500 Rue Saint-Denis, Montréal, QC H2J 2L3", "525 Avenue 74, Laval, QC H7V 2X9",
+             "98 Croissant des Trèfles, L'Île-Perrot, QC J7V 2G2"]
+    out = []
+    for i in range(60):
+        out.append(StudentProfile(
+            school="McGill", program="Bachelor of Arts (BA)",
+            borough=boroughs[i % len(boroughs)], home_address=homes[i % len(homes)],
+            school_address=MCGILL,
+            eating_out=("never", "1-2x", "3-5x", "daily")[i % 4],
+            store_type=("Walmart", "Maxi", "Metro")[i % 3],
+            weekly_grocery_budget=100.0 + 7.5 * i,
+            start_year=2024 + i % 6, years=1 + i % 5,
+            commute=("stm", "bixi")[i % 2],
+        ))
+    return out
+
+
+def test_budget_many_equals_budget(engine):
+    batch = profiles()
+    one_by_one = [engine.budget(p) for p in batch]
+    assert engine.budget_many(batch, workers=1, chunk_size=7) == one_by_one
+    assert engine.budget_many(batch, workers=2, chunk_size=16) == one_by_one
+
+
+def test_budget_items(engine):
+    p = profiles()[0]                       # stm, Plateau home (zone A)
+    budget = engine.budget(p)
+    assert sorted(budget) == list(range(p.start_year, p.start_year + p.years))
+    for year, row in budget.items():
+        assert row["food"] == expected_monthly_food_cost_for_year(
+            year=min(year, engine.end_year), eating_out=p.eating_out, store_type=p.store_type,
+            weekly_grocery_budget=p.weekly_grocery_budget, cpi_index_by_year=engine.food_cpi)
+        assert row["transport"] == tarif["A"]
+        assert row["total"] == round(sum(row[k] for k in ITEMS), 2)
+    assert engine.budget(profiles()[1])[2025]["transport"] == float(get_bixi_price())
+
+
+def test_borough_spellings_share_rents(engine):
+    csv_name = profiles()[0]
+    nom = replace(csv_name, borough="LE PLATEAU MONT-ROYAL")   # GeoJSON name, any case/punctuation
+    assert engine.budget(csv_name) == engine.budget(nom)
+
+
+def test_car_commute_uses_distance_backend(engine, monkeypatch):
+    monkeypatch.setattr(distance, "_backend", FakeDistanceBackend())
+    monkeypatch.setattr(distance, "_cache", None)
+    monkeypatch.setenv("DISTANCE_CACHE_TTL", "0")
+    p = StudentProfile(school="McGill", program="Bachelor of Arts (BA)", borough="Anjou",
+                       home_address="7500 Boulevard Galeries d'Anjou, Anjou, QC H1M 3M2",
+                       school_address=MCGILL, commute="car", km_per_litre=15.0, fuel_price=1.6)
+    km = FakeDistanceBackend().matrix([p.home_address], [MCGILL])[0][0]["distance"]["value"] / 1000.0
+    assert engine.budget(p)[2025]["transport"] == round(30 * 2 * km / 15.0 * 1.6, 2)
+
+
+def test_unknown_inputs(engine):
+    bad = StudentProfile(school="McGill", program="Bachelor of Arts (BA)", borough="Atlantis",
+                         home_address="1 Main St, Toronto, ON M5V 2T6", school_address=MCGILL)
+    with pytest.raises(ValueError):
+        engine.budget(bad)
+    lenient = engine.budget(bad, strict=False)[2025]
+    assert lenient["rent"] is None and lenient["transport"] is None and lenient["total"] is None
+    assert not math.isnan(lenient["food"])
+    with pytest.raises(ValueError):
+        engine.budget(StudentProfile(school="McGill", program="Bachelor of Arts (BA)", borough="Anjou",
+                                     home_address="x", commute="boat"))
+
+
+def test_pool_after_serial_car_run(engine, monkeypatch):
+    # a serial run starts the client's thread pool; forked workers must not reuse it
+    from distance_backends import ConcurrentDistanceClient
+
+    monkeypatch.setattr(distance, "_backend", ConcurrentDistanceClient(FakeDistanceBackend()))
+    monkeypatch.setattr(distance, "_cache", None)
+    monkeypatch.setenv("DISTANCE_CACHE_TTL", "0")
+    monkeypatch.setenv("DISTANCE_BACKEND", "fake")      # what the workers rebuild from
+    homes = [f"{i} Rue Saint-Denis, Montréal, QC H2J 2L3" for i in range(120)]
+    batch = [replace(p, home_address=h, commute="car") for p, h in zip(profiles() * 2, homes)]
+
+    serial = engine.budget_many(batch, workers=1, chunk_size=40)
+    result = []
+    run = threading.Thread(target=lambda: result.append(engine.budget_many(batch, workers=2, chunk_size=40)),
+                           daemon=True)
+    run.start()
+    run.join(timeout=60)
+    assert not run.is_alive(), "process pool hung"
+    assert result[0] == serial
@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import pytest
+
+from Food import cpi_store
+from Food.cpi_store import CPIStore, ingest_cpi_table
+from Food.model import _open_sniff, _yearly_averages
+
+CPI_CSV = Path(__file__).resolve().parent.parent / "Food" / "1810000401-eng.csv"
+
+
+@pytest.fixture(autouse=True)
+def store_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(cpi_store, "STORE_ROOT", tmp_path / "cpi_store")
+
+
+def test_wide_csv_matches_model_parser():
+    store = CPIStore.from_csv(CPI_CSV)
+    assert store.yearly_averages("CPI") == _yearly_averages(*_open_sniff(str(CPI_CSV)))
+
+
+def test_wide_geography_is_part_of_the_store_key():
+    plain = CPIStore.from_csv(CPI_CSV)
+    montreal = CPIStore.from_csv(CPI_CSV, wide_geography="Montréal, Quebec")
+    assert plain.store_dir != montreal.store_dir
+    assert montreal.yearly_averages("CPI", "Montréal, Quebec") == plain.yearly_averages("CPI")
+    with pytest.raises(KeyError):
+        montreal.row("CPI")
+    assert CPIStore.from_csv(CPI_CSV, wide_geography="Montréal, Quebec").store_dir == montreal.store_dir
+
+
+def test_long_table(tmp_path):
+    path = tmp_path / "long.csv"
+    path.write_text(
+        "REF_DATE,GEO,DGUID,Products and product groups,UOM,VALUE\n"
+        "2024-11,Canada,x,Food,2002=100,190.0\n"
+        "2024-12,Canada,x,Food,2002=100,192.0\n"
+        "2025-01,Canada,x,Food,2002=100,194.5\n"
+        "2025-01,\"Montréal, Quebec\",y,Food,2002=100,180.0\n",
+        encoding="utf-8")
+    store = CPIStore(ingest_cpi_table(path))
+    assert store.yearly_averages("food", "canada") == {2024: 191.0, 2025: 194.5}
+    years, months, values = store.series("Food", "Montréal, Quebec")
+    assert (years.tolist(), months.tolist(), values.tolist()) == ([2025], [1], [180.0])
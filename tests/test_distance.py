@@ -0,0 +1,96 @@
+import pytest
+
+import distance
+from distance_backends import FakeDistanceBackend
+from distance_cache import DistanceCache
+
+
+class RecordingBackend(FakeDistanceBackend):
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def matrix(self, origins, destinations, mode="driving"):
+        self.requests.append((list(origins), list(destinations)))
+        return super().matrix(origins, destinations, mode)
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    backend = RecordingBackend()
+    monkeypatch.setattr(distance, "_backend", backend)
+    monkeypatch.setattr(distance, "_cache", None)
+    monkeypatch.setenv("DISTANCE_CACHE_TTL", "0")
+    return backend
+
+
+def addresses(prefix, n):
+    return [f"{i} {prefix} St, Montreal, QC" for i in range(n)]
+
+
+def assert_within_limits(requests):
+    for o, d in requests:
+        assert len(o) <= distance.MAX_ORIGINS_PER_REQUEST
+        assert len(d) <= distance.MAX_DESTINATIONS_PER_REQUEST
+        assert len(o) * len(d) <= distance.MAX_ELEMENTS_PER_REQUEST
+
+
+def assert_matches_scalar(result, origins, destinations):
+    fake = FakeDistanceBackend()
+    for i, o in enumerate(origins):
+        for j, d in enumerate(destinations):
+            element = fake.matrix([o], [d])[0][0]
+            assert result.distance_m[i][j] == element["distance"]["value"]
+            assert result.duration_s[i][j] == element["duration"]["value"]
+
+
+@pytest.mark.parametrize("n_origins, n_destinations, n_requests", [
+    (25, 25, 7),      # 100-element cap: 4 origins x 25 destinations per request
+    (3, 80, 4),       # wide: destination chunks of 25
+    (80, 1, 4),       # tall: origin chunks of 25
+    (60, 60, 45),
+])
+def test_chunks_within_request_limits(backend, n_origins, n_destinations, n_requests):
+    origins, destinations = addresses("Origin", n_origins), addresses("Dest", n_destinations)
+    result = distance.get_distances(origins, destinations)
+
+    assert_within_limits(backend.requests)
+    assert len(backend.requests) == n_requests
+    requested = {(o, d) for os_, ds in backend.requests for o in os_ for d in ds}
+    assert len(requested) == n_origins * n_destinations
+    assert_matches_scalar(result, origins, destinations)
+
+
+def test_duplicates_are_requested_once(backend):
+    origins = ["1 Main St, Montreal", "1  main st ,MONTREAL", "2 Main St, Montreal"]
+    destinations = ["McGill", "mcgill"]
+    result = distance.get_distances(origins, destinations)
+
+    assert backend.requests == [(["1 Main St, Montreal", "2 Main St, Montreal"], ["McGill"])]
+    assert result.distance_m[0] == result.distance_m[1]
+    assert result.distance_m[0][0] == result.distance_m[0][1]
+
+
+def test_cached_pairs_are_skipped(backend, tmp_path, monkeypatch):
+    monkeypatch.setattr(distance, "_cache", DistanceCache(tmp_path / "cache.sqlite3"))
+    origins, destinations = addresses("Origin", 5), addresses("Dest", 5)
+    first = distance.get_distances(origins[:3], destinations)
+    backend.requests.clear()
+
+    second = distance.get_distances(origins, destinations)
+    assert backend.requests == [(origins[3:], destinations)]
+    assert second.distance_m[:3] == first.distance_m
+    assert_matches_scalar(second, origins, destinations)
+
+
+def test_cache_lookups_are_one_bulk_query(backend, tmp_path, monkeypatch):
+    cache = DistanceCache(tmp_path / "cache.sqlite3")
+    monkeypatch.setattr(distance, "_cache", cache)
+    origins, destinations = addresses("Origin", 4), addresses("Dest", 3)
+    distance.get_distances(origins, destinations)
+    monkeypatch.setattr(cache, "get", None)    # the bulk path must not fall back to get()
+    backend.requests.clear()
+
+    distance.get_distances(origins, destinations)
+    assert backend.requests == []
+    assert cache.hits == 12
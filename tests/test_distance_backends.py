@@ -0,0 +1,78 @@
+import pytest
+
+from distance_backends import (ConcurrentDistanceClient, DistanceBackend, FakeDistanceBackend,
+                               FallbackDistanceBackend, GoogleMapsBackend, TokenBucket,
+                               TransientDistanceError)
+
+
+class FlakyBackend(FakeDistanceBackend):
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def matrix(self, origins, destinations, mode="driving"):
+        if self.failures:
+            self.failures -= 1
+            raise TransientDistanceError("try again")
+        return super().matrix(origins, destinations, mode)
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        DistanceBackend()
+
+
+def test_fake_backend_is_deterministic_and_symmetric():
+    fake = FakeDistanceBackend()
+    ab = fake.matrix(["A"], ["B"])[0][0]
+    assert ab == fake.matrix(["b"], ["a"])[0][0]
+    assert 1000 <= ab["distance"]["value"] <= 40000
+    assert fake.matrix(["A"], [" a "])[0][0]["distance"]["value"] == 0
+
+
+def test_token_bucket_rejects_more_than_capacity():
+    bucket = TokenBucket(rate=10, capacity=2)
+    bucket.acquire(2)
+    with pytest.raises(ValueError):
+        bucket.acquire(3)
+
+
+def test_concurrent_client_retries_transient_errors():
+    client = ConcurrentDistanceClient(FlakyBackend(failures=2), requests_per_second=1000,
+                                      base_delay=0.0, seed=0)
+    assert client.matrix(["A"], ["B"])[0][0]["status"] == "OK"
+    assert client.retries == 2
+
+    client = ConcurrentDistanceClient(FlakyBackend(failures=3), requests_per_second=1000,
+                                      max_retries=2, base_delay=0.0, seed=0)
+    with pytest.raises(TransientDistanceError):
+        client.matrix(["A"], ["B"])
+
+
+def test_concurrent_blocks_keep_order():
+    client = ConcurrentDistanceClient(FakeDistanceBackend(), requests_per_second=1000)
+    blocks = [([f"o{i}"], ["d"], "driving") for i in range(20)]
+    try:
+        assert client.matrix_blocks(blocks) == FakeDistanceBackend().matrix_blocks(blocks)
+    finally:
+        client.close()
+
+
+def test_fallback_on_error_and_missing_elements():
+    class NotFound(FakeDistanceBackend):
+        def matrix(self, origins, destinations, mode="driving"):
+            return [[{"status": "NOT_FOUND"} for _ in destinations] for _ in origins]
+
+    fallback = FallbackDistanceBackend(FlakyBackend(failures=1), FakeDistanceBackend())
+    assert fallback.matrix(["A"], ["B"])[0][0]["status"] == "OK"
+    assert fallback.fallbacks == 1
+
+    filled = FallbackDistanceBackend(NotFound(), FakeDistanceBackend(), fill_missing=True)
+    assert filled.matrix(["A"], ["B"]) == FakeDistanceBackend().matrix(["A"], ["B"])
+
+
+def test_google_client_owns_over_query_limit_retries():
+    pytest.importorskip("googlemaps")
+    client = GoogleMapsBackend(api_key="AIza-test-key", retry_timeout=5).client
+    assert client.retry_over_query_limit is True
+    assert client.retry_timeout.total_seconds() == 5
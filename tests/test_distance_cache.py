@@ -0,0 +1,106 @@
+import distance_cache
+from distance_cache import DistanceCache
+
+ELEMENT = {"status": "OK", "distance": {"text": "1.0 km", "value": 1000},
+           "duration": {"text": "2 mins", "value": 120}}
+
+
+class Clock:
+    def __init__(self, t=1_000_000.0):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+def make_cache(tmp_path, monkeypatch, **kwargs):
+    clock = Clock()
+    monkeypatch.setattr(distance_cache.time, "time", clock)
+    return DistanceCache(tmp_path / "cache.sqlite3", **kwargs), clock
+
+
+def test_hit_uses_normalized_key(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path, monkeypatch)
+    cache.put("845 Sherbrooke St W ,Montreal", "McGill", "driving", ELEMENT)
+    assert cache.get("845  sherbrooke st w, MONTREAL", "mcgill", "DRIVING") == ELEMENT
+    assert cache.get("845 Sherbrooke St W, Montreal", "McGill", "transit") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_ttl_expires_entries(tmp_path, monkeypatch):
+    cache, clock = make_cache(tmp_path, monkeypatch, ttl_seconds=60)
+    cache.put("a", "b", "driving", ELEMENT)
+    clock.t += 59
+    assert cache.get("a", "b") == ELEMENT
+    clock.t += 2
+    assert cache.get("a", "b") is None
+    assert len(cache) == 0
+
+
+def test_ttl_zero_never_expires(tmp_path, monkeypatch):
+    cache, clock = make_cache(tmp_path, monkeypatch, ttl_seconds=0)
+    cache.put("a", "b", "driving", ELEMENT)
+    clock.t += 10 ** 9
+    assert cache.get("a", "b") == ELEMENT
+
+
+def test_lru_eviction_drops_least_recently_used(tmp_path, monkeypatch):
+    cache, clock = make_cache(tmp_path, monkeypatch, max_entries=2)
+    cache.put("a", "x", "driving", ELEMENT)
+    clock.t += 1
+    cache.put("b", "x", "driving", ELEMENT)
+    clock.t += 1
+    assert cache.get("a", "x") is not None    # "a" is now more recent than "b"
+    clock.t += 1
+    cache.put("c", "x", "driving", ELEMENT)
+
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.get("b", "x") is None
+    assert cache.get("a", "x") is not None
+    assert cache.get("c", "x") is not None
+
+
+def test_persists_across_instances(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path, monkeypatch)
+    cache.put("a", "b", "driving", ELEMENT)
+    cache.close()
+    reopened = DistanceCache(tmp_path / "cache.sqlite3")
+    assert len(reopened) == 1
+    assert reopened.get("a", "b") == ELEMENT
+
+
+def test_get_many_matches_get(tmp_path, monkeypatch):
+    cache, clock = make_cache(tmp_path, monkeypatch, ttl_seconds=60)
+    cache.put("a", "x", "driving", ELEMENT)
+    clock.t += 30
+    cache.put("b", "x", "driving", ELEMENT)
+    cache.put("a", "x", "transit", ELEMENT)
+    clock.t += 31                              # ("a", "x", driving) has expired
+
+    pairs = [("a", "x"), ("b", "x"), ("B ", "X"), ("c", "x")]
+    assert cache.get_many(pairs) == {("b", "x"): ELEMENT, ("B ", "X"): ELEMENT}
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert len(cache) == 2
+    assert cache.get_many([("a", "x")], "transit") == {("a", "x"): ELEMENT}
+
+
+def test_get_many_refreshes_last_access(tmp_path, monkeypatch):
+    cache, clock = make_cache(tmp_path, monkeypatch, max_entries=2)
+    cache.put("a", "x", "driving", ELEMENT)
+    clock.t += 1
+    cache.put("b", "x", "driving", ELEMENT)
+    clock.t += 1
+    cache.get_many([("a", "x")])
+    clock.t += 1
+    cache.put("c", "x", "driving", ELEMENT)
+    assert cache.get("b", "x") is None
+    assert cache.get("a", "x") is not None
+
+
+def test_get_many_batches_large_lookups(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path, monkeypatch)
+    for i in range(0, 1200, 2):
+        cache.put(str(i), "x", "driving", ELEMENT)
+    hits = cache.get_many([(str(i), "x") for i in range(1200)])
+    assert sorted(int(o) for o, _ in hits) == list(range(0, 1200, 2))
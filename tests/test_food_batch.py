@@ -0,0 +1,54 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from Food.batch_estimator import EAT_OUT_CODES, STORE_CODES, compile_cpi, expected_monthly_food_cost_batch
+from Food.food_estimator import _stub_cpi_index_by_year, expected_monthly_food_cost_for_year
+from Food.model import build_food_cpi_model
+
+CPI_CSV = Path(__file__).resolve().parent.parent / "Food" / "1810000401-eng.csv"
+
+YEARS = np.arange(2018, 2041)
+HABITS = list(EAT_OUT_CODES) + ["sometimes"]         # unknown -> factor 1.0
+STORES = list(STORE_CODES) + ["Corner store"]
+BUDGETS = [-5.0, 0.0, 37.35, 120.0, 150.55, 180.0, 222.22, 999.99]
+
+
+@pytest.fixture(scope="module", params=["csv", "stub", "none"])
+def cpi(request):
+    if request.param == "csv":
+        return build_food_cpi_model(str(CPI_CSV), end_year=2035, use_cache=False)
+    if request.param == "stub":
+        return _stub_cpi_index_by_year(2025, 2032, 0.031)
+    return None
+
+
+def test_batch_equals_scalar(cpi):
+    batch = expected_monthly_food_cost_batch(
+        years=YEARS[:, None, None, None],
+        eating_out=np.array(HABITS, dtype=object)[None, :, None, None],
+        store_type=np.array(STORES, dtype=object)[None, None, :, None],
+        weekly_grocery_budget=np.array(BUDGETS)[None, None, None, :],
+        cpi_index_by_year=cpi,
+    )
+    assert batch.shape == (len(YEARS), len(HABITS), len(STORES), len(BUDGETS))
+    for i, year in enumerate(YEARS):
+        for j, habit in enumerate(HABITS):
+            for k, store in enumerate(STORES):
+                for m, budget in enumerate(BUDGETS):
+                    expected = expected_monthly_food_cost_for_year(
+                        year=int(year), eating_out=habit, store_type=store,
+                        weekly_grocery_budget=budget, cpi_index_by_year=cpi)
+                    assert batch[i, j, k, m] == expected, (year, habit, store, budget)
+
+
+def test_compiled_cpi_and_integer_codes(cpi):
+    kwargs = dict(years=YEARS, eating_out=1, store_type=2, weekly_grocery_budget=150.0)
+    direct = expected_monthly_food_cost_batch(cpi_index_by_year=cpi, **kwargs)
+    compiled = expected_monthly_food_cost_batch(compiled_cpi=compile_cpi(cpi), **kwargs)
+    named = expected_monthly_food_cost_batch(
+        cpi_index_by_year=cpi, years=YEARS, eating_out=EAT_OUT_CODES[1], store_type=STORE_CODES[2],
+        weekly_grocery_budget=150.0)
+    np.testing.assert_array_equal(direct, compiled)
+    np.testing.assert_array_equal(direct, named)
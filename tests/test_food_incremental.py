@@ -0,0 +1,54 @@
+import csv
+from pathlib import Path
+
+import pytest
+
+from Food.incremental import IncrementalCPIModel
+from Food.model import _open_sniff, _parse_month, build_food_cpi_model
+
+CPI_CSV = Path(__file__).resolve().parent.parent / "Food" / "1810000401-eng.csv"
+
+
+def write_wide(path, headers, values):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([headers, values])
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def wide():
+    return _open_sniff(str(CPI_CSV))
+
+
+@pytest.mark.parametrize("end_year", [2030, 2035])
+def test_from_csv_equals_full_build(end_year):
+    model = IncrementalCPIModel.from_csv(str(CPI_CSV))
+    full = build_food_cpi_model(str(CPI_CSV), end_year=end_year, use_cache=False)
+    assert model.to_dict(end_year=end_year) == full
+    assert all(model.index_for_year(y, end_year=end_year) == v for y, v in full.items())
+    assert model.index_for_year(end_year + 1, end_year=end_year) is None
+
+
+def test_appending_months_equals_rebuilding(tmp_path, wide):
+    headers, values = wide
+    cut = len(headers) - 14
+    model = IncrementalCPIModel.from_csv(write_wide(tmp_path / "old.csv", headers[:cut], values[:cut]))
+
+    new_points = []
+    for h, v in zip(headers[cut:], values[cut:]):
+        year, _month = _parse_month(h)
+        new_points.append((year, h.split()[0], float(v)))    # month names, as a feed would send
+    assert model.append(new_points) == len(new_points)
+    assert model.append(new_points[-3:]) == 0                # re-sent months are skipped
+    assert model.skipped == 3
+
+    full = build_food_cpi_model(str(CPI_CSV), end_year=2035, use_cache=False)
+    assert model.to_dict(end_year=2035) == full
+
+
+def test_save_and_load_round_trip(tmp_path):
+    model = IncrementalCPIModel.from_csv(str(CPI_CSV), window=4, fallback_cagr=0.02)
+    model.save(tmp_path / "state.json")
+    loaded = IncrementalCPIModel.load(tmp_path / "state.json")
+    assert loaded.to_dict(end_year=2035) == model.to_dict(end_year=2035)
+    assert loaded.last_month == model.last_month
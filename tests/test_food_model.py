@@ -0,0 +1,126 @@
+import os
+
+import pytest
+
+import Food.model as food_model
+from Food.model import _yearly_averages, build_food_cpi_model, clear_food_cpi_cache, food_cpi_cache_info
+
+
+def test_yearly_averages_skips_non_month_and_non_numeric_cells():
+    headers = ["Month and Year", "November 2024", "December 2024", "Notes", "January 2025", "February 2025"]
+    values = ["CPI", "100", "102", "x", "n/a", "110"]
+    assert _yearly_averages(headers, values) == {2024: 101.0, 2025: 110.0}
+
+
+@pytest.mark.parametrize("headers, values", [
+    (["Month and Year", "Notes", "Source"], ["CPI", "1", "2"]),            # no month-year column
+    (["Month and Year", "January 2025", "February 2025"], ["CPI", "", "x"]),  # no numeric value
+    (["Month and Year", "January 2025"], ["CPI"]),
+])
+def test_yearly_averages_rejects_rows_without_data(headers, values):
+    with pytest.raises(ValueError):
+        _yearly_averages(headers, values)
+
+
+def test_build_normalizes_and_forecasts(tmp_path):
+    path = tmp_path / "cpi.csv"
+    months = ["January", "July"]
+    headers = ["Month and Year"] + [f"{m} {y}" for y in range(2021, 2026) for m in months]
+    values = ["CPI"] + [str(100 * 1.05 ** (y - 2025)) for y in range(2021, 2026) for _ in months]
+    path.write_text(",".join(headers) + "\n" + ",".join(values) + "\n", encoding="utf-8")
+
+    model = build_food_cpi_model(str(path), end_year=2027, use_cache=False)
+    assert sorted(model) == list(range(2021, 2028))
+    assert model[2025] == 100.0
+    assert model[2026] == pytest.approx(105.0, abs=0.01)
+    assert model[2021] == pytest.approx(100 / 1.05 ** 4, abs=0.01)
+
+
+# ---------- build cache ----------
+
+def write_cpi(path, growth=1.05):
+    months = ["January", "July"]
+    headers = ["Month and Year"] + [f"{m} {y}" for y in range(2021, 2026) for m in months]
+    values = ["CPI"] + [f"{100 * growth ** (y - 2025):.4f}" for y in range(2021, 2026) for _ in months]
+    path.write_text(",".join(headers) + "\n" + ",".join(values) + "\n", encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(food_model, "CACHE_DIR", tmp_path / "food_cpi")
+    monkeypatch.setattr(food_model, "_memo", {})
+    monkeypatch.setattr(food_model, "_stats", {"memo_hits": 0, "disk_hits": 0, "builds": 0})
+    return tmp_path / "food_cpi"
+
+
+def counters():
+    info = food_cpi_cache_info()
+    return info["memo_hits"], info["disk_hits"], info["builds"]
+
+
+def no_build(monkeypatch):
+    def boom(*args):
+        raise AssertionError("CSV was parsed")
+    monkeypatch.setattr(food_model, "_build_food_cpi_model", boom)
+
+
+def test_cache_memo_hit(cache, tmp_path, monkeypatch):
+    path = write_cpi(tmp_path / "cpi.csv")
+    first = build_food_cpi_model(path, end_year=2027)
+    assert first == build_food_cpi_model(path, end_year=2027, use_cache=False)
+
+    no_build(monkeypatch)
+    first[2025] = -1.0                       # callers get copies
+    assert build_food_cpi_model(path, end_year=2027)[2025] == 100.0
+    assert counters() == (1, 0, 1)
+
+
+def test_cache_disk_hit_in_fresh_memo(cache, tmp_path, monkeypatch):
+    path = write_cpi(tmp_path / "cpi.csv")
+    first = build_food_cpi_model(path, end_year=2027)
+    food_model._memo.clear()
+
+    no_build(monkeypatch)
+    assert build_food_cpi_model(path, end_year=2027) == first
+    assert counters() == (0, 1, 1)
+    assert build_food_cpi_model(path, end_year=2027) == first       # memoized again
+    assert counters() == (1, 1, 1)
+
+
+def test_cache_rebuilds_when_csv_changes(cache, tmp_path):
+    path = write_cpi(tmp_path / "cpi.csv")
+    before = build_food_cpi_model(path, end_year=2027)
+    st = os.stat(path)
+    write_cpi(tmp_path / "cpi.csv", growth=1.10)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+    after = build_food_cpi_model(path, end_year=2027)
+    assert after != before
+    assert after[2026] == pytest.approx(110.0, abs=0.01)
+    assert counters() == (0, 0, 2)
+    assert len(list(cache.glob("*.json"))) == 2
+
+
+def test_cache_info_and_clear(cache, tmp_path):
+    path = write_cpi(tmp_path / "cpi.csv")
+    build_food_cpi_model(path, end_year=2027)
+    build_food_cpi_model(path, end_year=2030)         # other params: another artifact
+    build_food_cpi_model(path, end_year=2030)
+
+    info = food_cpi_cache_info()
+    assert info["cache_dir"] == str(cache)
+    assert (info["memo_hits"], info["disk_hits"], info["builds"]) == (1, 0, 2)
+    assert (info["memo_entries"], info["disk_entries"]) == (2, 2)
+    assert info["disk_bytes"] == sum(p.stat().st_size for p in cache.glob("*.json")) > 0
+
+    clear_food_cpi_cache(disk=False)
+    info = food_cpi_cache_info()
+    assert counters() == (0, 0, 0)
+    assert (info["memo_entries"], info["disk_entries"]) == (0, 2)
+
+    clear_food_cpi_cache()
+    info = food_cpi_cache_info()
+    assert (info["disk_entries"], info["disk_bytes"]) == (0, 0)
+    build_food_cpi_model(path, end_year=2027)
+    assert counters() == (0, 0, 1)
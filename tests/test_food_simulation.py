@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from Food import simulation
+from Food.food_estimator import expected_monthly_food_cost_for_year
+from Food.incremental import IncrementalCPIModel
+from Food.model import build_food_cpi_model
+from Food.simulation import food_cost_percentiles, simulate_cpi_paths
+
+CPI_CSV = str(Path(__file__).resolve().parent.parent / "Food" / "1810000401-eng.csv")
+PROFILE = dict(eating_out="3-5x", store_type="Walmart", weekly_grocery_budget=180.0)
+
+
+@pytest.fixture(scope="module")
+def model():
+    return IncrementalCPIModel.from_csv(CPI_CSV)
+
+
+def test_same_seed_same_paths_with_a_process_pool(model, monkeypatch):
+    monkeypatch.setattr(simulation, "PATHS_PER_CHUNK", 500)     # 3 chunks
+    years, serial = simulate_cpi_paths(model, n_paths=1200, seed=7, workers=1)
+    pool_years, pooled = simulate_cpi_paths(model, n_paths=1200, seed=7, workers=2)
+    assert np.array_equal(years, pool_years)
+    assert serial.shape == (1200, len(years))
+    assert np.array_equal(serial, pooled)
+    assert not np.array_equal(serial, simulate_cpi_paths(model, n_paths=1200, seed=8)[1])
+
+
+def test_historical_years_are_the_observed_index(model):
+    years, paths = simulate_cpi_paths(model, n_paths=300, seed=1)
+    point = build_food_cpi_model(CPI_CSV, use_cache=False)
+    last_year = model.last_month // 12
+    hist = years <= last_year
+    assert (paths[:, hist] == paths[0, hist]).all()
+    assert paths[0, hist].tolist() == [point[y] for y in years[hist]]
+    assert (paths[:, ~hist].std(axis=0) > 0).all()
+
+
+def test_percentile_bands_are_ordered(model):
+    bands = food_cost_percentiles(model, years=range(2025, 2031), n_paths=2000, seed=3, **PROFILE)
+    assert sorted(bands) == list(range(2025, 2031))
+    for band in bands.values():
+        assert band["p10"] <= band["p50"] <= band["p90"]
+
+
+def test_recent_history_brackets_the_point_forecast(model):
+    point = expected_monthly_food_cost_for_year(
+        year=2030, cpi_index_by_year=build_food_cpi_model(CPI_CSV, use_cache=False), **PROFILE)
+    band = food_cost_percentiles(model, years=[2030], seed=42, history_years=5, **PROFILE)[2030]
+    assert band["p10"] < point < band["p90"]
@@ -0,0 +1,80 @@
+import json
+import os
+
+import geopandas as gpd
+import pytest
+import shapely
+
+import geometry_cache
+from geometry_cache import load_geometry
+
+MAPPING = {"Le Plateau-Mont-Royal": "Plateau-Mont-Royal"}
+
+
+@pytest.fixture(autouse=True)
+def cache_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(geometry_cache, "CACHE_ROOT", tmp_path / "geometry")
+    monkeypatch.setattr(geometry_cache, "_memo", {})
+    monkeypatch.setattr(geometry_cache, "_stamps", None)
+    return tmp_path / "geometry"
+
+
+def write_source(path, shift=0.0):
+    # two wiggly neighbours in EPSG:32188 (metres), like the agglomeration file
+    x0, y0 = 298_000.0 + shift, 5_040_000.0
+    left = [(x0, y0), (x0 + 1000, y0), (x0 + 1000, y0 + 500), (x0 + 1003, y0 + 501), (x0 + 1000, y0 + 1000), (x0, y0 + 1000)]
+    right = [(x0 + 1000, y0), (x0 + 2000, y0), (x0 + 2000, y0 + 1000), (x0 + 1000, y0 + 1000), (x0 + 1003, y0 + 501), (x0 + 1000, y0 + 500)]
+    gdf = gpd.GeoDataFrame({"NOM": ["Le Plateau-Mont-Royal", "Outremont"]},
+                           geometry=[shapely.Polygon(left), shapely.Polygon(right)], crs="EPSG:32188")
+    gdf.to_file(path, driver="GeoJSON")
+    return path
+
+
+def no_hash(monkeypatch):
+    def boom(path):
+        raise AssertionError("source was hashed")
+    monkeypatch.setattr(geometry_cache, "file_sha256", boom)
+
+
+def test_round_trip_matches_reprojection(tmp_path):
+    src = write_source(tmp_path / "areas.geojson")
+    gdf = load_geometry(src, name_mapping=MAPPING)
+    expected = gpd.read_file(src).to_crs(4326)
+
+    assert gdf.crs.to_epsg() == 4326
+    assert list(gdf["NOM"]) == list(expected["NOM"])
+    assert list(gdf["csv_name"]) == ["Plateau-Mont-Royal", "Outremont"]
+    assert all(shapely.equals_exact(gdf.geometry.values, expected.geometry.values, tolerance=0))
+
+    simplified = load_geometry(src, 50.0, name_mapping=MAPPING)
+    assert shapely.get_num_coordinates(simplified.geometry.values).sum() < \
+        shapely.get_num_coordinates(gdf.geometry.values).sum()
+    with pytest.raises(ValueError, match="No cached level"):
+        load_geometry(src, 7.0, name_mapping=MAPPING)
+
+
+def test_warm_loads_do_not_rehash(tmp_path, monkeypatch, cache_root):
+    src = write_source(tmp_path / "areas.geojson")
+    first = load_geometry(src)
+    no_hash(monkeypatch)
+    assert load_geometry(src).equals(first)                # memo hit
+
+    geometry_cache._memo.clear()
+    geometry_cache._stamps = None                          # as in a new process
+    assert load_geometry(src).equals(first)
+    with (cache_root / "sources.json").open(encoding="utf-8") as f:
+        assert str(src.resolve()) in json.load(f)
+
+
+def test_rebuilds_when_content_changes(tmp_path):
+    src = write_source(tmp_path / "areas.geojson")
+    before = load_geometry(src)
+    st = src.stat()
+    write_source(src, shift=500.0)
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+    after = load_geometry(src)
+    assert not after.geometry.geom_equals(before.geometry).any()
+    expected = gpd.read_file(src).to_crs(4326)
+    assert all(shapely.equals_exact(after.geometry.values, expected.geometry.values, tolerance=0))
+    assert len(list(geometry_cache.CACHE_ROOT.glob("*/meta.json"))) == 2
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import housing_model
+from housing_model import (CSV_PATH, forecast_housing_cpi, housing_cpi_coefficients,
+                           project_price_matrix, train_evaluate_and_predict)
+
+
+def test_forecast_matches_sklearn(monkeypatch):
+    pytest.importorskip("sklearn")
+    pytest.importorskip("pandas")
+    monkeypatch.chdir(Path(CSV_PATH).parent)          # the sklearn path reads a relative path
+    expected = train_evaluate_and_predict()
+    forecast = forecast_housing_cpi(5)
+    assert list(forecast) == expected["year"].tolist()
+    assert list(forecast.values()) == expected["predicted_cpi"].tolist()
+
+
+def test_coefficients_are_cached_on_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(housing_model, "_memo", {})
+    first = housing_cpi_coefficients(CSV_PATH, cache_path=tmp_path / "cpi.json")
+    assert (tmp_path / "cpi.json").exists()
+
+    def no_parse(*args):
+        raise AssertionError("CSV parsed again despite the cache")
+
+    monkeypatch.setattr(housing_model, "_memo", {})
+    monkeypatch.setattr(housing_model, "_annual_means", no_parse)
+    assert housing_cpi_coefficients(CSV_PATH, cache_path=tmp_path / "cpi.json") == first
+
+
+def test_project_price_matrix():
+    forecast = {2025: 150.0, 2026: 153.0, 2027: 156.1}
+    years, prices = project_price_matrix([1000, 0, 1234.5], horizon=2, cpi_forecast=forecast)
+    assert years.tolist() == [2025, 2026, 2027]
+    assert prices.tolist() == [
+        [1000, 1020, 1041],
+        [0, 0, 0],
+        [1234, 1259, 1285],      # column 0 rounds half to even, like DataFrame.round
+    ]
+    assert prices[2, 1] == np.rint(1234.5 * 153.0 / 150.0)
+    with pytest.raises(ValueError):
+        project_price_matrix([1000], horizon=3, cpi_forecast=forecast)
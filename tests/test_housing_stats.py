@@ -0,0 +1,90 @@
+import random
+
+import numpy as np
+import pytest
+
+from housing_stats import QuantileSketch, ingest_file, ingest_parallel, merge_stats, summarize
+
+QS = [0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0]
+
+FEED = (
+    "\ufeffAnjou,1000,900,1100,1000\n"          # BOM on the first line
+    "Address,Price\n"
+    "Verdun,1500\n"                               # average only: one observation
+    "Outremont,2000.5,1800,2300,2100,1950\n"
+    "Anjou,1050,1050\n"
+    "Côte-Saint-Luc,1700,1650,x,1750\n"
+)
+
+
+def test_sketch_is_exact_below_k():
+    rng = random.Random(0)
+    xs = [rng.uniform(500, 3000) for _ in range(199)]
+    sketch = QuantileSketch(k=200, seed=1)
+    sketch.update(xs)
+    assert sketch.quantiles(QS) == pytest.approx(np.quantile(xs, QS).tolist(), rel=1e-12)
+    assert QuantileSketch().quantiles([0.5]) == [None]
+
+
+def test_sketch_rank_error_is_bounded_on_a_large_feed():
+    rng = np.random.default_rng(0)
+    xs = rng.lognormal(7.2, 0.4, size=200_000)
+    sketch = QuantileSketch(k=200, seed=2)
+    sketch.update(xs.tolist())
+    assert sketch.n == len(xs)
+    assert sum(len(level) for level in sketch.levels) < 1000
+    ordered = np.sort(xs)
+    for q in (0.1, 0.25, 0.5, 0.75, 0.9):
+        rank = np.searchsorted(ordered, sketch.quantile(q)) / len(xs)
+        assert abs(rank - q) < 0.02
+
+
+def test_merged_sketches_match_one_pass_on_small_data():
+    rng = random.Random(3)
+    parts = [[rng.uniform(500, 3000) for _ in range(n)] for n in (40, 70, 25)]
+    merged = QuantileSketch(k=200)
+    for part in parts:
+        s = QuantileSketch(k=200)
+        s.update(part)
+        merged.merge(s)
+    whole = [x for part in parts for x in part]
+    assert merged.n == len(whole)
+    assert merged.quantiles(QS) == pytest.approx(np.quantile(whole, QS).tolist(), rel=1e-12)
+
+
+@pytest.fixture
+def feed(tmp_path):
+    path = tmp_path / "listings.csv"
+    path.write_bytes(FEED.encode("utf-8"))
+    return path
+
+
+def assert_same_stats(a, b):
+    sa, sb = summarize(a), summarize(b)
+    assert sa.keys() == sb.keys()
+    for name in sa:
+        assert sa[name] == pytest.approx(sb[name]), name
+
+
+def test_ingest_file_reads_bom_and_average_only_rows(feed):
+    stats = summarize(ingest_file(feed))
+    assert list(stats) == ["Anjou", "Côte-Saint-Luc", "Outremont", "Verdun"]
+    assert stats["Anjou"]["count"] == 4                  # both Anjou rows, BOM stripped
+    assert stats["Anjou"]["median"] == 1025.0
+    assert stats["Verdun"] == {"count": 1, "mean": 1500.0, "median": 1500.0, "p25": 1500.0,
+                               "p75": 1500.0, "min": 1500.0, "max": 1500.0}
+    assert stats["Côte-Saint-Luc"]["count"] == 2
+
+
+def test_every_shard_boundary_counts_each_line_once(feed):
+    whole = ingest_file(feed)
+    size = feed.stat().st_size
+    for cut in range(1, size):                           # includes mid-line and mid-character cuts
+        assert_same_stats(merge_stats([ingest_file(feed, 0, cut), ingest_file(feed, cut, size)]), whole)
+
+
+def test_ingest_parallel_matches_single_pass(feed):
+    whole = ingest_file(feed)
+    assert_same_stats(ingest_parallel(feed, workers=1, shard_bytes=7), whole)
+    assert_same_stats(ingest_parallel([feed, feed], workers=2, shard_bytes=20),
+                      merge_stats([ingest_file(feed), ingest_file(feed)]))
@@ -0,0 +1,80 @@
+import time
+
+import pytest
+
+import distance
+import distance_backends
+import transportation_price
+from distance_backends import ConcurrentDistanceClient, FakeDistanceBackend, FallbackDistanceBackend
+from offline_distance import CentroidGeocoder, OfflineDistanceBackend, haversine_km
+
+PLATEAU = "4500 Rue Saint-Denis, Le Plateau-Mont-Royal, Montréal, QC H2J 2L3"
+ANJOU = "7500 Boulevard Galeries d'Anjou, Anjou, QC H1M 3M2"
+DOWNTOWN = "845 Sherbrooke St W, Montreal, Quebec H3A 0G4"
+ROPERY = "1287 Rue Ropery, Montréal, QC H3K 2X1"
+LAVAL = "525 Avenue 74, Laval, QC H7V 2X9"
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    backend = OfflineDistanceBackend()
+    monkeypatch.setattr(distance, "_backend", backend)
+    monkeypatch.setattr(distance, "_cache", None)
+    monkeypatch.setenv("DISTANCE_CACHE_TTL", "0")
+    return backend
+
+
+def test_haversine_known_distance():
+    # Montréal -> Toronto city halls, about 504 km
+    assert haversine_km(45.5088, -73.5540, 43.6534, -79.3841) == pytest.approx(504, abs=5)
+
+
+def test_geocoder_prefers_the_borough():
+    geocoder = CentroidGeocoder()
+    assert geocoder.locate(PLATEAU) == geocoder.locate("Plateau-Mont-Royal")
+    assert not geocoder.is_coarse(geocoder.locate(PLATEAU))
+    assert geocoder.is_coarse(geocoder.locate(DOWNTOWN))
+    assert geocoder.geocode(LAVAL) is None
+
+
+def test_same_coarse_centroid_is_not_found(offline):
+    rows = offline.matrix([DOWNTOWN, PLATEAU], [ROPERY, ANJOU])
+    assert rows[0][0] == {"status": "NOT_FOUND"}    # both only known as "Montréal"
+    assert rows[0][1]["status"] == "OK"
+    assert rows[1][0]["status"] == "OK"             # borough vs city centroid
+    assert rows[1][1]["distance"]["value"] > 0
+
+
+def test_unknown_place_does_not_crash_callers(offline):
+    assert offline.matrix([DOWNTOWN], [LAVAL]) == [[{"status": "NOT_FOUND"}]]
+    assert distance.get_distance(DOWNTOWN, LAVAL) == (None, None)
+    assert distance.get_distance(DOWNTOWN, ROPERY) == (None, None)
+    assert transportation_price.get_monthly_gas_price(DOWNTOWN, LAVAL, 15.0, 1.6) is None
+    assert transportation_price.get_monthly_gas_price(PLATEAU, ANJOU, 15.0, 1.6) > 0
+
+
+def test_fallback_fills_what_offline_cannot_place():
+    chain = FallbackDistanceBackend(OfflineDistanceBackend(), FakeDistanceBackend(), fill_missing=True)
+    rows = chain.matrix([DOWNTOWN], [LAVAL, ROPERY, ANJOU])
+    assert all(e["status"] == "OK" for e in rows[0])
+    assert rows[0][2] == OfflineDistanceBackend().matrix([DOWNTOWN], [ANJOU])[0][0]
+
+
+def test_only_google_is_rate_limited(monkeypatch):
+    monkeypatch.setenv("DISTANCE_BACKEND", "offline")
+    assert isinstance(distance_backends.backend_from_env(), OfflineDistanceBackend)
+
+    monkeypatch.setenv("DISTANCE_BACKEND", "google,offline")
+    chain = distance_backends.backend_from_env()
+    assert isinstance(chain, FallbackDistanceBackend)
+    assert isinstance(chain.primary, ConcurrentDistanceClient)
+    assert isinstance(chain.fallback, OfflineDistanceBackend)
+
+
+def test_offline_lookups_are_not_throttled(offline, monkeypatch):
+    monkeypatch.setenv("DISTANCE_BACKEND", "offline")
+    monkeypatch.setattr(distance, "_backend", distance_backends.backend_from_env())
+    t0 = time.perf_counter()
+    for i in range(200):
+        distance.get_distance(f"{i} Rue Sherbrooke, Anjou, QC", PLATEAU)
+    assert time.perf_counter() - t0 < 1.0
@@ -0,0 +1,106 @@
+import io
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from pipeline import Pipeline, Stage, default_stages, local_sources
+
+REPO = Path(__file__).resolve().parent.parent
+
+
+def copy_upper(inputs, outputs, *, suffix=""):
+    outputs[0].write_text(inputs[0].read_text(encoding="utf-8").upper() + suffix, encoding="utf-8")
+
+
+def count_chars(inputs, outputs):
+    outputs[0].write_text(json.dumps(len(inputs[0].read_text(encoding="utf-8"))), encoding="utf-8")
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / "src.txt").write_text("hello", encoding="utf-8")
+    (tmp_path / "helper.py").write_text("X = 1\n", encoding="utf-8")
+    (tmp_path / "stage_code.py").write_text("def run():\n    import helper\n", encoding="utf-8")
+    return tmp_path
+
+
+def make_pipeline(root, suffix=""):
+    stages = [
+        Stage("upper", copy_upper, inputs=[root / "src.txt"], outputs=[root / "out" / "upper.txt"],
+              params={"suffix": suffix}, modules=["stage_code"]),
+        Stage("count", count_chars, deps=["upper"], inputs=[root / "out" / "upper.txt"],
+              outputs=[root / "out" / "count.json"]),
+    ]
+    return Pipeline(stages, state_path=root / "state.json", source_root=root)
+
+
+def run(root, **kwargs):
+    return make_pipeline(root, kwargs.pop("suffix", "")).run(workers=1, log=io.StringIO(), **kwargs)
+
+
+def test_first_run_builds_everything_then_nothing(tree):
+    assert run(tree) == ["upper", "count"]
+    assert (tree / "out" / "count.json").read_text() == "5"
+    assert run(tree) == []
+
+
+def test_input_change_reruns_stage_and_downstream(tree):
+    run(tree)
+    (tree / "src.txt").write_text("hello world", encoding="utf-8")
+    assert make_pipeline(tree).plan()[1] == ["upper", "count"]
+    assert run(tree) == ["upper", "count"]
+    assert (tree / "out" / "count.json").read_text() == "11"
+
+
+def test_touch_without_content_change_is_up_to_date(tree):
+    run(tree)
+    st = (tree / "src.txt").stat()
+    os.utime(tree / "src.txt", ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    assert run(tree) == []
+
+
+def test_param_change_reruns(tree):
+    run(tree)
+    assert make_pipeline(tree, suffix="!").plan()[1] == ["upper", "count"]
+
+
+def test_missing_output_reruns_only_that_stage(tree):
+    run(tree)
+    (tree / "out" / "count.json").unlink()
+    assert make_pipeline(tree).plan()[1] == ["count"]
+
+
+def test_force_reruns_downstream(tree):
+    run(tree)
+    assert make_pipeline(tree).plan(force=["upper"])[1] == ["upper", "count"]
+    assert make_pipeline(tree).plan(force=["count"])[1] == ["count"]
+
+
+def test_imported_module_change_reruns(tree):
+    run(tree)
+    (tree / "helper.py").write_text("X = 2\n", encoding="utf-8")
+    assert make_pipeline(tree).plan()[1] == ["upper", "count"]
+
+
+def test_dry_run_writes_no_state(tree):
+    assert run(tree, dry_run=True) == ["upper", "count"]
+    assert not (tree / "state.json").exists()
+    assert not (tree / "out").exists()
+
+
+def test_unknown_dependency_and_cycle(tree):
+    with pytest.raises(ValueError):
+        Pipeline([Stage("a", copy_upper, deps=["nope"])], state_path=tree / "s.json")
+    with pytest.raises(ValueError):
+        Pipeline([Stage("a", copy_upper, deps=["b"]), Stage("b", copy_upper, deps=["a"])],
+                 state_path=tree / "s.json")
+
+
+def test_default_stages_track_imported_modules():
+    code = {s.name: {str(p.relative_to(REPO)) for p in local_sources(s.modules)} for s in default_stages()}
+    assert {"Food/model.py", "Food/food_estimator.py", "visualize_food.py"} <= code["food_plots"]
+    assert {"map.py", "housing_model.py", "geometry_cache.py", "fileutil.py"} <= code["housing_map"]
+    assert "Food/model.py" in code["food_cpi"]
+    assert "housing_model.py" in code["housing_cpi"]
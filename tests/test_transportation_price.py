@@ -0,0 +1,47 @@
+import math
+
+import pytest
+
+from transportation_price import FARE_BY_ZONE_PAIR, get_stm_price, get_zone, get_zones, tarif
+
+
+@pytest.mark.parametrize("address, zone", [
+    ("1287 Rue Ropery, Montréal, QC H3K 2X1", "A"),
+    ("845 Sherbrooke St W, MONTREAL, Quebec H3A 0G4", "A"),
+    ("525 Avenue 74, Laval, QC H7V 2X9", "B"),
+    ("98 Croissant des Trèfles, L'Île-Perrot, QC J7V 2G2", "C"),
+    ("12 Rue Principale, Somewhere, QC H7V 2X9", "B"),        # postal prefix decides
+])
+def test_get_zone(address, zone):
+    assert get_zone(address) == zone
+
+
+def test_get_zone_unknown_raises():
+    with pytest.raises(NameError):
+        get_zone("1 Main St, Toronto, ON M5V 2T6")
+
+
+def test_get_zones_matches_get_zone():
+    addresses = ["1287 Rue Ropery, Montréal, QC H3K 2X1", "525 Avenue 74, Laval, QC H7V 2X9",
+                 "1287 Rue Ropery, Montréal, QC H3K 2X1"]
+    assert get_zones(addresses) == [get_zone(a) for a in addresses]
+
+
+@pytest.mark.parametrize("missing", [None, float("nan"), 42])
+def test_get_zones_non_strings_are_unknown(missing):
+    addresses = ["1287 Rue Ropery, Montréal, QC H3K 2X1", missing]
+    assert get_zones(addresses, strict=False) == ["A", None]
+    with pytest.raises(NameError):
+        get_zones(addresses)
+
+
+def test_get_zones_pandas_column_with_nan():
+    pd = pytest.importorskip("pandas")
+    column = pd.Series(["1287 Rue Ropery, Montréal, QC H3K 2X1", math.nan, None])
+    assert get_zones(column, strict=False) == ["A", None, None]
+
+
+def test_fare_covers_outermost_zone():
+    assert FARE_BY_ZONE_PAIR[("A", "C")] == FARE_BY_ZONE_PAIR[("C", "A")] == tarif["ABC"]
+    assert get_stm_price("1287 Rue Ropery, Montréal, QC H3K 2X1",
+                         "98 Croissant des Trèfles, L'Île-Perrot, QC J7V 2G2") == tarif["ABC"]
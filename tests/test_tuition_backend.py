@@ -0,0 +1,236 @@
+import os
+import pickle
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import tuition_backend
+from tuition_backend import TuitionIndex
+
+REPO = Path(__file__).resolve().parent.parent
+
+CSV = """university,program,annual_tuition_cad
+McGill,Bachelor of Arts (BA),5000
+McGill,Bachelor of Engineering (BEng),6000
+McGill,Bachelor of Arts and Science (BASc),5500.5
+Concordia,Bachelor of Arts (BA),4000
+Concordia,Études françaises (BA),4100
+Concordia,Arts and Architecture,4200
+Université de Montréal,Baccalauréat en architecture,3000
+"""
+
+
+@pytest.fixture
+def paths(tmp_path):
+    csv_path = tmp_path / "tuition.csv"
+    csv_path.write_text(CSV, encoding="utf-8")
+    return csv_path, tmp_path / "snapshot" / "tuition_index.pickle"
+
+
+@pytest.fixture
+def index(paths):
+    return TuitionIndex(paths[0])
+
+
+def no_parse(monkeypatch):
+    def boom(self):
+        raise AssertionError("CSV was parsed")
+    monkeypatch.setattr(TuitionIndex, "_load", boom)
+
+
+def no_hash(monkeypatch):
+    def boom(path):
+        raise AssertionError("CSV was hashed")
+    monkeypatch.setattr(tuition_backend, "file_sha256", boom)
+
+
+# ---------- lazy index / snapshot (user-008) ----------
+
+def test_import_does_not_parse():
+    code = (
+        "import csv\n"
+        "def boom(*a, **k): raise AssertionError('CSV was parsed')\n"
+        "csv.DictReader = boom\n"
+        "import tuition_backend\n"
+        "assert tuition_backend._INDEX is None\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=REPO, check=True)
+
+
+def test_warm_start_loads_snapshot(paths, monkeypatch):
+    csv_path, snap_path = paths
+    cold = TuitionIndex.from_snapshot(csv_path, snap_path)
+    assert snap_path.exists()
+
+    no_parse(monkeypatch)
+    no_hash(monkeypatch)
+    warm = TuitionIndex.from_snapshot(csv_path, snap_path)
+    assert warm._by_school == cold._by_school
+    assert warm.get_tuition("McGill", "Bachelor of Arts (BA)")["annual_tuition_cad"] == 5000
+
+
+def test_touched_csv_refreshes_stamp(paths, monkeypatch):
+    csv_path, snap_path = paths
+    TuitionIndex.from_snapshot(csv_path, snap_path)
+    st = csv_path.stat()
+    os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+    no_parse(monkeypatch)
+    TuitionIndex.from_snapshot(csv_path, snap_path)              # hashes, content unchanged
+    with snap_path.open("rb") as f:
+        assert pickle.load(f)["mtime_ns"] == csv_path.stat().st_mtime_ns
+
+    no_hash(monkeypatch)
+    TuitionIndex.from_snapshot(csv_path, snap_path)              # stamp matches again
+
+
+def test_changed_csv_reparses(paths):
+    csv_path, snap_path = paths
+    TuitionIndex.from_snapshot(csv_path, snap_path)
+    csv_path.write_text(CSV.replace("5000", "5100"), encoding="utf-8")
+    index = TuitionIndex.from_snapshot(csv_path, snap_path)
+    assert index.get_tuition("McGill", "Bachelor of Arts (BA)")["annual_tuition_cad"] == 5100
+    assert TuitionIndex.from_snapshot(csv_path, snap_path)._by_school == index._by_school
+
+
+def test_reload_index_in_background_swaps_index(paths, monkeypatch):
+    csv_path, snap_path = paths
+    monkeypatch.setattr(tuition_backend, "CSV_PATH", csv_path)
+    monkeypatch.setattr(tuition_backend, "SNAPSHOT_PATH", snap_path)
+    monkeypatch.setattr(tuition_backend, "_INDEX", None)
+
+    old = tuition_backend.INDEX
+    assert tuition_backend.get_index() is old
+    assert tuition_backend.get_tuition("McGill", "Bachelor of Arts (BA)") == 5000
+
+    csv_path.write_text(CSV.replace("5000", "5100"), encoding="utf-8")
+    thread = tuition_backend.reload_index(background=True)
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+    assert tuition_backend.get_index() is not old
+    assert tuition_backend.get_tuition("McGill", "Bachelor of Arts (BA)") == 5100
+    assert old.get_tuition("McGill", "Bachelor of Arts (BA)")["annual_tuition_cad"] == 5000
+
+
+# ---------- typeahead / lookups (user-009) ----------
+
+def hits(results):
+    return [(r["school"], r["program"]) for r in results]
+
+
+def test_search_ranks_full_name_hits_before_word_hits(index):
+    assert hits(index.search_programs("ar")) == [
+        ("Concordia", "Arts and Architecture"),                       # whole name, not repeated below
+        ("Université De Montréal", "Baccalauréat en architecture"),
+        ("Mcgill", "Bachelor of Arts and Science (BASc)"),
+        ("Concordia", "Bachelor of Arts (BA)"),
+        ("Mcgill", "Bachelor of Arts (BA)"),
+    ]
+
+
+def test_search_limit(index):
+    assert hits(index.search_programs("ar", limit=2)) == hits(index.search_programs("ar"))[:2]
+    assert index.search_programs("ar", limit=0) == []
+    assert index.search_programs("  ") == []
+
+
+def test_search_per_school(index):
+    assert hits(index.search_programs("ba", school="MCGILL ")) == [
+        ("Mcgill", "Bachelor of Arts and Science (BASc)"),
+        ("Mcgill", "Bachelor of Arts (BA)"),
+        ("Mcgill", "Bachelor of Engineering (BEng)"),
+    ]
+    assert index.search_programs("ba", school="Nowhere") == []
+
+
+def test_search_folds_accents_and_case(index):
+    assert hits(index.search_programs("ETUD")) == [("Concordia", "Études françaises (BA)")]
+    assert hits(index.search_programs("franc")) == [("Concordia", "Études françaises (BA)")]
+    assert hits(index.search_programs("baccalaureat", school="Université de Montréal")) == [
+        ("Université De Montréal", "Baccalauréat en architecture")]
+
+
+def test_get_tuition_case_insensitive_fallback(index):
+    quote = index.get_tuition("MCGILL", "bachelor of arts AND science (basc)")
+    assert quote == {"school": "MCGILL", "program": "Bachelor of Arts and Science (BASc)",
+                     "annual_tuition_cad": 5500.5}
+    with pytest.raises(ValueError, match="Program not found"):
+        index.get_tuition("McGill", "Bachelor of Music")
+    with pytest.raises(ValueError, match="Unknown school"):
+        index.get_tuition("Harvard", "Bachelor of Arts (BA)")
+
+
+# ---------- batch quotes (user-010) ----------
+
+PAIRS = [("McGill", "Bachelor of Arts (BA)"), ("concordia", "études françaises (ba)"),
+         ("McGill", "Bachelor of Music"), ("Université de Montréal", "Baccalauréat en architecture")]
+LENGTHS = [4, 2, 3, 1]
+STARTS = [2024, 2026, 2019, 2030]
+CPI = {2020: 90.0, 2023: 99.0, 2025: 100.0, 2026: 103.0}   # 2021-2022 and 2024 missing
+
+
+def growth_loop(year, rate, index):
+    if not index:
+        return (1 + rate) ** (year - tuition_backend.TUITION_BASE_YEAR)
+
+    def value(y):
+        y = min(max(y, min(index)), max(index))
+        while y not in index:      # gaps carry the previous year forward
+            y -= 1
+        return index[y]
+    return value(year) / value(tuition_backend.TUITION_BASE_YEAR)
+
+
+def quote_loop(index, pairs, lengths, starts, rate=0.0, inflation_index=None):
+    out = []
+    for (school, program), n, start in zip(pairs, lengths, starts):
+        try:
+            amount = index.get_tuition(school, program)["annual_tuition_cad"]
+        except ValueError:
+            amount = float("nan")
+        out.append([(start + k, amount * growth_loop(start + k, rate, inflation_index)) for k in range(n)])
+    return out
+
+
+def assert_quote_matches(quote, expected):
+    import numpy as np
+
+    assert quote["per_year"].shape == (len(expected), max(len(e) for e in expected))
+    for i, row in enumerate(expected):
+        width = len(row)
+        assert list(quote["years"][i, :width]) == [y for y, _ in row]
+        assert np.isnan(quote["per_year"][i, width:]).all()
+        amounts = [a for _, a in row]
+        if np.isnan(amounts).any():
+            assert np.isnan(quote["per_year"][i]).all() and np.isnan(quote["total"][i])
+            continue
+        assert quote["per_year"][i, :width] == pytest.approx(amounts, abs=0.006)
+        assert quote["total"][i] == pytest.approx(sum(amounts), abs=0.006 * width)
+
+
+@pytest.mark.parametrize("rate, inflation_index", [(0.0, None), (0.035, None), (0.0, CPI)])
+def test_quote_batch_matches_loop(index, rate, inflation_index):
+    quote = index.quote_batch(PAIRS, LENGTHS, STARTS, inflation_rate=rate,
+                              inflation_index=inflation_index, strict=False)
+    assert quote["school"] == [s for s, _ in PAIRS]
+    assert quote["program"] == [p for _, p in PAIRS]
+    assert_quote_matches(quote, quote_loop(index, PAIRS, LENGTHS, STARTS, rate, inflation_index))
+
+
+def test_quote_batch_clamps_and_fills_index(index):
+    quote = index.quote_batch([PAIRS[0]], years=12, start_year=2018, inflation_index=CPI)
+    # 2018-2020 clamp to 2020, 2021-2022 carry 2020, 2024 carries 2023, 2027+ clamp to 2026
+    assert list(quote["per_year"][0]) == [4500.0] * 5 + [4950.0, 4950.0, 5000.0] + [5150.0] * 4
+
+
+def test_quote_batch_scalar_arguments_broadcast(index):
+    quote = index.quote_batch(PAIRS[:2], years=3, start_year=2025, inflation_rate=0.1)
+    assert quote["years"].tolist() == [[2025, 2026, 2027]] * 2
+    assert quote["per_year"][0].tolist() == [5000.0, 5500.0, 6050.0]
+
+
+def test_quote_batch_strict_rejects_unknown_pairs(index):
+    with pytest.raises(ValueError, match="Bachelor of Music"):
+        index.quote_batch(PAIRS, LENGTHS, STARTS)
@@ -0,0 +1,58 @@
+import json
+
+import numpy as np
+import pytest
+
+import geometry_cache
+import zone_polygons
+from zone_polygons import PolygonZoneIndex
+
+
+def square(lon, lat, size=0.01):
+    return [[[lon, lat], [lon + size, lat], [lon + size, lat + size], [lon, lat + size], [lon, lat]]]
+
+
+@pytest.fixture(autouse=True)
+def cache_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(geometry_cache, "CACHE_ROOT", tmp_path / "geometry")
+    monkeypatch.setattr(geometry_cache, "_memo", {})
+    monkeypatch.setattr(geometry_cache, "_stamps", None)
+
+
+@pytest.fixture
+def index(tmp_path):
+    features = [
+        {"type": "Feature", "properties": {"NOM": name}, "geometry": {"type": "Polygon", "coordinates": square(*corner)}}
+        for name, corner in [("Ville-Marie", (-73.58, 45.50)), ("Laval", (-73.57, 45.50))]
+    ]
+    path = tmp_path / "zones.geojson"
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}), encoding="utf-8")
+    return PolygonZoneIndex(path)
+
+
+def test_locate_inside_and_outside(index):
+    assert index.locate(-73.575, 45.505) == ("Ville-Marie", "A")
+    assert index.locate(-73.565, 45.505) == ("Laval", "B")
+    assert index.locate(-73.50, 45.505) is None
+
+
+def test_locate_on_shared_boundary_returns_one_polygon(index):
+    assert index.locate(-73.57, 45.505) in {("Ville-Marie", "A"), ("Laval", "B")}
+
+
+def test_locate_many_matches_locate(index):
+    lons = [-73.575, -73.50, -73.565, -73.57]
+    lats = [45.505, 45.505, 45.505, 45.505]
+    names, zones = index.locate_many(lons, lats)
+    assert len(names) == len(zones) == 4
+    for lon, lat, name, zone in zip(lons, lats, names, zones):
+        hit = index.locate(lon, lat)
+        assert (name, zone) == (hit if hit else (None, None))
+
+
+def test_agglomeration_polygons_are_all_zone_a():
+    index = PolygonZoneIndex(zone_polygons.GEOJSON_PATH)
+    assert set(index.zones) == {"A"}
+    assert index.locate(-73.5673, 45.5017) == ("Ville-Marie", "A")
+    assert index.locate(-73.75, 45.57) is None       # Laval: off the island
+    assert list(index.locate_many([-73.75], [45.57])[1]) == [None]
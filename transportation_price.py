@@ -4,7 +4,13 @@ and there university
 
 call get_<transportation_name>_price() to get the prices
 '''
+import logging
+import re
+
 import distance
+from places import normalize_place
+
+logger = logging.getLogger(__name__)
 
 A_cities = [
         "Baie-D'Urfé",
@@ -103,6 +109,56 @@ D_cities = [
 "Saint-Placide"
 ]
 
+# boroughs of the city of Montréal, often written in place of the city
+A_boroughs = [
+    "Ahuntsic-Cartierville",
+    "Anjou",
+    "Côte-des-Neiges–Notre-Dame-de-Grâce",
+    "Lachine",
+    "LaSalle",
+    "L'Île-Bizard–Sainte-Geneviève",
+    "Mercier–Hochelaga-Maisonneuve",
+    "Montréal-Nord",
+    "Outremont",
+    "Pierrefonds-Roxboro",
+    "Le Plateau-Mont-Royal",
+    "Plateau-Mont-Royal",
+    "Rivière-des-Prairies–Pointe-aux-Trembles",
+    "Rosemont–La Petite-Patrie",
+    "Saint-Laurent",
+    "Saint-Léonard",
+    "Le Sud-Ouest",
+    "Sud-Ouest",
+    "Verdun",
+    "Ville-Marie",
+    "Villeray–Saint-Michel–Parc-Extension"
+]
+
+# other spellings seen in addresses -> official name
+city_aliases = {
+    "Montreal West": "Montréal-Ouest",
+    "Montreal East": "Montréal-Est",
+    "Montreal North": "Montréal-Nord",
+    "Mount Royal": "Mont-Royal",
+    "Town of Mount Royal": "Mont-Royal",
+    "Ville Mont-Royal": "Mont-Royal",
+    "Dorval Island": "L'Île-Dorval",
+    "Ile-Perrot": "L'Île-Perrot",
+    "Ile Bizard": "L'Île-Bizard–Sainte-Geneviève",
+    "Notre-Dame-de-l'Ile-Perrot": "Notre-Dame-de-l'Île-Perrot",
+    "Vaudreuil": "Vaudreuil-Dorion",
+    "Lasalle": "LaSalle",
+    "Saint-Jerome": "Saint-Jérôme"
+}
+
+# postal-code prefix -> zone, longest prefix wins (H7 = Laval, J4 = South Shore)
+POSTAL_PREFIX_ZONES = {
+    'H': 'A',
+    'H7': 'B',
+    'J4': 'B',
+    'J3V': 'B'
+}
+
 STM_zones = {
     'A': A_cities,
     'B': B_cities,
@@ -116,14 +172,46 @@ tarif = {
     'ABCD' : 165.25
 }
 
+_ABBREVIATIONS = {"st": "saint", "ste": "sainte", "mt": "mont"}
+_POSTAL_RE = re.compile(r"\b([A-Za-z]\d[A-Za-z])\s?\d[A-Za-z]\d\b")
+
+ZONE_ORDER = 'ABCD'
+
+
+def zone_key(name):
+    '''ZONE_INDEX key of a city name: "St-Laurent" / "Ste-Julie" -> "saint laurent" / "sainte julie".'''
+    words = normalize_place(name).split()
+    return " ".join(_ABBREVIATIONS.get(w, w) for w in words)
+
+
+# normalized city name -> zone, built once
+ZONE_INDEX = {}
+for _zone in reversed(ZONE_ORDER):  # first listed zone wins on duplicates
+    for _city in STM_zones[_zone]:
+        ZONE_INDEX[zone_key(_city)] = _zone
+for _city in A_boroughs:
+    ZONE_INDEX.setdefault(zone_key(_city), 'A')
+for _alias, _city in city_aliases.items():
+    ZONE_INDEX.setdefault(zone_key(_alias), ZONE_INDEX[zone_key(_city)])
+
+# (home zone, school zone) -> monthly fare: the pass must cover the outermost zone
+FARE_BY_ZONE_PAIR = {
+    (a, b): tarif[ZONE_ORDER[:max(ZONE_ORDER.index(a), ZONE_ORDER.index(b)) + 1]]
+    for a in ZONE_ORDER for b in ZONE_ORDER
+}
+
 
 def get_monthly_gas_price(home_address, school_address, km_per_litre, fuel_price):
     '''
     dist: in km
     fuel_price in $/litre
+
+    returns None when no route between the two addresses was found
     '''
     dist, time = distance.get_distance(home_address, school_address)
-    print('distance is',dist)
+    logger.debug('distance is %s', dist)
+    if dist is None:
+        return None
     float_dist = float(dist.split()[0])
     daily_price = 2*float_dist/km_per_litre*fuel_price
     return round(30*daily_price, 2)
@@ -133,47 +221,137 @@ def get_stm_price(address, skl_add):
         address: standard address notation of user's home (ex: '98 Croissant des Trèfles, L'Île-Perrot, QC J7V 2G2')
         skl_add: address of the school the user attends
 
-        raise NameValueError if the home address or university is not in the greater area of montreal
+        raise NameError if the home address or university is not in the greater area of montreal
         '''
-    my_zone = get_zone(address)
-    uni_zone = get_zone(skl_add)
-    if my_zone == 'D' or uni_zone == 'D':
-        my_tarif = tarif['ABCD']
-    elif my_zone == 'C' or uni_zone == 'C':
-        my_tarif = tarif['ABC']
-    elif my_zone == 'B' or uni_zone == 'B':
-        my_tarif = tarif['AB']
-    else:
-        my_tarif = tarif['A']
-    return my_tarif
-
-def get_zone(address):
-    add_city = address.split(', ')[1]
-    try:
-        if add_city in A_cities:
-            zone = 'A'
-        elif add_city in B_cities:
-            zone = 'B'
-        elif add_city in C_cities:
-            zone = 'C'
-        elif add_city in D_cities:
-            zone = 'D'
-        return zone
-    except NameError as e:
-        print(e)
+    return FARE_BY_ZONE_PAIR[(get_zone(address), get_zone(skl_add))]
+
+def get_zone(address, point=None):
+    '''
+    Fare zone ('A'..'D') of an address like "1287 Rue Ropery, Montréal, QC H3K 2X1".
+    The city part is matched accent/case-insensitively (aliases included); if no part
+    names a known city, the postal-code prefix decides.
+
+    point: optional geocoded (lon, lat) of the address; when given, the municipality
+    polygon containing it takes precedence over the address text. The polygons only
+    cover the island (agglomeration), so every polygon is zone 'A' and points off
+    the island always fall back to the address text.
+    '''
+    zone = None
+    if point is not None:
+        zone = get_zone_for_point(*point)
+    if zone is None:
+        zone = _zone_for_address(address)
+    if zone is None:
         raise NameError("There is no Montreal public transportation available near this address")
+    return zone
+
+def get_zones(addresses, strict=True):
+    '''
+    Bulk get_zone for a whole column of addresses (list, pandas Series, ...).
+    Each distinct address is resolved once. Missing values (None, NaN) count as
+    unknown addresses. With strict=False unknown addresses give None instead of
+    raising NameError.
+    '''
+    addresses = list(addresses)
+    resolved = {a: _zone_for_address(a) for a in set(addresses)}
+    if strict:
+        for a, zone in resolved.items():
+            if zone is None:
+                raise NameError(f"There is no Montreal public transportation available near this address: {a}")
+    return [resolved[a] for a in addresses]
+
+def get_zone_for_point(lon, lat):
+    '''Fare zone of a WGS84 point from the agglomeration polygons, None if outside them.'''
+    from zone_polygons import get_default_index
+    hit = get_default_index().locate(lon, lat)
+    return hit[1] if hit else None
+
+def get_zones_for_points(lons, lats):
+    '''Vectorized get_zone_for_point over arrays of coordinates (None where outside).'''
+    from zone_polygons import get_default_index
+    _names, zones = get_default_index().locate_many(lons, lats)
+    return list(zones)
+
+def _zone_for_address(address):
+    if not isinstance(address, str):
+        return None
+    parts = address.split(',')
+    # city usually follows the street; check it first, then anything else
+    for part in parts[1:] + parts[:1]:
+        zone = ZONE_INDEX.get(zone_key(part))
+        if zone is not None:
+            return zone
+    match = _POSTAL_RE.search(address)
+    if match:
+        fsa = match.group(1).upper()
+        for n in (3, 2, 1):
+            zone = POSTAL_PREFIX_ZONES.get(fsa[:n])
+            if zone is not None:
+                return zone
+    return None
 
 def get_bixi_price():
     return 23
 
-#print(get_zone("2401 Rue Workman, Montréal, QC H3J 2N3"))
+def get_commute_costs(students, home_col='home_address', school_col='school_address',
+                      km_per_litre_col='km_per_litre', fuel_price_col='fuel_price'):
+    '''
+    Bulk version of get_monthly_gas_price / get_stm_price / get_bixi_price.
+
+    students: DataFrame (or dict of columns) with home address, school address,
+              km_per_litre and fuel_price ($/litre) per row.
+    returns DataFrame aligned with `students`: distance_km, gas, stm, bixi (monthly $).
+
+    Identical (home, school) pairs are looked up once, one get_distances batch per
+    school. Gas uses the exact distance in metres instead of the rounded "12.3 km"
+    text, so it can differ from get_monthly_gas_price by a few cents.
+    Unroutable pairs / addresses outside the STM zones give NaN.
+    '''
+    import numpy as np
+    import pandas as pd
+
+    df = pd.DataFrame(students)
+    pairs = df[[home_col, school_col]].drop_duplicates().reset_index(drop=True)
+
+    km = np.full(len(pairs), np.nan)
+    for school, group in pairs.groupby(school_col, sort=False):
+        matrix = distance.get_distances(group[home_col].tolist(), [school])
+        metres = np.array([row[0] if row[0] is not None else np.nan for row in matrix.distance_m], dtype=float)
+        km[group.index.to_numpy()] = metres / 1000.0
+    pairs['distance_km'] = km
+
+    out = df[[home_col, school_col]].merge(pairs, on=[home_col, school_col], how='left')
+    out.index = df.index
+    dist_km = out['distance_km'].to_numpy()
+
+    kmpl = df[km_per_litre_col].to_numpy(dtype=float)
+    price = df[fuel_price_col].to_numpy(dtype=float)
+    gas = np.round(30 * (2 * dist_km / kmpl * price), 2)
+
+    # zone letters -> 0..3, fare of the outermost zone of the trip
+    addresses = pd.unique(pd.concat([df[home_col], df[school_col]], ignore_index=True))
+    level = {a: (ZONE_ORDER.index(z) if z else -1) for a, z in zip(addresses, get_zones(addresses, strict=False))}
+    home_level = df[home_col].map(level).to_numpy()
+    school_level = df[school_col].map(level).to_numpy()
+    fares = np.array([tarif[ZONE_ORDER[:i + 1]] for i in range(len(ZONE_ORDER))])
+    trip_level = np.maximum(home_level, school_level)
+    stm = np.where((home_level >= 0) & (school_level >= 0), fares[np.clip(trip_level, 0, None)], np.nan)
+
+    return pd.DataFrame({
+        'distance_km': dist_km,
+        'gas': gas,
+        'stm': stm,
+        'bixi': float(get_bixi_price()),
+    }, index=df.index)
+
 if __name__ == "__main__":
-    print(get_stm_price('1287 Rue Ropery, Montréal, QC H3K 2X1', "98 Croissant des Trèfles, L'Île-Perrot, QC J7V 2G2"))
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    logger.info('stm price is %s', get_stm_price('1287 Rue Ropery, Montréal, QC H3K 2X1', "98 Croissant des Trèfles, L'Île-Perrot, QC J7V 2G2"))
     origin = "845 Sherbrooke St W, Montreal, Quebec H3A 0G4"
     destination = "525 Avenue 74, Laval, QC H7V 2X9"
     KM_PER_LITRE = 20.2
     FUEL_PRICE = 1.501
-    print('gas price is', get_monthly_gas_price(origin, destination, KM_PER_LITRE, FUEL_PRICE))
+    logger.info('gas price is %s', get_monthly_gas_price(origin, destination, KM_PER_LITRE, FUEL_PRICE))
         
 
 
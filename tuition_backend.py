@@ -8,21 +8,147 @@ API:
 - list_schools() -> list[str]
 - list_programs(school: str) -> list[str]
 - get_tuition(school: str, program: str) -> dict
+- search_programs(prefix: str, limit: int = 10, school: str | None = None) -> list[dict]
+- quote_tuition_batch(pairs, years=4, start_year=2025, ...) -> dict of arrays
+- reload_index(background=False) -> rebuild from the CSV and swap it in
+
+The index is built on first use, not at import. Parsed data is snapshotted to
+.cache/tuition_index.pickle; the snapshot is reused while the CSV's mtime/size
+(or, if those changed, its SHA-256) still match.
 """
 
 from __future__ import annotations
+from bisect import bisect_left
 from pathlib import Path
 import csv
-from typing import Dict, List
+import os
+import pickle
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fileutil import atomic_write, file_sha256
+from places import normalize_place
 
 HERE = Path(__file__).resolve().parent
 CSV_PATH = HERE / "montreal_tuition_annual_cad.csv"
+SNAPSHOT_PATH = HERE / ".cache" / "tuition_index.pickle"
+TUITION_BASE_YEAR = 2025  # year the CSV amounts are quoted in
+_SNAPSHOT_VERSION = 1
+
 
 class TuitionIndex:
-    def __init__(self, csv_path: str | Path = CSV_PATH):
+    def __init__(self, csv_path: str | Path = CSV_PATH, *, _by_school: Optional[Dict[str, Dict[str, float]]] = None):
         self.csv_path = Path(csv_path)
         self._by_school: Dict[str, Dict[str, float]] = {}  # {school: {program: tuition}}
-        self._load()
+        if _by_school is None:
+            self._load()
+        else:
+            self._by_school = _by_school
+        self._build_views()
+
+    @classmethod
+    def from_snapshot(cls, csv_path: str | Path = CSV_PATH, snapshot_path: str | Path = SNAPSHOT_PATH) -> "TuitionIndex":
+        """Load from the snapshot if it still matches the CSV, else parse the CSV and rewrite it."""
+        csv_path, snapshot_path = Path(csv_path), Path(snapshot_path)
+        if not csv_path.exists():
+            raise FileNotFoundError(f"CSV not found: {csv_path}")
+        st = csv_path.stat()
+
+        snap = None
+        try:
+            with snapshot_path.open("rb") as f:
+                snap = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            pass
+
+        if snap and snap.get("version") == _SNAPSHOT_VERSION and snap.get("csv_path") == str(csv_path):
+            if (snap["mtime_ns"], snap["size"]) == (st.st_mtime_ns, st.st_size):
+                return cls(csv_path, _by_school=snap["by_school"])
+            sha = file_sha256(csv_path)
+            if snap["sha256"] == sha:
+                # touched but unchanged: refresh the stamp so the next start skips hashing
+                cls._write_snapshot(snapshot_path, csv_path, st, sha, snap["by_school"])
+                return cls(csv_path, _by_school=snap["by_school"])
+
+        index = cls(csv_path)
+        cls._write_snapshot(snapshot_path, csv_path, st, file_sha256(csv_path), index._by_school)
+        return index
+
+    @staticmethod
+    def _write_snapshot(snapshot_path: Path, csv_path: Path, st: os.stat_result, sha: str,
+                        by_school: Dict[str, Dict[str, float]]) -> None:
+        snap = {
+            "version": _SNAPSHOT_VERSION,
+            "csv_path": str(csv_path),
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "sha256": sha,
+            "by_school": by_school,
+        }
+        try:
+            snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            with atomic_write(snapshot_path, "wb") as f:
+                pickle.dump(snap, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            pass  # read-only checkout: just skip the snapshot
+
+    def _build_views(self) -> None:
+        """Precompute the sorted dropdown lists and the lookup / typeahead indexes."""
+        self._schools_sorted: List[str] = sorted({s.title() for s in self._by_school.keys()})
+        self._programs_sorted: Dict[str, List[str]] = {
+            skey: sorted(programs.keys()) for skey, programs in self._by_school.items()
+        }
+        # {school: {program.lower(): program}}, first spelling wins like the old scan
+        self._programs_lower: Dict[str, Dict[str, str]] = {}
+        for skey, programs in self._by_school.items():
+            lower: Dict[str, str] = {}
+            for p in programs:
+                lower.setdefault(p.lower(), p)
+            self._programs_lower[skey] = lower
+
+        # Sorted (key, school, program) arrays for bisect prefix search:
+        #   _full_keys: whole folded program name ("bachelor of arts ba")
+        #   _word_keys: the name from each later word on ("arts ba"), ranked after full-name hits
+        full: List[Tuple[str, str, str]] = []
+        words: List[Tuple[str, str, str]] = []
+        for skey, programs in self._by_school.items():
+            for p in programs:
+                toks = normalize_place(p).split()
+                full.append((" ".join(toks), skey, p))
+                words.extend((" ".join(toks[i:]), skey, p) for i in range(1, len(toks)))
+        full.sort()
+        words.sort()
+        self._full_keys = full
+        self._word_keys = words
+        self._full_by_school: Dict[str, List[Tuple[str, str, str]]] = {}
+        self._word_by_school: Dict[str, List[Tuple[str, str, str]]] = {}
+        for t in full:  # already sorted, so each per-school list is too
+            self._full_by_school.setdefault(t[1], []).append(t)
+        for t in words:
+            self._word_by_school.setdefault(t[1], []).append(t)
+
+    def _table(self):
+        """Array-backed copy of the table: ({(school key, program): row}, amounts ndarray), built once."""
+        table = getattr(self, "_array_table", None)
+        if table is None:
+            import numpy as np
+            rows: Dict[Tuple[str, str], int] = {}
+            amounts: List[float] = []
+            for skey, programs in self._by_school.items():
+                for program, amount in programs.items():
+                    rows[(skey, program)] = len(amounts)
+                    amounts.append(amount)
+            table = self._array_table = (rows, np.asarray(amounts, dtype=float))
+        return table
+
+    def _row(self, rows: Dict[Tuple[str, str], int], school: str, program: str) -> int:
+        skey = self._norm(school)
+        row = rows.get((skey, program))
+        if row is None and skey in self._programs_lower:
+            match = self._programs_lower[skey].get(program.lower())
+            if match is not None:
+                row = rows[(skey, match)]
+        return -1 if row is None else row
 
     @staticmethod
     def _norm(s: str) -> str:
@@ -50,14 +176,11 @@ class TuitionIndex:
     def list_schools(self) -> List[str]:
         """For your School dropdown."""
         # Return the original casing by title-casing the key
-        return sorted({s.title() for s in self._by_school.keys()})
+        return list(self._schools_sorted)
 
     def list_programs(self, school: str) -> List[str]:
         """For your Program dropdown (depends on selected school)."""
-        skey = self._norm(school)
-        if skey not in self._by_school:
-            return []
-        return sorted(self._by_school[skey].keys())
+        return list(self._programs_sorted.get(self._norm(school), ()))
 
     def get_tuition(self, school: str, program: str) -> Dict:
         """Return annual tuition (CAD) for the exact program at the given school."""
@@ -70,15 +193,15 @@ class TuitionIndex:
         if program in school_programs:
             amount = school_programs[program]
         else:
-            # fallback: case-insensitive scan
-            matches = [p for p in school_programs.keys() if p.lower() == program.lower()]
-            if matches:
-                amount = school_programs[matches[0]]
-                program = matches[0]  # normalize the label
+            # fallback: case-insensitive lookup
+            match = self._programs_lower[skey].get(program.lower())
+            if match is not None:
+                amount = school_programs[match]
+                program = match  # normalize the label
             else:
                 raise ValueError(
                     f"Program not found for {school}: '{program}'. "
-                    f"Available: {sorted(school_programs.keys())}"
+                    f"Available: {self._programs_sorted[skey]}"
                 )
 
         return {
@@ -87,20 +210,160 @@ class TuitionIndex:
             "annual_tuition_cad": round(amount, 2),
         }
 
+    def quote_batch(
+        self,
+        pairs: Iterable[Tuple[str, str]],
+        years: int | Sequence[int] = 4,
+        start_year: int | Sequence[int] = TUITION_BASE_YEAR,
+        *,
+        inflation_rate: float = 0.0,
+        inflation_index: Optional[Dict[int, float]] = None,
+        strict: bool = True,
+    ) -> Dict:
+        """
+        Project tuition for many (school, program) options at once.
+
+        years / start_year: program length and first year, a scalar or one per pair.
+        Tuition for calendar year y is CSV amount * growth(y), where growth is
+          - inflation_index[y] / inflation_index[TUITION_BASE_YEAR] when an index dict
+            is given (years outside it are clamped to its range, like the food CPI), else
+          - (1 + inflation_rate) ** (y - TUITION_BASE_YEAR).
+        Unknown pairs raise ValueError, or give NaN rows with strict=False.
 
-INDEX = TuitionIndex(CSV_PATH)
+        Returns {"school", "program": lists, "years": (n, max_len) calendar years,
+                 "per_year": (n, max_len) tuition, NaN past each program's length,
+                 "total": (n,) sum over the program}, amounts rounded to cents.
+        """
+        import numpy as np
+
+        pairs = list(pairs)
+        rows, amounts = self._table()
+        idx = np.array([self._row(rows, s, p) for s, p in pairs], dtype=np.int64)
+        if strict and (idx < 0).any():
+            bad = [pairs[i] for i in np.flatnonzero(idx < 0)[:5]]
+            raise ValueError(f"Unknown (school, program) pairs: {bad}")
+        base = np.where(idx >= 0, amounts[np.clip(idx, 0, None)] if len(amounts) else np.nan, np.nan)
+
+        n = len(pairs)
+        length = np.broadcast_to(np.asarray(years, dtype=np.int64), (n,))
+        first = np.broadcast_to(np.asarray(start_year, dtype=np.int64), (n,))
+        width = int(length.max()) if n else 0
+        offsets = np.arange(width)
+        cal_years = first[:, None] + offsets[None, :]
+
+        if inflation_index:
+            known = sorted(inflation_index)
+            dense = np.array([float(inflation_index.get(y, np.nan)) for y in range(known[0], known[-1] + 1)])
+            # fill gaps by carrying the previous year forward
+            for i in range(1, len(dense)):
+                if dense[i] != dense[i]:
+                    dense[i] = dense[i - 1]
+            base_val = dense[min(max(TUITION_BASE_YEAR, known[0]), known[-1]) - known[0]]
+            growth = dense[np.clip(cal_years, known[0], known[-1]) - known[0]] / base_val
+        else:
+            growth = (1.0 + float(inflation_rate)) ** (cal_years - TUITION_BASE_YEAR)
+
+        per_year = base[:, None] * growth
+        per_year = np.where(offsets[None, :] < length[:, None], per_year, np.nan)
+        total = np.where(np.isnan(base), np.nan, np.nansum(per_year, axis=1))
+        return {
+            "school": [s for s, _ in pairs],
+            "program": [p for _, p in pairs],
+            "years": cal_years,
+            "per_year": np.round(per_year, 2),
+            "total": np.round(total, 2),
+        }
+
+    def search_programs(self, prefix: str, limit: int = 10, school: Optional[str] = None) -> List[Dict]:
+        """
+        Typeahead: programs whose name, or any word in it, starts with `prefix`
+        (accent/case/punctuation-insensitive). Whole-name matches rank first, then
+        word matches; each group is alphabetical. At most `limit` results.
+        """
+        key = normalize_place(prefix)
+        if not key or limit <= 0:
+            return []
+        if school is None:
+            groups = (self._full_keys, self._word_keys)
+        else:
+            skey = self._norm(school)
+            groups = (self._full_by_school.get(skey, []), self._word_by_school.get(skey, []))
+
+        out: List[Dict] = []
+        seen = set()
+        for arr in groups:
+            i = bisect_left(arr, (key,))
+            while i < len(arr) and len(out) < limit and arr[i][0].startswith(key):
+                _, skey, program = arr[i]
+                if (skey, program) not in seen:
+                    seen.add((skey, program))
+                    out.append({"school": skey.title(), "program": program})
+                i += 1
+        return out
+
+
+_INDEX: Optional[TuitionIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_index() -> TuitionIndex:
+    """The shared index, built (or loaded from the snapshot) on first use."""
+    global _INDEX
+    index = _INDEX
+    if index is None:
+        with _INDEX_LOCK:
+            if _INDEX is None:
+                _INDEX = TuitionIndex.from_snapshot(CSV_PATH, SNAPSHOT_PATH)
+            index = _INDEX
+    return index
+
+
+def reload_index(background: bool = False) -> Optional[threading.Thread]:
+    """
+    Rebuild the index from the CSV and swap it in atomically. Requests keep using the
+    old index until the new one is ready. With background=True the rebuild runs in a
+    daemon thread, which is returned.
+    """
+    def _rebuild() -> None:
+        global _INDEX
+        new_index = TuitionIndex.from_snapshot(CSV_PATH, SNAPSHOT_PATH)
+        with _INDEX_LOCK:
+            _INDEX = new_index
+
+    if not background:
+        _rebuild()
+        return None
+    t = threading.Thread(target=_rebuild, name="tuition-reload", daemon=True)
+    t.start()
+    return t
+
+
+def __getattr__(name: str):
+    # keep `tuition_backend.INDEX` working without building it at import time
+    if name == "INDEX":
+        return get_index()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def list_schools() -> List[str]:
-    return INDEX.list_schools()
+    return get_index().list_schools()
 
 
 def list_programs(school: str) -> List[str]:
-    return INDEX.list_programs(school)
+    return get_index().list_programs(school)
 
 
 def get_tuition(school: str, program: str) -> Dict:
-    return INDEX.get_tuition(school, program)["annual_tuition_cad"]
+    return get_index().get_tuition(school, program)["annual_tuition_cad"]
+
+
+def search_programs(prefix: str, limit: int = 10, school: Optional[str] = None) -> List[Dict]:
+    return get_index().search_programs(prefix, limit, school)
+
+
+def quote_tuition_batch(pairs: Iterable[Tuple[str, str]], years: int | Sequence[int] = 4,
+                        start_year: int | Sequence[int] = TUITION_BASE_YEAR, **kwargs) -> Dict:
+    return get_index().quote_batch(pairs, years, start_year, **kwargs)
 
 
 # Local test
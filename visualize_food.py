@@ -7,66 +7,106 @@ Run from project root:
 
 Requires matplotlib:
     pip install matplotlib
+
+The plots are built by plot_cpi_index / plot_food_cost_comparison on their own
+matplotlib Figure objects (no pyplot global state), so pipeline.py can render them
+in worker processes; this script passes pyplot figures in to keep plt.show().
 """
 
+from typing import Dict, Iterable, Sequence
+
 from Food.model import build_food_cpi_model
 from Food.food_estimator import expected_monthly_food_cost_for_year
-import matplotlib.pyplot as plt
 
-# --- 1) Load CPI data and build the model ---
 CPI_PATH = "Food/1810000401-eng.csv"
-cpi_index = build_food_cpi_model(CPI_PATH, end_year=2035)
+STORE = "Walmart"
+WEEKLY_BUDGET = 180.0
+SCENARIOS = ("never", "3-5x", "daily")
+YEARS_EVAL = range(2025, 2036)
+
+
+def _figure(fig=None):
+    if fig is None:
+        from matplotlib.figure import Figure
+        fig = Figure()
+    return fig
 
-print("\n✅ CPI model built successfully.")
-print(f"  Base year (2025) index = {cpi_index.get(2025, 'N/A')}")
-print(f"  Forecasted 2030 index  = {cpi_index.get(2030, 'N/A')}")
-print(f"  Forecasted 2035 index  = {cpi_index.get(2035, 'N/A')}")
-print("-" * 50)
 
 # --- 2) Plot CPI Index by Year ---
-years = sorted(cpi_index.keys())
-values = [cpi_index[y] for y in years]
-
-plt.figure()
-plt.plot(years, values, marker="o")
-plt.title("Food CPI Index by Year (2025 = 100)")
-plt.xlabel("Year")
-plt.ylabel("Index")
-plt.grid(True, linestyle="--", linewidth=0.5)
-plt.tight_layout()
-plt.savefig("cpi_index_by_year.png", dpi=150)
-print("🖼 Saved CPI curve → cpi_index_by_year.png")
+def plot_cpi_index(cpi_index: Dict[int, float], fig=None):
+    fig = _figure(fig)
+    years = sorted(cpi_index.keys())
+    values = [cpi_index[y] for y in years]
+
+    ax = fig.subplots()
+    ax.plot(years, values, marker="o")
+    ax.set_title("Food CPI Index by Year (2025 = 100)")
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Index")
+    ax.grid(True, linestyle="--", linewidth=0.5)
+    fig.tight_layout()
+    return fig
+
 
 # --- 3) Compare food costs for different eating-out habits ---
-store = "Walmart"
-weekly_budget = 180.0
-scenarios = ["never", "3-5x", "daily"]
-years_eval = list(range(2025, 2036))
-
-plt.figure()
-for freq in scenarios:
-    costs = [
-        expected_monthly_food_cost_for_year(
-            year=y,
-            eating_out=freq,
-            store_type=store,
-            weekly_grocery_budget=weekly_budget,
-            cpi_index_by_year=cpi_index,
-        )
-        for y in years_eval
-    ]
-    plt.plot(years_eval, costs, marker="o", label=f"Eating out: {freq}")
-
-plt.title(
-    f"Predicted Monthly Grocery Cost (Store: {store}, Weekly Budget: ${weekly_budget:.0f})"
-)
-plt.xlabel("Year")
-plt.ylabel("Monthly Cost (CAD)")
-plt.grid(True, linestyle="--", linewidth=0.5)
-plt.legend()
-plt.tight_layout()
-plt.savefig("food_cost_comparison.png", dpi=150)
-print("🖼 Saved cost comparison → food_cost_comparison.png")
-
-plt.show()
-print("\n✅ Visualization complete.\n")
+def plot_food_cost_comparison(
+    cpi_index: Dict[int, float],
+    store: str = STORE,
+    weekly_budget: float = WEEKLY_BUDGET,
+    scenarios: Sequence[str] = SCENARIOS,
+    years_eval: Iterable[int] = YEARS_EVAL,
+    fig=None,
+):
+    fig = _figure(fig)
+    years_eval = list(years_eval)
+
+    ax = fig.subplots()
+    for freq in scenarios:
+        costs = [
+            expected_monthly_food_cost_for_year(
+                year=y,
+                eating_out=freq,
+                store_type=store,
+                weekly_grocery_budget=weekly_budget,
+                cpi_index_by_year=cpi_index,
+            )
+            for y in years_eval
+        ]
+        ax.plot(years_eval, costs, marker="o", label=f"Eating out: {freq}")
+
+    ax.set_title(
+        f"Predicted Monthly Grocery Cost (Store: {store}, Weekly Budget: ${weekly_budget:.0f})"
+    )
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Monthly Cost (CAD)")
+    ax.grid(True, linestyle="--", linewidth=0.5)
+    ax.legend()
+    fig.tight_layout()
+    return fig
+
+
+def main(cpi_path: str = CPI_PATH, show: bool = True) -> None:
+    import matplotlib.pyplot as plt
+
+    # --- 1) Load CPI data and build the model ---
+    cpi_index = build_food_cpi_model(cpi_path, end_year=2035)
+
+    print("\n✅ CPI model built successfully.")
+    print(f"  Base year (2025) index = {cpi_index.get(2025, 'N/A')}")
+    print(f"  Forecasted 2030 index  = {cpi_index.get(2030, 'N/A')}")
+    print(f"  Forecasted 2035 index  = {cpi_index.get(2035, 'N/A')}")
+    print("-" * 50)
+
+    plot_cpi_index(cpi_index, fig=plt.figure()).savefig("cpi_index_by_year.png", dpi=150)
+    print("🖼 Saved CPI curve → cpi_index_by_year.png")
+
+    plot_food_cost_comparison(cpi_index, fig=plt.figure()).savefig("food_cost_comparison.png", dpi=150)
+    print("🖼 Saved cost comparison → food_cost_comparison.png")
+
+    if show:
+        plt.show()
+    print("\n✅ Visualization complete.\n")
+
+
+if __name__ == "__main__":
+    main()
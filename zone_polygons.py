@@ -0,0 +1,72 @@
+"""
+Point-in-polygon municipality / fare-zone lookup.
+
+Loads municipality polygons (by default the agglomeration GeoJSON that map.py uses)
+in WGS84 from the preprocessed cache (geometry_cache.py), and keeps them in an
+STRtree with prepared geometries, so each lookup is a tree query instead of a scan
+over every polygon.
+
+    index = PolygonZoneIndex()
+    index.locate(-73.5673, 45.5017)                # -> ("Ville-Marie", "A")
+    names, zones = index.locate_many(lons, lats)   # arrays, None where outside
+
+Zones come from transportation_price.ZONE_INDEX, so polygon names and city-name
+lookups always agree. The agglomeration polygons are all on the island, so with the
+default GeoJSON every hit is zone 'A' and off-island points locate to None.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+HERE = Path(__file__).resolve().parent
+GEOJSON_PATH = HERE / "limites-administratives-agglomeration-nad83.geojson"
+
+
+class PolygonZoneIndex:
+    def __init__(self, geojson_path: str | Path = GEOJSON_PATH, *, name_field: str = "NOM"):
+        import shapely
+        from geometry_cache import load_geometry
+        from transportation_price import ZONE_INDEX, zone_key
+
+        gdf = load_geometry(geojson_path, name_field=name_field)  # EPSG:4326, cached
+        self.names = np.array(gdf[name_field].tolist(), dtype=object)
+        self.zones = np.array([ZONE_INDEX.get(zone_key(n)) for n in self.names], dtype=object)
+        self.geoms = np.asarray(gdf.geometry.values, dtype=object)
+        shapely.prepare(self.geoms)
+        self.tree = shapely.STRtree(self.geoms)
+
+    def locate(self, lon: float, lat: float) -> Optional[Tuple[str, Optional[str]]]:
+        """(municipality, zone) containing the point, or None when it's outside every polygon."""
+        names, zones = self.locate_many([lon], [lat])
+        if names[0] is None:
+            return None
+        return names[0], zones[0]
+
+    def locate_many(self, lons: Sequence[float], lats: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized locate: one tree query for all points; misses are None."""
+        import shapely
+
+        points = shapely.points(np.asarray(lons, dtype=float), np.asarray(lats, dtype=float))
+        point_idx, poly_idx = self.tree.query(points, predicate="intersects")
+        # a point on a shared boundary hits two polygons; keep the first one
+        first = np.unique(point_idx, return_index=True)[1]
+        point_idx, poly_idx = point_idx[first], poly_idx[first]
+
+        names = np.full(len(points), None, dtype=object)
+        zones = np.full(len(points), None, dtype=object)
+        names[point_idx] = self.names[poly_idx]
+        zones[point_idx] = self.zones[poly_idx]
+        return names, zones
+
+
+_default_index: Optional[PolygonZoneIndex] = None
+
+
+def get_default_index() -> PolygonZoneIndex:
+    global _default_index
+    if _default_index is None:
+        _default_index = PolygonZoneIndex()
+    return _default_index